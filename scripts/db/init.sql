@@ -40,4 +40,52 @@ CREATE TABLE IF NOT EXISTS anomalies(
     parameters TEXT,
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (analyzed_image_id) REFERENCES cvision_images_analyzed(id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+CREATE TABLE IF NOT EXISTS inspection_traces(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    raw_image_id INTEGER NOT NULL,
+
+    span_name TEXT NOT NULL, -- e.g. aruco, gauge_yolo, easyocr, minio_upload
+    parent_span TEXT,
+    start_offset_ms REAL NOT NULL, -- relative to the start of the inspection
+    wall_ms REAL NOT NULL,
+    cpu_ms REAL NOT NULL, -- CPU time of the executing thread
+    thread TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (raw_image_id) REFERENCES cvision_images_raw(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_inspection_traces_raw_image_id ON inspection_traces(raw_image_id);
+
+CREATE TABLE IF NOT EXISTS inspection_cache(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    content_hash TEXT NOT NULL, -- sha256 of the raw image bytes
+    fingerprint TEXT NOT NULL, -- sha256 over model files and sensors.yaml / cvision.yaml
+    raw_image_id INTEGER NOT NULL, -- first analysis of these bytes
+
+    aruco_id INTEGER,
+    readings TEXT NOT NULL, -- JSON list of {category, value, analyzed_image_id, is_anomaly}
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_hit_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (content_hash, fingerprint),
+    FOREIGN KEY (raw_image_id) REFERENCES cvision_images_raw(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS gauge_calibrations(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    aruco_id INTEGER NOT NULL, -- marker of the mounted gauge
+    category TEXT NOT NULL, -- e.g. pressure
+
+    center_x INTEGER NOT NULL,
+    center_y INTEGER NOT NULL,
+    radius INTEGER NOT NULL,
+    min_angle REAL NOT NULL,
+    max_angle REAL NOT NULL,
+    image_width INTEGER NOT NULL, -- crop size the geometry refers to
+    image_height INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (aruco_id, category)
+);
@@ -12,7 +12,9 @@ if [ ! -f "$DB_PATH" ]; then
     sqlite3 "$DB_PATH" < "$INIT_SQL" || echo "SQLite init script had warnings but continuing..."
     echo "Done!"
 else
-    echo "SQLite database already exists, skipping initialization."
+    # all statements are IF NOT EXISTS, this only adds tables introduced later
+    echo "SQLite database already exists, applying missing tables..."
+    sqlite3 "$DB_PATH" < "$INIT_SQL" || echo "SQLite init script had warnings but continuing..."
 fi
 
 # Keep container running
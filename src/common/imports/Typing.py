@@ -1,6 +1,17 @@
 # This file is necessary to avoid circular imports and dependency issues.
 # -> So working on this project will still be enjoyable in 10 years.
-from typing import Optional, Dict, Any, Callable, Tuple, List, Literal, Generator
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
+
 from cv2.typing import MatLike
 
 __all__ = [
@@ -13,4 +24,5 @@ __all__ = [
     "Literal",
     "MatLike",
     "Generator",
+    "Union",
 ]
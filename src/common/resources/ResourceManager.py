@@ -0,0 +1,158 @@
+import os
+import threading
+
+import cv2
+
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import List, Optional
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS
+from credentials.configs.reader.ResourcesConfigReader import (
+    DEFAULT_POOL_SIZES,
+    DEFAULT_THREADS,
+    ResourcesConfigReader,
+)
+
+MAIN = RESOURCES_KEYS.MAIN.value
+WORKER = RESOURCES_KEYS.WORKER.value
+
+# read by OpenMP / BLAS runtimes that are loaded after apply(), and inherited
+# by spawned children before they import numpy / torch
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+class ResourceManager:
+    """
+    Process-wide CPU budget (configs/resources.yaml).
+
+    Every process calls `apply()` once: the analysis process as MAIN, every
+    pool process as WORKER from its initializer. It pins torch, OpenCV, the
+    BLAS / OpenMP pools and joblib to the configured thread count, so pools
+    of processes do not oversubscribe the cores. Pool sizes and the
+    scikit-learn job count are read from the same place.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, resources_config_reader: Optional[ResourcesConfigReader] = None):
+        if hasattr(self, "_initialized") and self._initialized:
+            return
+
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._threadpool_limits = None
+        self.role: Optional[str] = None
+        self.worker_index: Optional[int] = None
+
+        try:
+            self._reader = resources_config_reader or ResourcesConfigReader()
+        except (Exception, BaseAppException) as e:
+            # without resources.yaml the defaults still avoid oversubscription
+            print(f"[ResourceManager] using default budget: {e}")
+            self._reader = None
+
+    def threads(self, role: str = MAIN) -> int:
+        if self._reader is None:
+            return DEFAULT_THREADS[role]
+        return self._reader.getThreads(role=role)
+
+    def pool_size(self, pool: str) -> int:
+        if self._reader is None:
+            return DEFAULT_POOL_SIZES[pool]
+        return self._reader.getPoolSize(pool=pool)
+
+    @property
+    def sklearn_jobs(self) -> int:
+        if self._reader is None:
+            return 1
+        return self._reader.getSklearnJobs()
+
+    @property
+    def cpu_affinity(self) -> bool:
+        if self._reader is None:
+            return False
+        return self._reader.getCpuAffinity()
+
+    def apply(self, role: str = MAIN, worker_index: Optional[int] = None) -> int:
+        """Applies the thread budget of `role` to this process, returns the thread count."""
+        threads = self.threads(role=role)
+
+        with self._lock:
+            self.role = role
+            self.worker_index = worker_index
+
+            for name in THREAD_ENV_VARS:
+                os.environ[name] = str(threads)
+            os.environ["LOKY_MAX_CPU_COUNT"] = str(self.sklearn_jobs)
+
+            cv2.setNumThreads(threads)
+            self._apply_torch(threads)
+            self._apply_threadpools(threads)
+
+            if role == WORKER and worker_index is not None and self.cpu_affinity:
+                self._pin(self.cores_for_worker(worker_index, threads))
+
+        return threads
+
+    @staticmethod
+    def _apply_torch(threads: int) -> None:
+        try:
+            import torch
+        except ImportError:
+            return
+
+        torch.set_num_threads(threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            # only allowed before the first parallel op, keep whatever is set
+            pass
+
+    def _apply_threadpools(self, threads: int) -> None:
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            return
+
+        # kept alive: the limit holds for as long as the controller exists
+        self._threadpool_limits = threadpool_limits(limits=threads)
+
+    @staticmethod
+    def cores_for_worker(worker_index: int, threads: int) -> List[int]:
+        """Consecutive block of `threads` cores for the worker, wrapping around."""
+        if hasattr(os, "sched_getaffinity"):
+            available = sorted(os.sched_getaffinity(0))
+        else:
+            available = list(range(os.cpu_count() or 1))
+
+        start = (worker_index * threads) % len(available)
+        return [available[(start + i) % len(available)] for i in range(threads)]
+
+    @staticmethod
+    def _pin(cores: List[int]) -> None:
+        if not hasattr(os, "sched_setaffinity"):
+            print("[ResourceManager] cpu_affinity is not supported on this platform")
+            return
+        os.sched_setaffinity(0, set(cores))
+
+
+def init_pool_worker(worker_counter) -> int:
+    """
+    Pool initializer helper: numbers the worker through a shared counter
+    (multiprocessing.Value) and applies the WORKER budget. Returns the index.
+    """
+    with worker_counter.get_lock():
+        worker_index = worker_counter.value
+        worker_counter.value += 1
+
+    ResourceManager().apply(role=WORKER, worker_index=worker_index)
+    return worker_index
@@ -0,0 +1,54 @@
+import queue
+import time
+from dataclasses import dataclass, field
+
+from common.imports.Typing import Dict, Generator, Optional
+
+
+@dataclass(frozen=True)
+class Capture:
+    # raw bytes as delivered by the ImageClient (JPEG), never re-encoded
+    image_data: bytes
+    waypoint_id: Optional[str] = None
+    camera_source: str = "hand_color_image"
+    captured_at: float = field(default_factory=time.time)
+    # odom_tform_body at capture time: x, y, z in meters, yaw in rad
+    pose: Dict[str, float] = field(default_factory=dict)
+
+
+class CaptureStream:
+    """
+    Hands captures from the mission thread to the analysis loop.
+
+    The queue is unbounded on purpose: the robot must never wait for the
+    analysis, it keeps walking to the next waypoint while earlier captures are
+    still being processed.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+
+    def publish(self, capture: Capture) -> None:
+        if self._closed:
+            raise RuntimeError("CaptureStream is already closed")
+        self._queue.put(capture)
+
+    def close(self) -> None:
+        """Signals the consumer that the mission will not publish anything else."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._CLOSED)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __iter__(self) -> Generator[Capture, None, None]:
+        while True:
+            capture = self._queue.get()
+            if capture is self._CLOSED:
+                return
+            yield capture
@@ -40,6 +40,8 @@ from bosdyn.client.gripper_camera_param import GripperCameraParamClient
 
 from dotenv import load_dotenv
 
+from common.sdk.CaptureStream import Capture, CaptureStream
+
 # Load robot credentials from a single well-known location; fall back to default behavior.
 _WORKSPACE_ROOT = Path(__file__).resolve().parents[3]
 _ROBOT_CREDENTIALS_PATH = os.environ.get(
@@ -54,8 +56,10 @@ if _ROBOT_CREDENTIALS_PATH and Path(_ROBOT_CREDENTIALS_PATH).exists():
 class RobotController:
     """Zentrale Verwaltung aller Robot-Clients und Power-/TimeSync-Handling."""
 
-    def __init__(self, robot):
+    def __init__(self, robot, capture_stream: CaptureStream = None):
         self.robot = robot
+        # if set, captures are handed to the analysis instead of written to disk
+        self.capture_stream = capture_stream
 
         # Force trigger timesync
         self.robot.time_sync.wait_for_sync()
@@ -193,6 +197,33 @@ class RobotController:
 
             print("Exception thrown saving image. %r", exc)
 
+    def publish_image(self, image_response, waypoint_id=None):
+        """Publishes the raw JPEG bytes plus waypoint / pose to the capture stream."""
+        pose = {}
+        try:
+            robot_state = self.state_client.get_robot_state()
+            odom_tform_body = get_odom_tform_body(
+                robot_state.kinematic_state.transforms_snapshot
+            )
+            pose = {
+                "x": odom_tform_body.x,
+                "y": odom_tform_body.y,
+                "z": odom_tform_body.z,
+                "yaw": odom_tform_body.rot.to_yaw(),
+            }
+        except Exception as exc:
+            print(f"[Capture] Pose nicht verfügbar: {exc}")
+
+        self.capture_stream.publish(
+            Capture(
+                image_data=image_response.shot.image.data,
+                waypoint_id=waypoint_id,
+                camera_source=image_response.source.name,
+                pose=pose,
+            )
+        )
+        print(f"[Capture] Bild von Waypoint {waypoint_id} an Analyse übergeben")
+
     def set_high_res_auto_params(self):
         """
         Setzt die höchste Auflösung (4208x3120) und aktiviert alle Auto-Modi
@@ -260,7 +291,7 @@ class RobotController:
             )
             return False
         
-    def execute_arm_sequence(self):
+    def execute_arm_sequence(self, waypoint_id=None):
         """
         Führt die Arm- und Greifer-Sequenz aus, inklusive Bildaufnahme.
         """
@@ -330,8 +361,11 @@ class RobotController:
             # Request the image
             image_response = self.image_client.get_image([image_request])[0]
 
-            self.maybe_save_image(image_response.shot.image, path=OUTPUT_DIR)
-            print("Bild erfolgreich gespeichert")
+            if self.capture_stream is not None:
+                self.publish_image(image_response, waypoint_id=waypoint_id)
+            else:
+                self.maybe_save_image(image_response.shot.image, path=OUTPUT_DIR)
+                print("Bild erfolgreich gespeichert")
             time.sleep(6)
 
         time.sleep(4)
@@ -787,8 +821,33 @@ def main():
     )
     options = parser.parse_args()
 
+    return run_mission(
+        upload_filepath=options.upload_filepath,
+        dock_id=options.dock_id,
+        hostname=options.hostname,
+    )
+
+
+def run_mission(upload_filepath, dock_id=520, hostname=None, capture_stream=None):
+    """
+    Runs the whole mission. With a capture stream the images are published
+    while the robot keeps walking; the stream is closed when the mission ends.
+    """
+    try:
+        return _run_mission(
+            upload_filepath=upload_filepath,
+            dock_id=dock_id,
+            hostname=hostname,
+            capture_stream=capture_stream,
+        )
+    finally:
+        if capture_stream is not None:
+            capture_stream.close()
+
+
+def _run_mission(upload_filepath, dock_id, hostname, capture_stream):
     # Setup and authenticate the robot.
-    hostname = options.hostname or os.environ.get("YOUR_ROBOT_IP")
+    hostname = hostname or os.environ.get("YOUR_ROBOT_IP")
     if not hostname:
         raise RuntimeError(
             "No hostname provided. Pass --hostname, set BOSDYN CLI args, or define YOUR_ROBOT_IP."
@@ -798,14 +857,14 @@ def main():
     bosdyn.client.util.authenticate(robot)
 
     # --- RobotController erzeugen ---
-    rc = RobotController(robot)
+    rc = RobotController(robot, capture_stream=capture_stream)
 
     # Create nogui estop
     # estop_nogui = EstopNoGui(rc.estop_client, 'Estop NoGUI')
     # estop_nogui.allow()
 
     # Initialize GraphNavInterface
-    navigation = GraphNavInterface(rc, options.upload_filepath)
+    navigation = GraphNavInterface(rc, upload_filepath)
 
     try:
         # Acquire lease
@@ -833,19 +892,18 @@ def main():
                 navigation._set_initial_localization_fiducial()
 
                 print("Gehe zu Location")
-                is_finished = navigation._navigate_to(
-                    ["smudgy-egg-bSeP0QBNrPEnUlmjxrvTNw=="]
-                )  # default
+                waypoint = "smudgy-egg-bSeP0QBNrPEnUlmjxrvTNw=="
+                is_finished = navigation._navigate_to([waypoint])  # default
 
                 if is_finished:
-                    rc.execute_arm_sequence()
+                    rc.execute_arm_sequence(waypoint_id=waypoint)
 
                 is_finished = False
                 is_finished = navigation._navigate_to(
                     ["soiled-lapdog-fPT7RjQ+8okX+FN9gHbFSg=="]
                 )  # waypoint 2 wieder zurück irgendwo hin
                 if is_finished:
-                    dock_id = options.dock_id or 520
+                    dock_id = dock_id or 520
                     print(f"Starte Docking an Dock-ID {dock_id}...")
                     dock_success = rc.dock(dock_id)
                     if dock_success:
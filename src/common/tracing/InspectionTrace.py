@@ -0,0 +1,125 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+
+from common.imports.Typing import Generator, List, Optional
+
+_current_trace: ContextVar[Optional["InspectionTrace"]] = ContextVar(
+    "inspection_trace", default=None
+)
+_current_span: ContextVar[Optional[str]] = ContextVar("inspection_span", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    parent: Optional[str]
+    # seconds since the trace was opened
+    start_offset_s: float
+    wall_s: float
+    # CPU time of the thread that ran the span
+    cpu_s: float
+    thread: str
+
+
+class InspectionTrace:
+    """
+    Collects wall / CPU time per pipeline stage of one inspection.
+
+    The trace opened with `with InspectionTrace():` becomes the current trace of
+    the calling context; `trace_span()` anywhere down the call stack records
+    into it and is a no-op without an open trace. Work handed to other threads
+    (write-behind queue, upload pool) passes the trace explicitly, work in
+    other processes (CVExecutor) records into a local trace whose spans are
+    merged back with `merge`.
+    """
+
+    def __init__(self, raw_image_id: Optional[int] = None):
+        self.raw_image_id = raw_image_id
+        self.spans: List[Span] = []
+        self._origin = time.perf_counter()
+        # perf_counter is per process, merged spans are aligned on wall time
+        self.origin_wall = time.time()
+        self._lock = threading.Lock()
+        self._token = None
+
+    def __enter__(self) -> "InspectionTrace":
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._token is not None:
+            _current_trace.reset(self._token)
+            self._token = None
+
+    @staticmethod
+    def current() -> Optional["InspectionTrace"]:
+        return _current_trace.get()
+
+    @contextmanager
+    def span(self, name: str) -> Generator[None, None, None]:
+        parent = _current_span.get()
+        token = _current_span.set(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu_s = time.thread_time() - cpu_start
+            wall_end = time.perf_counter()
+            _current_span.reset(token)
+            with self._lock:
+                self.spans.append(
+                    Span(
+                        name=name,
+                        parent=parent,
+                        start_offset_s=wall_start - self._origin,
+                        wall_s=wall_end - wall_start,
+                        cpu_s=cpu_s,
+                        thread=threading.current_thread().name,
+                    )
+                )
+
+    def merge(
+        self, spans: List[Span], origin_wall: float, parent: Optional[str] = None
+    ) -> None:
+        """
+        Adds the spans of a trace opened at `origin_wall` (time.time()) in
+        another process; its top-level spans become children of `parent`.
+        """
+        shift = origin_wall - self.origin_wall
+        merged = [
+            replace(
+                span,
+                parent=span.parent if span.parent is not None else parent,
+                start_offset_s=span.start_offset_s + shift,
+            )
+            for span in spans
+        ]
+        with self._lock:
+            self.spans.extend(merged)
+
+    @staticmethod
+    def current_span() -> Optional[str]:
+        return _current_span.get()
+
+    def summary(self) -> str:
+        with self._lock:
+            spans = list(self.spans)
+        return ", ".join(f"{s.name}={s.wall_s * 1000:.1f}ms" for s in spans)
+
+
+@contextmanager
+def trace_span(
+    name: str, trace: Optional[InspectionTrace] = None
+) -> Generator[None, None, None]:
+    """Records `name` into the given or the current trace, if there is one."""
+    trace = trace or _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    with trace.span(name):
+        yield
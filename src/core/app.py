@@ -1,84 +1,71 @@
-import subprocess
-import sys
+import threading
+import time
 from pathlib import Path
 
+from common.exceptions.BaseAppException import BaseAppException
+from common.resources.ResourceManager import MAIN, ResourceManager
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS
+from common.sdk.CaptureStream import CaptureStream
+from common.sdk.robot_movement import run_mission
 from db.dal.DataAccessLayer import DataAccessLayer
-from app_lifespan import (
-    services,
-    process_analog_image,
-    check_anomaly,
-    handle_anomaly,
-    process_digital_image,
-)
+from cvision.frame.Frame import Frame
+from app_lifespan import services, run_inspection
+from cv_executor import CVExecutor
 
 if __name__ == "__main__":
 
     project_root = Path(__file__).resolve().parents[2]
-    robot_script = project_root / "src/common/sdk/robot_movement.py"
     graph_path = project_root / "data/map/downloaded_graph"
 
-    subprocess.run(
-         [sys.executable, str(robot_script), "-u", str(graph_path)],
-         check=True,
-         cwd=str(robot_script.parent),
-    )
-
-    path = project_root / "src/common/sdk/spot_bilder/spot.jpg"
+    start = time.perf_counter()
 
-    with open(path, "rb") as f:
-        image_bytes = f.read()
+    # before the models are loaded, torch / OpenCV size their pools on first use
+    resources = ResourceManager()
+    resources.apply(role=MAIN)
 
-    aruco_id = services.aruco_extractor.get_id(image_bytes=image_bytes)
-
-    aruco_id_analog = None
-    category_name_analog = "pressure"
-    opcua_node_id = services.settings_manager.getOPCUANodeByID(
-        aruco_id=aruco_id_analog, category_name=category_name_analog
+    # load all models while the robot is walking, so analysis starts warm
+    warm_up_thread = threading.Thread(
+        target=services.model_registry.warm_up, daemon=True
     )
+    warm_up_thread.start()
+
+    # the mission publishes every capture and keeps walking, analysis runs here
+    capture_stream = CaptureStream()
+    mission_result = {}
+    mission_thread = threading.Thread(
+        target=lambda: mission_result.update(
+            success=run_mission(
+                upload_filepath=str(graph_path), capture_stream=capture_stream
+            )
+        ),
+        name="robot-mission",
+    )
+    mission_thread.start()
+
+    warm_up_thread.join()
+
+    # analog gauge reading runs in worker processes, each loads its models once
+    with CVExecutor(
+        workers=resources.pool_size(RESOURCES_KEYS.CV_EXECUTOR)
+    ) as cv_executor, DataAccessLayer(
+        write_behind=True,
+        upload_workers=resources.pool_size(RESOURCES_KEYS.UPLOAD),
+    ) as dal:
+        services.cv_executor = cv_executor
+        for capture in capture_stream:
+            print(f"[App] Analysing capture from waypoint {capture.waypoint_id}")
+            frame = Frame.from_bytes(
+                capture.image_data, source_name=capture.waypoint_id or "raw"
+            )
+            try:
+                run_inspection(dal=dal, frame=frame)
+            except (Exception, BaseAppException) as e:
+                # one bad capture must not stop the analysis of the others
+                print(f"[App] Inspection failed for waypoint {capture.waypoint_id}: {e}")
 
-    with DataAccessLayer() as dal:
-        dto_raw_image = services.raw_image_mapper.map_image(image_data=image_bytes)
-        raw_image_id = dal.insert_raw_image(raw_image_with_metadata=dto_raw_image)
-
-        # at first, process analog gauge
-        print("Aruco IDs: ", aruco_id)
-
-        if aruco_id is None:
-            raise Exception("No aruco id found in image")
-
-        analyzed_image_id, detected_value = process_analog_image(
-            dal=dal,
-            image_bytes=image_bytes,
-            raw_image_id=raw_image_id,
-            opcua_node_id=opcua_node_id,
-            aruco_id=aruco_id_analog,
-            category_name=category_name_analog,
-        )
-
-        is_anomaly = check_anomaly(
-            dal=dal,
-            analyzed_image_id=analyzed_image_id,
-            detected_value=detected_value,
-            aruco_id=aruco_id_analog,
-            category_name=category_name_analog,
-        )
-
-        handle_anomaly(is_anomaly=is_anomaly)
-
-        # TODO: same for digital sensors
+    mission_thread.join()
 
-        for analyzed_image_id, detected_value, category in process_digital_image(
-            dal=dal,
-            image_bytes=image_bytes,
-            raw_image_id=raw_image_id,
-            opcua_node_id=opcua_node_id,
-            aruco_id=aruco_id,
-        ):
-            # Get anomaly score and status
-            anomaly_score, is_anomaly = services.anomaly_checker.is_anomaly(
-                value_to_check=detected_value,
-                aruco_id=aruco_id,
-                category_name=category,
-            )
-            print(f"[RESULT] {category}: value={detected_value} | score={anomaly_score} | anomaly={is_anomaly}")
-            handle_anomaly(is_anomaly=is_anomaly)
+    print(
+        f"[App] Mission {'finished' if mission_result.get('success') else 'failed'} "
+        f"after {time.perf_counter() - start:.1f}s"
+    )
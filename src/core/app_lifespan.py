@@ -1,42 +1,96 @@
-from dataclasses import dataclass, field
-from common.imports.Typing import Optional, Tuple, Generator
+from dataclasses import asdict, dataclass, field
+from common.imports.Typing import Optional, Tuple, Generator, List
 from db.mapping.input.RawImageMapper import RawImageMapper
 from db.mapping.input.AnalyzedImageMapper import AnalyzedImageMapper
 from db.mapping.input.AnomalyMapper import AnomalyMapper
+from db.mapping.input.InspectionTraceMapper import InspectionTraceMapper
+from db.mapping.input.InspectionCacheMapper import InspectionCacheMapper
 from credentials.manager.SettingsManager import SettingsManager
 from anomaly.AnomalyChecker import AnomalyChecker
-from cvision.analog.AnalogGaugeReader import AnalogGaugeReader
+from cvision.analog.AnalogGaugeReader import (
+    NEEDLE_DETECTOR_HOUGH,
+    AnalogGaugeFailure,
+    AnalogGaugeReading,
+    read_analog_gauge,
+    read_analog_gauges,
+    read_analog_gauges_in_boxes,
+)
 from cvision.analog.AnalogGaugeCropper import AnalogGaugeCropper
+from cvision.analog.GaugeCalibrationStore import GaugeCalibrationStore
+from cvision.analog.GaugeSensorMapper import GaugeAssignment, GaugeSensorMapper
+from cvision.analog.exceptions.GaugeReadingFailed import GaugeReadingFailed
 from cvision.aruco.ArUcoIDExtractor import ArUcoIDExtraktor
 from db.dal.DataAccessLayer import DataAccessLayer
 from cvision.digital.DigitalCropper import YoloDisplayCropper
 from cvision.digital.DigitalValueReader import EasyOcrDisplayValueReader
+from cvision.registry.ModelRegistry import ModelRegistry
+from cvision.registry.PipelineFingerprint import content_hash, pipeline_fingerprint
+from cvision.frame.Frame import Frame
+from concurrent.futures import Future
+from common.tracing.InspectionTrace import InspectionTrace, trace_span
+from common.exceptions.BaseAppException import BaseAppException
+from cv_executor import CVExecutor
 
 
 @dataclass
 class Initializer:
 
+    model_registry: ModelRegistry = field(default_factory=ModelRegistry)
     raw_image_mapper: RawImageMapper = field(default_factory=RawImageMapper)
     analyzed_image_mapper: AnalyzedImageMapper = field(
         default_factory=AnalyzedImageMapper
     )
     anomaly_mapper: AnomalyMapper = field(default_factory=AnomalyMapper)
+    inspection_trace_mapper: InspectionTraceMapper = field(
+        default_factory=InspectionTraceMapper
+    )
+    inspection_cache_mapper: InspectionCacheMapper = field(
+        default_factory=InspectionCacheMapper
+    )
     settings_manager: SettingsManager = field(default_factory=SettingsManager)
     aruco_extractor: ArUcoIDExtraktor = field(default_factory=ArUcoIDExtraktor)
     anomaly_checker: AnomalyChecker = field(default_factory=AnomalyChecker)
     analog_gauge_cropper: AnalogGaugeCropper = field(default_factory=AnalogGaugeCropper)
+    gauge_calibration_store: GaugeCalibrationStore = field(
+        default_factory=GaugeCalibrationStore
+    )
+    gauge_sensor_mapper: GaugeSensorMapper = field(default_factory=GaugeSensorMapper)
     digital_sensor_cropper: YoloDisplayCropper = field(
         default_factory=YoloDisplayCropper
     )
+    # optional process pool for CPU-bound stages, set up by the entrypoint
+    cv_executor: Optional[CVExecutor] = None
+    digital_value_reader: EasyOcrDisplayValueReader = field(
+        default_factory=lambda: EasyOcrDisplayValueReader(
+            languages=["en", "de"], gpu=False, verbose=True
+        )
+    )
 
 
 initializer = Initializer()
 services = initializer
 
 
+@dataclass
+class Reading:
+    category: str
+    value: float
+    analyzed_image_id: int
+    is_anomaly: bool
+
+
+@dataclass
+class InspectionResult:
+    raw_image_id: int
+    aruco_id: Optional[int]
+    readings: List[Reading] = field(default_factory=list)
+    # served from the result cache, raw_image_id is the first analysis
+    cached: bool = False
+
+
 def safe_analyzed_image(
     dal: DataAccessLayer,
-    image_bytes: bytes,
+    image: Frame,
     raw_image_id: int,
     sensor_type: str,
     opcua_node_id: str,
@@ -44,10 +98,13 @@ def safe_analyzed_image(
     detected_value: float,
     unit: str,
     category: str,
-) -> int:
+    image_ext: Optional[str] = None,
+    image_quality: Optional[int] = None,
+) -> Future:
 
+    # encoding only happens here, at the persistence boundary
     dto_analyzed_image = services.analyzed_image_mapper.map_image(
-        image_data=image_bytes,
+        image_data=image.encode(ext=image_ext, quality=image_quality),
         raw_image_id=raw_image_id,
         sensor_type=sensor_type,
         opcua_node_id=opcua_node_id,
@@ -56,23 +113,140 @@ def safe_analyzed_image(
         unit=unit,
         category=category,
     )
-    analyzed_image_id = dal.insert_analyzed_image(
+    # resolves to the analyzed_image_id, the upload itself is not awaited
+    return dal.insert_analyzed_image_async(
         anaylzed_image_with_metadata=dto_analyzed_image
     )
 
-    return analyzed_image_id
 
+def start_analog_reading(
+    frame: Frame,
+    category_name: Optional[str] = "pressure",
+    dal: Optional[DataAccessLayer] = None,
+    gauge_aruco_id: Optional[int] = None,
+) -> Tuple[Frame, Future]:
+    """
+    Crops the gauge and starts reading it. With a CV executor the reading runs
+    in a worker process and the caller can do other work in the meantime.
+
+    `gauge_aruco_id` identifies the mounted gauge, its stored calibration is
+    handed to the reader and only recomputed if it drifted, and its last box
+    restricts the gauge detection to the region around it.
+    """
+    cropped_analog_gauge_image = services.analog_gauge_cropper.process(
+        frame=frame, roi_key=gauge_aruco_id
+    )
 
-def process_analog_image(
+    calibration = None
+    if dal is not None:
+        calibration = services.gauge_calibration_store.get(
+            dal=dal, aruco_id=gauge_aruco_id, category=category_name
+        )
+
+    if services.cv_executor is not None:
+        reading_future = services.cv_executor.submit(
+            read_analog_gauge,
+            cropped_analog_gauge_image,
+            category=category_name,
+            calibration=calibration,
+        )
+    else:
+        reading_future = Future()
+        try:
+            reading_future.set_result(
+                read_analog_gauge(
+                    cropped_analog_gauge_image,
+                    category=category_name,
+                    calibration=calibration,
+                )
+            )
+        except (Exception, BaseAppException) as e:
+            reading_future.set_exception(e)
+
+    return cropped_analog_gauge_image, reading_future
+
+
+def start_analog_readings(
+    frame: Frame,
+    markers: List[Tuple[int, Tuple[float, float]]],
+    dal: Optional[DataAccessLayer] = None,
+    capture_aruco_id: Optional[int] = None,
+) -> Tuple[List[Tuple[GaugeAssignment, Frame]], Future]:
+    """
+    Detects every gauge of the capture in one pass, maps each one to its
+    sensor by ArUco proximity and starts reading all of them together.
+
+    Returns the (assignment, crop) pairs and a future of the readings in the
+    same order, an AnalogGaugeFailure for a gauge that could not be read.
+    """
+    cropper = services.analog_gauge_cropper
+    boxes = cropper.locate_all(frame.bgr, roi_key=capture_aruco_id)
+    assignments = services.gauge_sensor_mapper.assign(
+        list(boxes), markers, fallback_marker_id=capture_aruco_id
+    )
+
+    crops = [
+        Frame.from_array(
+            cropper.crop_box(frame.bgr, assignment.box), source_name=frame.source_name
+        )
+        for assignment in assignments
+    ]
+    calibrations = [
+        (
+            services.gauge_calibration_store.get(
+                dal=dal, aruco_id=assignment.marker_id, category=assignment.category
+            )
+            if dal is not None
+            else None
+        )
+        for assignment in assignments
+    ]
+    categories = [assignment.category for assignment in assignments]
+    aruco_ids = [assignment.aruco_id for assignment in assignments]
+
+    if services.cv_executor is not None and assignments:
+        readings_future = services.cv_executor.submit(
+            read_analog_gauges_in_boxes,
+            frame,
+            [assignment.box for assignment in assignments],
+            categories,
+            aruco_ids=aruco_ids,
+            calibrations=calibrations,
+            output_size=cropper.output_size,
+        )
+    else:
+        readings_future = Future()
+        try:
+            readings_future.set_result(
+                read_analog_gauges(
+                    crops, categories, aruco_ids=aruco_ids, calibrations=calibrations
+                )
+            )
+        except (Exception, BaseAppException) as e:
+            readings_future.set_exception(e)
+
+    return list(zip(assignments, crops)), readings_future
+
+
+def persist_analog_reading(
     dal: DataAccessLayer,
-    image_bytes: bytes,
+    cropped_analog_gauge_image: Frame,
+    reading: AnalogGaugeReading,
     raw_image_id: int,
     opcua_node_id: str,
     aruco_id: Optional[int] = None,
     category_name: Optional[str] = "pressure",
+    gauge_aruco_id: Optional[int] = None,
 ) -> Tuple[int, float]:
 
-    cropped_analog_gauge_image = services.analog_gauge_cropper.process(img=image_bytes)
+    if reading.recalibrated and reading.calibration is not None:
+        services.gauge_calibration_store.put(
+            dal=dal,
+            aruco_id=gauge_aruco_id,
+            category=category_name,
+            calibration=reading.calibration,
+        )
+
     analog_unit = services.settings_manager.getUnit(
         aruco_id=aruco_id, category_name=category_name
     )
@@ -84,14 +258,21 @@ def process_analog_image(
     lower_bound = real_value * (1 - value_tolerance)
     upper_bound = real_value * (1 + value_tolerance)
 
-    with AnalogGaugeReader(
-        img=cropped_analog_gauge_image, category=category_name
-    ) as analog_gauge_reader:
-        center_x, center_y, radius = analog_gauge_reader.calibrate()
-        detected_value = analog_gauge_reader.get_current_value(
-            x=center_x, y=center_y, r=radius
-        )
+    detected_value = reading.value
+    needle_detector = services.settings_manager.getNeedleDetector(
+        aruco_id=aruco_id, category_name=category_name
+    )
 
+    if needle_detector != NEEDLE_DETECTOR_HOUGH:
+        # polar / keypoints raise NeedleNotFound instead of returning -1, a
+        # reading is stored as measured and the anomaly check reports it
+        if not (lower_bound <= detected_value <= upper_bound):
+            print(
+                "Debug: detected value is out of tolerance range, keeping it",
+                detected_value,
+                real_value,
+            )
+    else:
         if detected_value == -1:
             print("Debug: no value detected, using fallback value:", real_value)
             detected_value = real_value
@@ -104,9 +285,29 @@ def process_analog_image(
             )
             detected_value = real_value
 
-        analyzed_image_id = safe_analyzed_image(
+    analyzed_image_future = safe_analyzed_image(
+        dal=dal,
+        image=cropped_analog_gauge_image,
+        raw_image_id=raw_image_id,
+        sensor_type="analog",
+        opcua_node_id=opcua_node_id,
+        aruco_id=aruco_id,
+        detected_value=detected_value,
+        unit=analog_unit,
+        category=category_name,
+        image_ext=".png",
+    )
+
+    # debug images are fire-and-forget, failures surface on dal flush
+    debug_ext = services.settings_manager.getDebugArtifactFormat()
+    debug_quality = services.settings_manager.getDebugArtifactQuality()
+    for debug_image in reading.debug_images:
+
+        safe_analyzed_image(
             dal=dal,
-            image_bytes=cropped_analog_gauge_image,
+            image=Frame.from_array(debug_image),
+            image_ext=debug_ext,
+            image_quality=debug_quality,
             raw_image_id=raw_image_id,
             sensor_type="analog",
             opcua_node_id=opcua_node_id,
@@ -116,21 +317,36 @@ def process_analog_image(
             category=category_name,
         )
 
-        for idx, img_bytes in enumerate(analog_gauge_reader.get_images_log()):
-
-            analyzed_image_id = safe_analyzed_image(
-                dal=dal,
-                image_bytes=img_bytes,
-                raw_image_id=raw_image_id,
-                sensor_type="analog",
-                opcua_node_id=opcua_node_id,
-                aruco_id=aruco_id,
-                detected_value=detected_value,
-                unit=analog_unit,
-                category=category_name,
-            )
+    return analyzed_image_future.result(), detected_value
+
+
+def process_analog_image(
+    dal: DataAccessLayer,
+    frame: Frame,
+    raw_image_id: int,
+    opcua_node_id: str,
+    aruco_id: Optional[int] = None,
+    category_name: Optional[str] = "pressure",
+    gauge_aruco_id: Optional[int] = None,
+) -> Tuple[int, float]:
+
+    cropped_analog_gauge_image, reading_future = start_analog_reading(
+        frame=frame,
+        category_name=category_name,
+        dal=dal,
+        gauge_aruco_id=gauge_aruco_id,
+    )
 
-    return analyzed_image_id, detected_value
+    return persist_analog_reading(
+        dal=dal,
+        cropped_analog_gauge_image=cropped_analog_gauge_image,
+        reading=reading_future.result(),
+        raw_image_id=raw_image_id,
+        opcua_node_id=opcua_node_id,
+        aruco_id=aruco_id,
+        category_name=category_name,
+        gauge_aruco_id=gauge_aruco_id,
+    )
 
 
 def check_anomaly(
@@ -162,7 +378,7 @@ def check_anomaly(
         **parameters,
     )
 
-    dal.insert_anomaly(anomaly_with_metadata=anomaly_dto)
+    dal.insert_anomaly_async(anomaly_with_metadata=anomaly_dto)
 
     return is_anomaly
 
@@ -178,22 +394,20 @@ def handle_anomaly(is_anomaly: bool) -> None:
 
 def process_digital_image(
     dal: DataAccessLayer,
-    image_bytes: bytes,
+    frame: Frame,
     raw_image_id: int,
     opcua_node_id: str,
     aruco_id: Optional[int] = None,
 ) -> Generator[int, float, str]:
-    reader = EasyOcrDisplayValueReader(languages=["en", "de"], gpu=False, verbose=True)
+    reader = services.digital_value_reader
 
-    cropped_digital_images = services.digital_sensor_cropper.crop_from_bytes(
-        raw_image_bytes=image_bytes
+    cropped_digital_images = services.digital_sensor_cropper.crop_from_frame(
+        frame=frame
     )
 
     for cropped_digital_image in cropped_digital_images:
 
-        result = reader.read_from_crop_bytes(
-            crop_jpg_bytes=cropped_digital_image.crop_bytes
-        )
+        result = reader.read_from_frame(frame=cropped_digital_image.crop_frame)
         # Skip unknown display types (no config, no anomaly check)
         if result.display_type == "unknown":
             print("[INFO] Skipping unknown display type (no config, no anomaly check)")
@@ -232,7 +446,9 @@ def process_digital_image(
             if result.temperature is not None:
                 analyzed_image_id = safe_analyzed_image(
                     dal=dal,
-                    image_bytes=cropped_digital_image.crop_bytes,
+                    image=cropped_digital_image.crop_frame,
+                    image_ext=".jpg",
+                    image_quality=cropped_digital_image.jpeg_quality,
                     raw_image_id=raw_image_id,
                     sensor_type="tempdisplay",
                     opcua_node_id=opcua_node_id,
@@ -240,13 +456,15 @@ def process_digital_image(
                     detected_value=result.temperature,
                     unit=result.temperature_unit or config_unit,
                     category="tempdisplay",
-                )
+                ).result()
                 yield analyzed_image_id, result.temperature, "tempdisplay"
             # Humidity
             if result.humidity is not None:
                 analyzed_image_id = safe_analyzed_image(
                     dal=dal,
-                    image_bytes=cropped_digital_image.crop_bytes,
+                    image=cropped_digital_image.crop_frame,
+                    image_ext=".jpg",
+                    image_quality=cropped_digital_image.jpeg_quality,
                     raw_image_id=raw_image_id,
                     sensor_type="humidity",
                     opcua_node_id=opcua_node_id,
@@ -254,13 +472,15 @@ def process_digital_image(
                     detected_value=result.humidity,
                     unit=result.humidity_unit or "%",
                     category="humidity",
-                )
+                ).result()
                 yield analyzed_image_id, result.humidity, "humidity"
         elif result.display_type == "ofen":
             if result.ofen_value is not None:
                 analyzed_image_id = safe_analyzed_image(
                     dal=dal,
-                    image_bytes=cropped_digital_image.crop_bytes,
+                    image=cropped_digital_image.crop_frame,
+                    image_ext=".jpg",
+                    image_quality=cropped_digital_image.jpeg_quality,
                     raw_image_id=raw_image_id,
                     sensor_type="ofen",
                     opcua_node_id=opcua_node_id,
@@ -268,14 +488,16 @@ def process_digital_image(
                     detected_value=result.ofen_value,
                     unit=result.ofen_unit or config_unit,
                     category="ofen",
-                )
+                ).result()
                 yield analyzed_image_id, result.ofen_value, "ofen"
         else:
             # fallback: yield whatever was detected
             if result.temperature is not None:
                 analyzed_image_id = safe_analyzed_image(
                     dal=dal,
-                    image_bytes=cropped_digital_image.crop_bytes,
+                    image=cropped_digital_image.crop_frame,
+                    image_ext=".jpg",
+                    image_quality=cropped_digital_image.jpeg_quality,
                     raw_image_id=raw_image_id,
                     sensor_type=result.display_type,
                     opcua_node_id=opcua_node_id,
@@ -283,5 +505,205 @@ def process_digital_image(
                     detected_value=result.temperature,
                     unit=result.temperature_unit or config_unit,
                     category=result.display_type,
-                )
+                ).result()
                 yield analyzed_image_id, result.temperature, result.display_type
+
+
+def run_inspection(dal: DataAccessLayer, frame: Frame) -> InspectionResult:
+    """Runs ArUco -> crop -> read -> anomaly -> persist for one captured frame."""
+    with InspectionTrace() as trace:
+        try:
+            with trace.span("inspection"):
+                cache_key = _cache_key(frame=frame)
+                cached_result = _get_cached_result(dal=dal, cache_key=cache_key)
+                if cached_result is not None:
+                    trace.raw_image_id = cached_result.raw_image_id
+                    return cached_result
+
+                result = _inspect(dal=dal, frame=frame, trace=trace)
+                _cache_result(dal=dal, cache_key=cache_key, result=result)
+                return result
+        finally:
+            # the trace is keyed by raw_image_id, without it there is nothing to link
+            if trace.raw_image_id is not None:
+                dal.insert_inspection_trace(
+                    trace_with_metadata=services.inspection_trace_mapper.map_trace(
+                        trace
+                    )
+                )
+                print(f"[Trace] {trace.summary()}")
+
+
+def _cache_key(frame: Frame) -> Optional[Tuple[str, str]]:
+    if not services.settings_manager.getResultCacheEnabled():
+        return None
+    # the fingerprint is recomputed per frame, so a changed model or config
+    # invalidates the cache without a restart
+    return content_hash(frame.encode()), pipeline_fingerprint()
+
+
+def _get_cached_result(
+    dal: DataAccessLayer, cache_key: Optional[Tuple[str, str]]
+) -> Optional[InspectionResult]:
+    if cache_key is None:
+        return None
+
+    try:
+        cached = dal.get_cached_inspection(
+            content_hash=cache_key[0], fingerprint=cache_key[1]
+        )
+    except (Exception, BaseAppException) as e:
+        # the cache only saves work, a broken cache must not stop the inspection
+        print(f"[Cache] lookup failed, analysing again: {e}")
+        return None
+
+    if cached is None:
+        return None
+
+    print(f"[Cache] identical capture, reusing raw image {cached.raw_image_id}")
+    return InspectionResult(
+        raw_image_id=cached.raw_image_id,
+        aruco_id=cached.aruco_id,
+        readings=[Reading(**reading) for reading in cached.to_readings()],
+        cached=True,
+    )
+
+
+def _cache_result(
+    dal: DataAccessLayer,
+    cache_key: Optional[Tuple[str, str]],
+    result: InspectionResult,
+) -> None:
+    if cache_key is None:
+        return
+
+    try:
+        dal.insert_inspection_cache(
+            cache_with_metadata=services.inspection_cache_mapper.map_result(
+                content_hash=cache_key[0],
+                fingerprint=cache_key[1],
+                raw_image_id=result.raw_image_id,
+                aruco_id=result.aruco_id,
+                readings=[asdict(reading) for reading in result.readings],
+            )
+        )
+    except (Exception, BaseAppException) as e:
+        print(f"[Cache] storing the result failed: {e}")
+
+
+def _inspect(
+    dal: DataAccessLayer, frame: Frame, trace: InspectionTrace
+) -> InspectionResult:
+    markers = services.aruco_extractor.get_markers(frame=frame)
+    aruco_id = markers[0][0] if markers else None
+
+    aruco_id_analog = None
+    category_name_analog = "pressure"
+    opcua_node_id = services.settings_manager.getOPCUANodeByID(
+        aruco_id=aruco_id_analog, category_name=category_name_analog
+    )
+
+    dto_raw_image = services.raw_image_mapper.map_image(image_data=frame.encode())
+    raw_image_id = dal.insert_raw_image_async(
+        raw_image_with_metadata=dto_raw_image
+    ).result()
+    trace.raw_image_id = raw_image_id
+    result = InspectionResult(raw_image_id=raw_image_id, aruco_id=aruco_id)
+
+    print("Aruco IDs: ", [marker_id for marker_id, _ in markers])
+
+    if aruco_id is None:
+        raise Exception("No aruco id found in image")
+
+    # all analog gauges are read in the CV executor (if any) while the digital
+    # displays are read here
+    analog_gauges, analog_readings_future = start_analog_readings(
+        frame=frame,
+        markers=markers,
+        dal=dal,
+        capture_aruco_id=aruco_id,
+    )
+
+    for analyzed_image_id, detected_value, category in process_digital_image(
+        dal=dal,
+        frame=frame,
+        raw_image_id=raw_image_id,
+        opcua_node_id=opcua_node_id,
+        aruco_id=aruco_id,
+    ):
+        # Get anomaly score and status
+        anomaly_score, is_anomaly = services.anomaly_checker.is_anomaly(
+            value_to_check=detected_value,
+            aruco_id=aruco_id,
+            category_name=category,
+        )
+        print(
+            f"[RESULT] {category}: value={detected_value} | score={anomaly_score} | anomaly={is_anomaly}"
+        )
+        handle_anomaly(is_anomaly=is_anomaly)
+        result.readings.append(
+            Reading(
+                category=category,
+                value=detected_value,
+                analyzed_image_id=analyzed_image_id,
+                is_anomaly=is_anomaly,
+            )
+        )
+
+    with trace_span("analog_reading_wait"):
+        analog_readings = analog_readings_future.result()
+
+    analog_results = []
+    analog_failures = []
+    for (assignment, cropped_analog_gauge_image), analog_reading in zip(
+        analog_gauges, analog_readings
+    ):
+        if isinstance(analog_reading, AnalogGaugeFailure):
+            failure = (
+                f"{assignment.category} (ArUco {assignment.marker_id}): "
+                f"{analog_reading.error}"
+            )
+            print(f"[RESULT] reading failed: {failure}")
+            analog_failures.append(failure)
+            continue
+
+        analyzed_image_id, detected_value = persist_analog_reading(
+            dal=dal,
+            cropped_analog_gauge_image=cropped_analog_gauge_image,
+            reading=analog_reading,
+            raw_image_id=raw_image_id,
+            opcua_node_id=services.settings_manager.getOPCUANodeByID(
+                aruco_id=assignment.aruco_id, category_name=assignment.category
+            ),
+            aruco_id=assignment.aruco_id,
+            category_name=assignment.category,
+            gauge_aruco_id=assignment.marker_id,
+        )
+
+        is_anomaly = check_anomaly(
+            dal=dal,
+            analyzed_image_id=analyzed_image_id,
+            detected_value=detected_value,
+            aruco_id=assignment.aruco_id,
+            category_name=assignment.category,
+        )
+
+        handle_anomaly(is_anomaly=is_anomaly)
+        analog_results.append(
+            Reading(
+                category=assignment.category,
+                value=detected_value,
+                analyzed_image_id=analyzed_image_id,
+                is_anomaly=is_anomaly,
+            )
+        )
+
+    # analog first, as before the reorder
+    result.readings[0:0] = analog_results
+
+    if analog_failures:
+        # like a failing single gauge: the readable gauges are persisted, the
+        # inspection fails and is neither cached nor reported as complete
+        raise GaugeReadingFailed(error_code=1792700010, failures=analog_failures)
+
+    return result
@@ -0,0 +1,232 @@
+"""
+Batch re-inspection of historical captures.
+
+Examples:
+    python src/core/batch.py data/images/raw --workers 4
+    python src/core/batch.py "data/images/raw/**/*.jpg"
+    python src/core/batch.py minio://2025-12- --summary batch_summary.json
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import multiprocessing.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from app_lifespan import run_inspection
+
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import Any, Dict, List, Optional
+from common.resources.ResourceManager import MAIN, ResourceManager, init_pool_worker
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS
+from credentials.manager.SettingsManager import SettingsManager
+from cvision.frame.Frame import Frame
+from cvision.registry.ModelRegistry import ModelRegistry
+from db.dal.DataAccessLayer import DataAccessLayer
+from db.media.repository.MediaRepository import MediaRepository
+
+MINIO_SCHEME = "minio://"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+
+# write-behind DAL of this process, opened once by _init_worker
+_worker_dal: Optional[DataAccessLayer] = None
+
+
+@dataclass
+class BatchItemResult:
+    source: str
+    status: str
+    duration_s: float
+    raw_image_id: Optional[int] = None
+    aruco_id: Optional[int] = None
+    readings: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _is_image(path: str) -> bool:
+    return path.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def collect_sources(source: str) -> List[str]:
+    """Resolves a directory, a glob or a minio:// raw-bucket prefix into image sources."""
+    if source.startswith(MINIO_SCHEME):
+        prefix = source[len(MINIO_SCHEME) :]
+        bucket = SettingsManager().getMinioRawBucket()
+        names = MediaRepository(bucket_name=bucket).list_media(prefix=prefix)
+        return [MINIO_SCHEME + name for name in sorted(names) if _is_image(name)]
+
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source) if _is_image(name)
+        )
+
+    return sorted(
+        path
+        for path in glob.glob(source, recursive=True)
+        if os.path.isfile(path) and _is_image(path)
+    )
+
+
+def _read_source(source: str) -> bytes:
+    if source.startswith(MINIO_SCHEME):
+        bucket = SettingsManager().getMinioRawBucket()
+        return MediaRepository(bucket_name=bucket).get_media(
+            object_name=source[len(MINIO_SCHEME) :]
+        )
+
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _init_worker(worker_counter=None) -> None:
+    if worker_counter is None:
+        # inline run, the batch process is the only one doing analysis
+        ResourceManager().apply(role=MAIN)
+    else:
+        init_pool_worker(worker_counter)
+
+    # every worker holds its own warm copy of all models
+    ModelRegistry().warm_up()
+
+    global _worker_dal
+    _worker_dal = DataAccessLayer(
+        write_behind=True,
+        upload_workers=ResourceManager().pool_size(RESOURCES_KEYS.UPLOAD),
+    ).__enter__()
+    if worker_counter is not None:
+        # pool workers get no call on shutdown, flush when the process exits
+        multiprocessing.util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    global _worker_dal
+    dal, _worker_dal = _worker_dal, None
+    if dal is not None:
+        dal.__exit__(None, None, None)
+
+
+def inspect_source(source: str) -> BatchItemResult:
+    start = time.perf_counter()
+    try:
+        frame = Frame.from_bytes(_read_source(source), source_name=Path(source).stem)
+        result = run_inspection(dal=_worker_dal, frame=frame)
+
+        return BatchItemResult(
+            source=source,
+            status="ok",
+            duration_s=time.perf_counter() - start,
+            raw_image_id=result.raw_image_id,
+            aruco_id=result.aruco_id,
+            readings=[asdict(reading) for reading in result.readings],
+        )
+    except (Exception, BaseAppException) as e:
+        return BatchItemResult(
+            source=source,
+            status="failed",
+            duration_s=time.perf_counter() - start,
+            error=str(e),
+        )
+
+
+def run_batch(sources: List[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    workers = workers or ResourceManager().pool_size(RESOURCES_KEYS.BATCH)
+    results: List[BatchItemResult] = []
+    start = time.perf_counter()
+
+    def _collect(item: BatchItemResult) -> None:
+        results.append(item)
+        print(
+            f"[Batch] {len(results)}/{len(sources)} {item.status} "
+            f"{item.source} ({item.duration_s:.2f}s)"
+        )
+
+    if workers <= 1:
+        _init_worker()
+        try:
+            for source in sources:
+                _collect(inspect_source(source))
+        finally:
+            _close_worker()
+    else:
+        # spawn instead of fork: workers must not inherit sqlite / torch state
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(context.Value("i", 0),),
+        ) as pool:
+            futures = [pool.submit(inspect_source, source) for source in sources]
+            for future in as_completed(futures):
+                _collect(future.result())
+
+    wall_time_s = time.perf_counter() - start
+    order = {source: idx for idx, source in enumerate(sources)}
+    results.sort(key=lambda item: order[item.source])
+    succeeded = sum(1 for item in results if item.status == "ok")
+
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "workers": workers,
+        "wall_time_s": wall_time_s,
+        "throughput_images_per_s": len(results) / wall_time_s if wall_time_s else 0.0,
+        "images": [asdict(item) for item in results],
+    }
+
+
+def write_summary(summary: Dict[str, Any], path: str) -> None:
+    summary_dir = os.path.dirname(path)
+    if summary_dir:
+        os.makedirs(summary_dir, exist_ok=True)
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Re-run the inspection pipeline over many captured images"
+    )
+    parser.add_argument(
+        "source",
+        help="Directory, glob pattern or minio://<prefix> of the raw bucket",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: pools.batch in resources.yaml)",
+    )
+    parser.add_argument(
+        "--summary",
+        default="batch_summary.json",
+        help="Path of the JSON summary (default: batch_summary.json)",
+    )
+    args = parser.parse_args()
+
+    sources = collect_sources(args.source)
+    if not sources:
+        print(f"[Batch] No images found for '{args.source}'")
+        return
+
+    workers = args.workers or ResourceManager().pool_size(RESOURCES_KEYS.BATCH)
+    print(f"[Batch] {len(sources)} images, {workers} workers")
+    summary = run_batch(sources=sources, workers=workers)
+    write_summary(summary=summary, path=args.summary)
+
+    print(
+        f"[Batch] done: {summary['succeeded']}/{summary['total']} ok, "
+        f"{summary['wall_time_s']:.1f}s, "
+        f"{summary['throughput_images_per_s']:.2f} images/s -> {args.summary}"
+    )
+
+
+if __name__ == "__main__":
+    main()
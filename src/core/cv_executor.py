@@ -0,0 +1,198 @@
+"""
+Process-pool executor for CPU-bound CV stages.
+
+Frames are handed to the workers through multiprocessing.shared_memory, only a
+small handle (name, shape, dtype) is pickled. Every worker loads its models
+once in the pool initializer and keeps them for its whole lifetime.
+
+Stages are plain module-level functions taking a Frame as first argument,
+e.g. cvision.analog.AnalogGaugeReader.read_analog_gauge. A stage submitted
+while an InspectionTrace is open records its trace_spans into a trace of its
+own in the worker, they are merged into the caller's trace before the
+returned future completes.
+"""
+
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import Any, Callable, List, Optional, Tuple
+from common.resources.ResourceManager import ResourceManager, init_pool_worker
+from common.tracing.InspectionTrace import InspectionTrace, Span
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS
+from cvision.frame.Frame import Frame
+
+
+@dataclass
+class TracedStageResult:
+    """Outcome of a traced stage, the spans survive a failing stage."""
+
+    value: Any
+    error: Optional[BaseException]
+    spans: List[Span]
+    origin_wall: float
+
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    shm_name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    source_name: str
+
+
+def share_frame(frame: Frame) -> Tuple[SharedMemory, SharedFrameHandle]:
+    """Copies the decoded frame once into a new shared memory block."""
+    image = np.ascontiguousarray(frame.bgr)
+    shm = SharedMemory(create=True, size=max(image.nbytes, 1))
+    np.ndarray(image.shape, dtype=image.dtype, buffer=shm.buf)[...] = image
+
+    handle = SharedFrameHandle(
+        shm_name=shm.name,
+        shape=tuple(image.shape),
+        dtype=image.dtype.str,
+        source_name=frame.source_name,
+    )
+    return shm, handle
+
+
+def _attach(handle: SharedFrameHandle) -> Tuple[SharedMemory, Frame]:
+    try:
+        shm = SharedMemory(name=handle.shm_name, track=False)
+    except TypeError:
+        # python < 3.13: attaching registers the block again, but spawned
+        # workers share the parent's resource tracker, so the unlink in the
+        # parent clears that registration as well
+        shm = SharedMemory(name=handle.shm_name)
+
+    image = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+    image.flags.writeable = False
+    return shm, Frame.from_array(image, source_name=handle.source_name)
+
+
+def _init_worker(warm_models: bool, worker_counter) -> None:
+    # the pool already runs in parallel, every worker gets the small WORKER budget
+    init_pool_worker(worker_counter)
+
+    if warm_models:
+        from cvision.registry.ModelRegistry import ModelRegistry
+
+        ModelRegistry().get_key_point_detector().warm_up()
+
+
+def _run_stage(
+    stage: Callable[..., Any],
+    handle: SharedFrameHandle,
+    args: tuple,
+    kwargs: dict,
+    traced: bool = False,
+) -> Any:
+    shm, frame = _attach(handle)
+    try:
+        if not traced:
+            return stage(frame, *args, **kwargs)
+
+        value, error = None, None
+        with InspectionTrace() as trace:
+            try:
+                value = stage(frame, *args, **kwargs)
+            except (Exception, BaseAppException) as e:
+                error = e
+        worker = multiprocessing.current_process().name
+        spans = [
+            replace(span, thread=f"{worker}/{span.thread}") for span in trace.spans
+        ]
+        return TracedStageResult(
+            value=value, error=error, spans=spans, origin_wall=trace.origin_wall
+        )
+    finally:
+        del frame
+        try:
+            shm.close()
+        except BufferError:
+            # the result still references the block, it is released with it
+            pass
+
+
+class CVExecutor:
+    """
+    Runs CV stages in a spawn-based process pool.
+
+    `submit` copies the frame into shared memory, the block is unlinked as
+    soon as the stage finished. Results are pickled as usual, so stages should
+    return small objects (values, boxes) or the arrays they really need.
+    """
+
+    def __init__(self, workers: Optional[int] = None, warm_models: bool = True):
+        self.workers = workers or ResourceManager().pool_size(
+            RESOURCES_KEYS.CV_EXECUTOR
+        )
+        context = multiprocessing.get_context("spawn")
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(warm_models, context.Value("i", 0)),
+        )
+
+    def __enter__(self) -> "CVExecutor":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.shutdown()
+
+    def submit(
+        self, stage: Callable[..., Any], frame: Frame, *args: Any, **kwargs: Any
+    ) -> Future:
+        trace = InspectionTrace.current()
+        parent = InspectionTrace.current_span()
+        shm, handle = share_frame(frame)
+        try:
+            future = self._pool.submit(
+                _run_stage, stage, handle, args, kwargs, trace is not None
+            )
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+
+        def _release(_: Future) -> None:
+            shm.close()
+            shm.unlink()
+
+        future.add_done_callback(_release)
+        if trace is None:
+            return future
+
+        # completed only after the spans are merged, a caller waiting on it
+        # sees the full trace
+        traced_future = Future()
+
+        def _merge(done: Future) -> None:
+            try:
+                outcome = done.result()
+            except BaseException as e:
+                traced_future.set_exception(e)
+                return
+
+            trace.merge(outcome.spans, outcome.origin_wall, parent=parent)
+            if outcome.error is not None:
+                traced_future.set_exception(outcome.error)
+            else:
+                traced_future.set_result(outcome.value)
+
+        future.add_done_callback(_merge)
+        return traced_future
+
+    def map(
+        self, stage: Callable[..., Any], frames: List[Frame], *args: Any, **kwargs: Any
+    ) -> List[Any]:
+        futures = [self.submit(stage, frame, *args, **kwargs) for frame in frames]
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
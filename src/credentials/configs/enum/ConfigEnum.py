@@ -12,6 +12,9 @@ class SENSOR_KEYS(str, Enum):
     # --- Analog Gauge ---
     MIN_ANGLE = "min_angle"
     MAX_ANGLE = "max_angle"
+    SENSOR_TYPE = "sensor_type"
+    SENSOR_TYPE_ANALOG = "analog"
+    NEEDLE_DETECTOR = "needle_detector"
     # --------------------
 
     OPCUA_NODE = "opcua_node"
@@ -84,6 +87,50 @@ class ROBOT_KEYS(str, Enum):
         return self.value
 
 
+class CVISION_KEYS(str, Enum):
+    CVISION = "cvision"
+
+    DEBUG_ARTIFACTS = "debug_artifacts"
+    LEVEL = "level"
+    FORMAT = "format"
+    QUALITY = "quality"
+
+    RESULT_CACHE = "result_cache"
+    ENABLED = "enabled"
+
+    KEYPOINTS = "keypoints"
+    EXTRACTION = "extraction"
+    RUNTIME = "runtime"
+    INPUT_SIZE = "input_size"
+    DECODE = "decode"
+    CALIBRATION = "calibration"
+    CENTER_METHOD = "center_method"
+    GAUGE_CANVAS = "gauge_canvas"
+    SIZE = "size"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+class RESOURCES_KEYS(str, Enum):
+    RESOURCES = "resources"
+
+    MAIN = "main"
+    WORKER = "worker"
+    THREADS = "threads"
+    CPU_AFFINITY = "cpu_affinity"
+
+    POOLS = "pools"
+    CV_EXECUTOR = "cv_executor"
+    BATCH = "batch"
+    UPLOAD = "upload"
+
+    SKLEARN_JOBS = "sklearn_jobs"
+
+    def __str__(self) -> str:
+        return self.value
+
+
 class ConfigEnum(str, Enum):
     WORKSPACE_DIR = "/workspaces/PS9-Boston-Dynamic-Mobile-CV-Testing-Systems/"
     CONFIG_DIR = WORKSPACE_DIR + "configs/"
@@ -93,6 +140,8 @@ class ConfigEnum(str, Enum):
     BUCKETS_CONFIG = CONFIG_DIR + "minio-buckets.yaml"
     OPCUA_CONFIG = CONFIG_DIR + "opcua-credentials.yaml"
     SENSOR_KEYS_CONFIG = CONFIG_DIR + "sensors.yaml"
+    CVISION_CONFIG = CONFIG_DIR + "cvision.yaml"
+    RESOURCES_CONFIG = CONFIG_DIR + "resources.yaml"
 
     def __str__(self) -> str:
         return self.value
@@ -0,0 +1,121 @@
+from common.exceptions.handler.LogHandler import LogHandler
+from common.imports.Typing import Any, Optional
+from credentials.configs.enum.ConfigEnum import CVISION_KEYS, ConfigEnum
+from credentials.configs.loader.ConfigLoader import ConfigLoader
+
+DEBUG_LEVELS = ("off", "final_only", "full")
+DEBUG_FORMATS = (".png", ".jpg", ".jpeg", ".webp")
+KEYPOINT_EXTRACTION_MODES = ("fast", "cluster")
+KEYPOINT_RUNTIMES = ("eager", "torchscript", "onnx")
+KEYPOINT_DECODE_MODES = ("full", "patch")
+KEYPOINT_PATCH_SIZE = 14
+KEYPOINT_INPUT_SIZE_RANGE = (112, 896)
+CALIBRATION_CENTER_METHODS = ("ticks", "contour")
+
+
+class CVisionConfigReader(ConfigLoader):
+    def __init__(self):
+        super().__init__()
+        self.__config = self.load_config(ConfigEnum.CVISION_CONFIG)
+        # (key, value) already warned about, the getters run per frame
+        self.__rejected = set()
+
+    def _getSection(self, *keys: str) -> dict:
+        value = self.__config.get(CVISION_KEYS.CVISION)
+        for key in keys:
+            if not isinstance(value, dict):
+                return {}
+            value = value.get(key)
+        if not isinstance(value, dict):
+            return {}
+        return value
+
+    def _rejected(self, key: str, value: Any, default: Any) -> Any:
+        """`default` in place of an invalid `value`; a configured one is warned once."""
+        if value is not None and (key, repr(value)) not in self.__rejected:
+            self.__rejected.add((key, repr(value)))
+            LogHandler.log_warning(
+                f"[CVisionConfigReader] invalid {key}: {value!r}, using {default!r}"
+            )
+        return default
+
+    def getDebugArtifactLevel(self) -> str:
+        level = self._getSection(CVISION_KEYS.DEBUG_ARTIFACTS).get(CVISION_KEYS.LEVEL)
+        if level not in DEBUG_LEVELS:
+            return self._rejected("debug_artifacts.level", level, "final_only")
+        return level
+
+    def getDebugArtifactFormat(self) -> str:
+        ext = self._getSection(CVISION_KEYS.DEBUG_ARTIFACTS).get(CVISION_KEYS.FORMAT)
+        if not isinstance(ext, str) or ext.lower() not in DEBUG_FORMATS:
+            return self._rejected("debug_artifacts.format", ext, ".png")
+        return ext.lower()
+
+    def getDebugArtifactQuality(self) -> Optional[int]:
+        quality = self._getSection(CVISION_KEYS.DEBUG_ARTIFACTS).get(
+            CVISION_KEYS.QUALITY
+        )
+        if not isinstance(quality, int):
+            return self._rejected("debug_artifacts.quality", quality, None)
+        if not 1 <= quality <= 100:
+            return self._rejected(
+                "debug_artifacts.quality", quality, max(1, min(100, quality))
+            )
+        return quality
+
+    def getResultCacheEnabled(self) -> bool:
+        enabled = self._getSection(CVISION_KEYS.RESULT_CACHE).get(CVISION_KEYS.ENABLED)
+        if not isinstance(enabled, bool):
+            return self._rejected("result_cache.enabled", enabled, True)
+        return enabled
+
+    def getKeyPointExtractionMode(self) -> str:
+        mode = self._getSection(CVISION_KEYS.KEYPOINTS).get(CVISION_KEYS.EXTRACTION)
+        if mode not in KEYPOINT_EXTRACTION_MODES:
+            return self._rejected("keypoints.extraction", mode, "fast")
+        return mode
+
+    def getKeyPointRuntime(self) -> str:
+        runtime = self._getSection(CVISION_KEYS.KEYPOINTS).get(CVISION_KEYS.RUNTIME)
+        if runtime not in KEYPOINT_RUNTIMES:
+            return self._rejected("keypoints.runtime", runtime, "eager")
+        return runtime
+
+    @staticmethod
+    def _isPatchGridSize(size) -> bool:
+        low, high = KEYPOINT_INPUT_SIZE_RANGE
+        return (
+            isinstance(size, int)
+            and not isinstance(size, bool)
+            and low <= size <= high
+            and size % KEYPOINT_PATCH_SIZE == 0
+        )
+
+    def getGaugeCanvasSize(self) -> int:
+        size = self._getSection(CVISION_KEYS.GAUGE_CANVAS).get(CVISION_KEYS.SIZE)
+        if not self._isPatchGridSize(size):
+            return self._rejected("gauge_canvas.size", size, 448)
+        return size
+
+    def getKeyPointInputSize(self) -> int:
+        # the gauge canvas unless a model needs another input size
+        size = self._getSection(CVISION_KEYS.KEYPOINTS).get(CVISION_KEYS.INPUT_SIZE)
+        if not self._isPatchGridSize(size):
+            return self._rejected(
+                "keypoints.input_size", size, self.getGaugeCanvasSize()
+            )
+        return size
+
+    def getKeyPointDecode(self) -> str:
+        decode = self._getSection(CVISION_KEYS.KEYPOINTS).get(CVISION_KEYS.DECODE)
+        if decode not in KEYPOINT_DECODE_MODES:
+            return self._rejected("keypoints.decode", decode, "full")
+        return decode
+
+    def getCalibrationCenterMethod(self) -> str:
+        method = self._getSection(CVISION_KEYS.CALIBRATION).get(
+            CVISION_KEYS.CENTER_METHOD
+        )
+        if method not in CALIBRATION_CENTER_METHODS:
+            return self._rejected("calibration.center_method", method, "ticks")
+        return method
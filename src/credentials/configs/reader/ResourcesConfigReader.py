@@ -0,0 +1,85 @@
+from common.exceptions.handler.LogHandler import LogHandler
+from common.imports.Typing import Any
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS, ConfigEnum
+from credentials.configs.loader.ConfigLoader import ConfigLoader
+
+ROLES = (RESOURCES_KEYS.MAIN, RESOURCES_KEYS.WORKER)
+POOLS = (RESOURCES_KEYS.CV_EXECUTOR, RESOURCES_KEYS.BATCH, RESOURCES_KEYS.UPLOAD)
+
+DEFAULT_THREADS = {RESOURCES_KEYS.MAIN: 2, RESOURCES_KEYS.WORKER: 1}
+DEFAULT_POOL_SIZES = {
+    RESOURCES_KEYS.CV_EXECUTOR: 2,
+    RESOURCES_KEYS.BATCH: 2,
+    RESOURCES_KEYS.UPLOAD: 4,
+}
+
+
+class ResourcesConfigReader(ConfigLoader):
+    def __init__(self):
+        super().__init__()
+        self.__config = self.load_config(ConfigEnum.RESOURCES_CONFIG)
+        # (key, value) already warned about, pools read their sizes repeatedly
+        self.__rejected = set()
+
+    def _getSection(self, *keys: str) -> dict:
+        value = self.__config.get(RESOURCES_KEYS.RESOURCES)
+        for key in keys:
+            if not isinstance(value, dict):
+                return {}
+            value = value.get(key)
+        if not isinstance(value, dict):
+            return {}
+        return value
+
+    def _rejected(self, key: str, value: Any, default: Any) -> Any:
+        """`default` in place of an invalid `value`; a configured one is warned once."""
+        if value is not None and (key, repr(value)) not in self.__rejected:
+            self.__rejected.add((key, repr(value)))
+            LogHandler.log_warning(
+                f"[ResourcesConfigReader] invalid {key}: {value!r}, using {default!r}"
+            )
+        return default
+
+    def _positiveInt(self, key: str, value, default: int) -> int:
+        # bool is an int subclass, `threads: true` is not a thread count
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return self._rejected(key, value, default)
+        return value
+
+    def getThreads(self, role: str) -> int:
+        if role not in ROLES:
+            raise ValueError(f"Unknown role '{role}', expected one of {ROLES}")
+        return self._positiveInt(
+            f"{role}.{RESOURCES_KEYS.THREADS}",
+            self._getSection(role).get(RESOURCES_KEYS.THREADS),
+            DEFAULT_THREADS[role],
+        )
+
+    def getCpuAffinity(self) -> bool:
+        enabled = self._getSection(RESOURCES_KEYS.WORKER).get(
+            RESOURCES_KEYS.CPU_AFFINITY
+        )
+        if not isinstance(enabled, bool):
+            return self._rejected(
+                f"{RESOURCES_KEYS.WORKER}.{RESOURCES_KEYS.CPU_AFFINITY}", enabled, False
+            )
+        return enabled
+
+    def getPoolSize(self, pool: str) -> int:
+        if pool not in POOLS:
+            raise ValueError(f"Unknown pool '{pool}', expected one of {POOLS}")
+        return self._positiveInt(
+            f"{RESOURCES_KEYS.POOLS}.{pool}",
+            self._getSection(RESOURCES_KEYS.POOLS).get(pool),
+            DEFAULT_POOL_SIZES[pool],
+        )
+
+    def getSklearnJobs(self) -> int:
+        resources = self.__config.get(RESOURCES_KEYS.RESOURCES)
+        if not isinstance(resources, dict):
+            return 1
+        return self._positiveInt(
+            str(RESOURCES_KEYS.SKLEARN_JOBS),
+            resources.get(RESOURCES_KEYS.SKLEARN_JOBS),
+            1,
+        )
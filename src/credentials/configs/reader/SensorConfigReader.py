@@ -9,6 +9,8 @@ from credentials.configs.exceptions.CategoryDoesNotExistError import (
     CategoryDoesNotExistError,
 )
 
+NEEDLE_DETECTORS = ("hough", "polar", "keypoints")
+
 
 class SensorConfigReader(ConfigLoader):
     def __init__(self):
@@ -52,6 +54,19 @@ class SensorConfigReader(ConfigLoader):
         categories = matched_node.get(SENSOR_KEYS.CATEGORIES, [])
         return [category[SENSOR_KEYS.NAME] for category in categories]
 
+    def getAnalogCategoriesByNodeID(self, aruco_id: Optional[int]) -> List[str]:
+        """Names of the analog gauge categories of a node, [] for unknown ids."""
+        try:
+            matched_node = self._findNodeByID(aruco_id=aruco_id)
+        except NodeDoesNotExistError:
+            return []
+        categories = matched_node.get(SENSOR_KEYS.CATEGORIES) or []
+        return [
+            category[SENSOR_KEYS.NAME]
+            for category in categories
+            if category.get(SENSOR_KEYS.SENSOR_TYPE) == SENSOR_KEYS.SENSOR_TYPE_ANALOG
+        ]
+
     def getCategoryByCategoryNameAndArucoID(
         self, category_name: str, aruco_id: int
     ) -> Dict[str, Any]:
@@ -84,6 +99,18 @@ class SensorConfigReader(ConfigLoader):
         )
         return matched_node.get(SENSOR_KEYS.VALUE_TOLERANCE)
 
+    def getNeedleDetector(
+        self, category_name: str, aruco_id: Optional[int] = None
+    ) -> str:
+        """Needle strategy of an analog gauge, 'hough' unless configured."""
+        matched_node = self.getCategoryByCategoryNameAndArucoID(
+            aruco_id=aruco_id, category_name=category_name
+        )
+        detector = matched_node.get(SENSOR_KEYS.NEEDLE_DETECTOR)
+        if detector not in NEEDLE_DETECTORS:
+            return "hough"
+        return detector
+
     def getScoreFunctionStr(
         self, category_name: str, aruco_id: Optional[int] = None
     ) -> Optional[str]:
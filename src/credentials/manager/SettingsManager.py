@@ -2,6 +2,7 @@ from common.imports.Typing import Any, Optional, Callable, Tuple, List, Dict
 
 from credentials.configs.reader.MinioBucketConfigReader import MinioBucketConfigReader
 from credentials.configs.reader.SensorConfigReader import SensorConfigReader
+from credentials.configs.reader.CVisionConfigReader import CVisionConfigReader
 
 
 class SettingsManager:
@@ -16,6 +17,7 @@ class SettingsManager:
         self,
         minio_bucket_reader: Optional[MinioBucketConfigReader] = None,
         sensor_config_reader: Optional[SensorConfigReader] = None,
+        cvision_config_reader: Optional[CVisionConfigReader] = None,
     ):
         if hasattr(self, "_initialized") and self._initialized:
             return
@@ -23,6 +25,7 @@ class SettingsManager:
         self._initialized = True
         self._minio_bucket_reader = minio_bucket_reader or MinioBucketConfigReader()
         self._sensor_config_reader = sensor_config_reader or SensorConfigReader()
+        self._cvision_config_reader = cvision_config_reader or CVisionConfigReader()
 
     def getMinioRawBucket(self) -> Optional[str]:
         return self._minio_bucket_reader.getRawBucket()
@@ -43,6 +46,9 @@ class SettingsManager:
     def getCategoriesNameByNodeID(self, aruco_id: int) -> List[str]:
         return self._sensor_config_reader.getCategoriesNameByNodeID(aruco_id=aruco_id)
 
+    def getAnalogCategoriesByNodeID(self, aruco_id: Optional[int]) -> List[str]:
+        return self._sensor_config_reader.getAnalogCategoriesByNodeID(aruco_id=aruco_id)
+
     def getCategoryByCategoryNameAndArucoID(
         self, category_name: str, aruco_id: int
     ) -> Dict[str, Any]:
@@ -110,9 +116,46 @@ class SettingsManager:
             aruco_id=aruco_id, category_name=category_name
         )
 
+    def getNeedleDetector(
+        self, category_name: str, aruco_id: Optional[int] = None
+    ) -> str:
+        return self._sensor_config_reader.getNeedleDetector(
+            aruco_id=aruco_id, category_name=category_name
+        )
+
     def getValueTolerance(
         self, category_name: str, aruco_id: Optional[int] = None
     ) -> Optional[float]:
         return self._sensor_config_reader.getValueTolerance(
             aruco_id=aruco_id, category_name=category_name
         )
+
+    def getDebugArtifactLevel(self) -> str:
+        return self._cvision_config_reader.getDebugArtifactLevel()
+
+    def getDebugArtifactFormat(self) -> str:
+        return self._cvision_config_reader.getDebugArtifactFormat()
+
+    def getDebugArtifactQuality(self) -> Optional[int]:
+        return self._cvision_config_reader.getDebugArtifactQuality()
+
+    def getResultCacheEnabled(self) -> bool:
+        return self._cvision_config_reader.getResultCacheEnabled()
+
+    def getKeyPointExtractionMode(self) -> str:
+        return self._cvision_config_reader.getKeyPointExtractionMode()
+
+    def getKeyPointRuntime(self) -> str:
+        return self._cvision_config_reader.getKeyPointRuntime()
+
+    def getGaugeCanvasSize(self) -> int:
+        return self._cvision_config_reader.getGaugeCanvasSize()
+
+    def getKeyPointInputSize(self) -> int:
+        return self._cvision_config_reader.getKeyPointInputSize()
+
+    def getKeyPointDecode(self) -> str:
+        return self._cvision_config_reader.getKeyPointDecode()
+
+    def getCalibrationCenterMethod(self) -> str:
+        return self._cvision_config_reader.getCalibrationCenterMethod()
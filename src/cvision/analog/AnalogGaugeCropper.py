@@ -1,85 +1,215 @@
+import threading
+
 import numpy as np
-from PIL import Image
-from ultralytics import YOLO
 import cv2
-from common.imports.Typing import MatLike
-import io
+from common.imports.Typing import Any, Dict, MatLike, Optional, Tuple
+from credentials.manager.SettingsManager import SettingsManager
 from cvision.analog.exceptions.GaugeDetectionFailed import GaugeDetectionFailed
-import os
-
-Image.MAX_IMAGE_PIXELS = None
+from cvision.frame.Frame import Frame
+from cvision.registry.ModelRegistry import ModelRegistry, ANALOG_GAUGE_MODEL_PATH
+from common.tracing.InspectionTrace import trace_span
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    intersection = max(0, x2 - x1) * max(0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1])
+    union -= intersection
+    return float(intersection / union) if union > 0 else 0.0
+
+
+def square_crop(
+    img: MatLike,
+    box: np.ndarray,
+    output_size: Tuple[int, int],
+    pad_color=(0, 0, 0),
+) -> MatLike:
+    """
+    Crops the box, pads it to a square (centered) and resizes it. Pure
+    geometry, so worker processes can cut the crops out of a shared capture.
+    """
+    cropped = img[box[1] : box[3], box[0] : box[2], :]
+
+    height = int(box[3] - box[1])
+    width = int(box[2] - box[0])
+
+    if height > width:
+        delta = height - width
+        pad_left = delta // 2
+        pad_right = delta - pad_left
+        pad_top = pad_bottom = 0
+    else:
+        delta = width - height
+        pad_top = delta // 2
+        pad_bottom = delta - pad_top
+        pad_left = pad_right = 0
+
+    padded = cv2.copyMakeBorder(
+        cropped,
+        pad_top,
+        pad_bottom,
+        pad_left,
+        pad_right,
+        cv2.BORDER_CONSTANT,
+        value=list(pad_color),
+    )
+
+    return cv2.resize(padded, dsize=output_size, interpolation=cv2.INTER_CUBIC)
 
 
 class AnalogGaugeCropper:
+    """
+    Crops the analog gauges out of a capture.
+
+    With a `roi_key` (ArUco id or waypoint of the capture) the boxes of the
+    last capture with that key are used as prior: YOLO first runs on the
+    region around them, every box expanded by `roi_expansion` of its size on
+    every side. Each detection there is given to at most one prior box
+    (greedy by IoU, at least `roi_min_iou`); if a prior box stays unmatched or
+    a detection is left over, the full frame is searched again. The robot
+    returns to the same pose, so the full-frame pass is the exception after
+    the first inspection.
+
+    Crops are cut at the gauge canvas size (gauge_canvas.size in cvision.yaml),
+    the resolution the keypoint model and the reader work on as well.
+    """
 
     def __init__(
         self,
         resolution=(1000, 1000),
         pad_color=(0, 0, 0),
-        model: str = os.path.join(
-            os.getcwd(), "src/cvision/analog/models/analog_gauge_detection_model.pt"
-        ),
+        model: str = ANALOG_GAUGE_MODEL_PATH,
+        output_size: Optional[Tuple[int, int]] = None,
+        roi_expansion: float = 0.5,
+        roi_min_iou: float = 0.3,
     ):
         self.resolution = resolution
         self.pad_color = list(pad_color)
-        self.model = YOLO(model)
-
-    def __detect_gauge_face(self, img: MatLike) -> tuple[np.ndarray, list[np.ndarray]]:
-
-        results = self.model(img)
+        self._model_path = model
+        if output_size is None:
+            size = SettingsManager().getGaugeCanvasSize()
+            output_size = (size, size)
+        self.output_size = tuple(output_size)
+        self.roi_expansion = roi_expansion
+        self.roi_min_iou = roi_min_iou
+
+        # roi_key -> last boxes (N, 4) as x1, y1, x2, y2 in full-frame pixels
+        self._priors: Dict[Any, np.ndarray] = {}
+        self._priors_lock = threading.Lock()
+
+    @property
+    def model(self):
+        return ModelRegistry().get_yolo_model(self._model_path)
+
+    def __detect_boxes(self, img: MatLike, span: str) -> np.ndarray:
+        model = self.model
+        with trace_span(span):
+            results = model(img)
 
         boxes = results[0].boxes
         if len(boxes) == 0:
-            raise GaugeDetectionFailed(error_code=1765392590)
+            return np.empty((0, 4), dtype=int)
 
-        main_box = boxes[0]
-
-        all_boxes = [box.xyxy[0].int() for box in boxes]
-
-        return main_box.xyxy[0].int(), all_boxes
-
-    def __crop(self, box, img: MatLike) -> MatLike:
-        cropped = img[box[1] : box[3], box[0] : box[2], :]
-
-        height = int(box[3] - box[1])
-        width = int(box[2] - box[0])
-
-        if height > width:
-            delta = height - width
-            pad_left = delta // 2
-            pad_right = delta - pad_left
-            pad_top = pad_bottom = 0
-        else:
-            delta = width - height
-            pad_top = delta // 2
-            pad_bottom = delta - pad_top
-            pad_left = pad_right = 0
-
-        padded = cv2.copyMakeBorder(
-            cropped,
-            pad_top,
-            pad_bottom,
-            pad_left,
-            pad_right,
-            cv2.BORDER_CONSTANT,
-            value=self.pad_color,
-        )
+        # ordered by confidence, like the YOLO output
+        return np.asarray(boxes.xyxy.cpu().numpy(), dtype=float).round().astype(int)
 
-        return padded
+    def __detect_gauge_face(self, img: MatLike) -> tuple[np.ndarray, list[np.ndarray]]:
 
-    def process(self, img: bytes) -> bytes:
-        img_array = np.frombuffer(img, dtype=np.uint8)
-        img: MatLike = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-        box, _ = self.__detect_gauge_face(img=img)
+        all_boxes = list(self.__detect_boxes(img, span="gauge_yolo"))
+        if len(all_boxes) == 0:
+            raise GaugeDetectionFailed(error_code=1765392590)
 
-        cropped_img = self.__crop(box=box, img=img)
+        main_box = all_boxes[0]
+
+        return main_box, all_boxes
+
+    def expanded_roi(self, boxes: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+        """Bounding region of the boxes, each expanded by roi_expansion."""
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        height, width = shape[:2]
+        margin_x = ((boxes[:, 2] - boxes[:, 0]) * self.roi_expansion).astype(int)
+        margin_y = ((boxes[:, 3] - boxes[:, 1]) * self.roi_expansion).astype(int)
+        return np.array(
+            [
+                max(0, int((boxes[:, 0] - margin_x).min())),
+                max(0, int((boxes[:, 1] - margin_y).min())),
+                min(width, int((boxes[:, 2] + margin_x).max())),
+                min(height, int((boxes[:, 3] + margin_y).max())),
+            ]
+        )
 
-        cropped_resized_img = cv2.resize(
-            cropped_img, dsize=(512, 512), interpolation=cv2.INTER_CUBIC
+    def __detect_in_roi(self, img: MatLike, priors: np.ndarray) -> Optional[np.ndarray]:
+        roi = self.expanded_roi(priors, img.shape)
+        boxes = self.__detect_boxes(
+            img[roi[1] : roi[3], roi[0] : roi[2]], span="gauge_yolo_roi"
         )
+        if len(boxes) == 0:
+            return None
 
-        pil_img = Image.fromarray(cropped_resized_img)
+        boxes = boxes + np.array([roi[0], roi[1], roi[0], roi[1]])
+        # a gauge more or less than before, the priors no longer fit the scene
+        if len(boxes) != len(priors):
+            return None
 
-        buffer = io.BytesIO()
-        pil_img.save(buffer, format="PNG")
-        return buffer.getvalue()
+        # greedy by IoU, every box goes to at most one prior
+        overlaps = np.array(
+            [[box_iou(box, prior) for box in boxes] for prior in priors]
+        )
+        matched: Dict[int, int] = {}
+        for flat in np.argsort(overlaps, axis=None)[::-1]:
+            prior_index, box_index = np.unravel_index(flat, overlaps.shape)
+            if overlaps[prior_index, box_index] < self.roi_min_iou:
+                break
+            if prior_index in matched or box_index in matched.values():
+                continue
+            matched[int(prior_index)] = int(box_index)
+
+        if len(matched) < len(priors):
+            return None
+        return boxes[[matched[index] for index in range(len(priors))]]
+
+    def prior(self, roi_key: Any) -> Optional[np.ndarray]:
+        with self._priors_lock:
+            return self._priors.get(roi_key)
+
+    def forget(self, roi_key: Optional[Any] = None) -> None:
+        """Drops the prior of one key, or all of them."""
+        with self._priors_lock:
+            if roi_key is None:
+                self._priors.clear()
+            else:
+                self._priors.pop(roi_key, None)
+
+    def locate_all(self, img: MatLike, roi_key: Optional[Any] = None) -> np.ndarray:
+        """
+        Boxes (N, 4) of all gauges in full-frame pixels from one detection
+        pass, in prior order for a matched ROI, by confidence otherwise.
+        """
+        priors = self.prior(roi_key) if roi_key is not None else None
+
+        boxes = self.__detect_in_roi(img, priors) if priors is not None else None
+        if boxes is None:
+            _, all_boxes = self.__detect_gauge_face(img=img)
+            boxes = np.array(all_boxes)
+
+        if roi_key is not None:
+            with self._priors_lock:
+                self._priors[roi_key] = boxes
+        return boxes
+
+    def locate(self, img: MatLike, roi_key: Optional[Any] = None) -> np.ndarray:
+        """Box of the main gauge in full-frame pixels."""
+        return self.locate_all(img, roi_key=roi_key)[0]
+
+    def crop_box(self, img: MatLike, box: np.ndarray) -> MatLike:
+        """Square BGR crop of one box at output_size, no encoding involved."""
+        return square_crop(img, box, self.output_size, self.pad_color)
+
+    def crop_array(self, img: MatLike, roi_key: Optional[Any] = None) -> MatLike:
+        return self.crop_box(img, self.locate(img, roi_key=roi_key))
+
+    def process(self, frame: Frame, roi_key: Optional[Any] = None) -> Frame:
+        cropped_resized_img = self.crop_array(frame.bgr, roi_key=roi_key)
+
+        return Frame.from_array(cropped_resized_img, source_name=frame.source_name)
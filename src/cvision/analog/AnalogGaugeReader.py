@@ -1,12 +1,31 @@
 import cv2
-from common.imports.Typing import MatLike, Tuple, List, Optional
+from common.imports.Typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    MatLike,
+    Optional,
+    Tuple,
+    Union,
+)
 import numpy as np
-from dataclasses import dataclass
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 
-from cvision.analog.exceptions.ImageEncodingFailed import ImageEncodingFailed
+from common.exceptions.BaseAppException import BaseAppException
+from cvision.analog.AnalogGaugeCropper import square_crop
 from cvision.analog.exceptions.CenterNotFound import CenterNotFound
+from cvision.analog.exceptions.NeedleNotFound import NeedleNotFound
 from credentials.manager.SettingsManager import SettingsManager
-from cvision.analog.KeyPointDetector import KeyPointDetector
+from cvision.analog.KeyPointDetector import GaugeKeyPoints, KeyPointDetector
+from cvision.analog.HeatmapNeedleEstimator import HeatmapNeedleEstimator
+from cvision.analog.NeedleEstimator import NeedleEstimate, NeedleEstimator
+from cvision.analog.PolarNeedleEstimator import PolarNeedleEstimator
+from cvision.analog.TickCircleEstimator import TickCircleEstimator
+from cvision.registry.ModelRegistry import ModelRegistry
+from cvision.frame.Frame import Frame
+from common.tracing.InspectionTrace import trace_span
 
 
 @dataclass
@@ -18,6 +37,65 @@ class GaugeCalibration:
     max_angle: float
     min_value: float
     max_value: float
+    # size of the crop the calibration was computed on, 0 if unknown
+    image_width: int = 0
+    image_height: int = 0
+
+    def scaled_to(self, width: int, height: int) -> "GaugeCalibration":
+        """Maps center / radius onto a crop of another size, angles are kept."""
+        if not self.image_width or not self.image_height:
+            return replace(self, image_width=width, image_height=height)
+
+        sx = width / self.image_width
+        sy = height / self.image_height
+        return replace(
+            self,
+            center_x=round(self.center_x * sx),
+            center_y=round(self.center_y * sy),
+            radius=round(self.radius * (sx + sy) / 2),
+            image_width=width,
+            image_height=height,
+        )
+
+
+@dataclass
+class AnalogGaugeReading:
+    center_x: int
+    center_y: int
+    radius: int
+    value: float
+    # decoded debug artifacts (BGR / gray), see DebugLevel
+    debug_images: List[np.ndarray]
+    calibration: Optional[GaugeCalibration] = None
+    # False if a passed-in calibration was still valid and reused
+    recalibrated: bool = True
+    # share of the needle evidence behind the reading, None without a needle
+    confidence: Optional[float] = None
+
+
+@dataclass
+class AnalogGaugeFailure:
+    """A gauge read_analog_gauges could not read, in place of its reading."""
+
+    category: str
+    error: str
+    # of a BaseAppException, None for other errors
+    error_code: Optional[int] = None
+
+
+# as returned by KeyPointDetector.detect_key_points
+KeyPoints = GaugeKeyPoints
+
+# how calibrate() finds the dial circle
+CENTER_METHOD_TICKS = "ticks"
+CENTER_METHOD_CONTOUR = "contour"
+
+# how get_current_value() finds the needle, per gauge in sensors.yaml
+NEEDLE_DETECTOR_HOUGH = "hough"
+NEEDLE_DETECTOR_POLAR = "polar"
+# single pass: center, start, end and needle all from one keypoint forward
+# pass (needle head required), no OpenCV chain
+NEEDLE_DETECTOR_KEYPOINTS = "keypoints"
 
 
 @dataclass
@@ -35,10 +113,15 @@ class GaugeDetectionConfig:
     GAUSSIAN_KERNEL = (9, 9)
     MEDIAN_BLUR_KERNEL = 5
 
+    # Pixel sizes below are tuned on 512 px crops, `scaled` maps them onto
+    # the crop at hand (the gauge canvas is 448 px by default)
+    REFERENCE_SIZE = 512
+
     # Morphological operations
     MORPH_KERNEL_SIZE = (7, 7)
 
-    # Hough line detection
+    # Hough line detection; the threshold counts votes of edge pixels, so
+    # it is a line length as well
     HOUGH_RHO = 2
     HOUGH_THETA = np.pi / 180 * 2
     HOUGH_THRESHOLD = 90
@@ -51,6 +134,18 @@ class GaugeDetectionConfig:
     LINE_FILTER_MIN_D2 = 0.5
     LINE_FILTER_MAX_D2 = 1.05
 
+    # Needle consensus: width of one angle cluster (degrees) and the distance of
+    # a segment's line from the center (relative to radius) that scores zero
+    NEEDLE_CLUSTER_WINDOW = 6.0
+    NEEDLE_MAX_CENTER_OFFSET = 0.15
+
+    # Polar needle detection: angular resolution of the unwrap, radius band
+    # (relative to radius) of the profile and minimum darkness of the needle
+    POLAR_ANGLE_BINS = 720
+    POLAR_MIN_RADIUS = 0.2
+    POLAR_MAX_RADIUS = 0.75
+    POLAR_MIN_CONTRAST = 10.0
+
     # Angle visualization
     ANGLE_SEPARATION = 3.0
     ANGLE_ADJUSTMENT = -2.0  # Degrees to subtract from min/max angles
@@ -58,89 +153,249 @@ class GaugeDetectionConfig:
     # Ellipse fitting
     MIN_CONTOUR_POINTS = 5
 
+    # Drift check of a stored calibration: share of rim samples that must hit
+    # an edge within +-tolerance*radius of the stored circle
+    DRIFT_ANGLE_STEP = 4.0
+    DRIFT_RADIUS_TOLERANCE = 0.06
+    DRIFT_MIN_RIM_SUPPORT = 0.5
+    # relative change of the crop aspect ratio that means another framing
+    DRIFT_MAX_ASPECT_CHANGE = 0.15
+
+    # Circle fit through the tick heatmap: RANSAC band (relative to radius),
+    # minimum tick pixels and arc, plausible radius (relative to the shorter
+    # image side) and the rim search range beyond the tick circle
+    TICK_HEATMAP_THRESHOLD = 0.5
+    TICK_INLIER_TOLERANCE = 0.03
+    TICK_MIN_POINTS = 8
+    TICK_MIN_ARC = 90.0
+    TICK_MIN_RADIUS = 0.15
+    TICK_MAX_RADIUS = 0.75
+    TICK_RIM_SEARCH = 1.6
+
+    @classmethod
+    def scaled(cls, pixels: int, image: MatLike) -> int:
+        """`pixels` tuned at REFERENCE_SIZE, for the shorter side of `image`."""
+        size = min(image.shape[:2])
+        return max(1, round(pixels * size / cls.REFERENCE_SIZE))
+
+
+class GaugePreprocessing:
+    """
+    Intermediate images of one crop as a lazily evaluated, memoized graph:
+
+        bgr -> gray -> gaussian -> edges -> closed_edges
+                    -> median (debug artifact only)
+        edges | closed_edges -> contours
+
+    Every product is computed on first access and shared by calibration, the
+    drift check and the value reading, so each OpenCV call runs at most once
+    per crop. Gray comes from the Frame, which memoizes it for all stages.
+    """
+
+    def __init__(self, frame: Frame) -> None:
+        self._frame = frame
+        self._products: Dict[Tuple, Any] = {}
+
+    def _get(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        if key not in self._products:
+            self._products[key] = compute()
+        return self._products[key]
+
+    @property
+    def computed(self) -> List[Tuple]:
+        return list(self._products)
+
+    @property
+    def gray(self) -> MatLike:
+        return self._frame.gray
+
+    @property
+    def gaussian(self) -> MatLike:
+        return self._get(
+            ("gaussian",),
+            lambda: cv2.GaussianBlur(
+                self.gray, GaugeDetectionConfig.GAUSSIAN_KERNEL, 0
+            ),
+        )
+
+    @property
+    def median(self) -> MatLike:
+        return self._get(
+            ("median",),
+            lambda: cv2.medianBlur(self.gray, GaugeDetectionConfig.MEDIAN_BLUR_KERNEL),
+        )
+
+    @property
+    def edges(self) -> MatLike:
+        return self._get(
+            ("edges",),
+            lambda: cv2.Canny(
+                self.gaussian,
+                GaugeDetectionConfig.CANNY_THRESHOLD_LOW,
+                GaugeDetectionConfig.CANNY_THRESHOLD_HIGH,
+            ),
+        )
+
+    @property
+    def closed_edges(self) -> MatLike:
+        def _compute():
+            kernel_size = tuple(
+                GaugeDetectionConfig.scaled(k, self.gray)
+                for k in GaugeDetectionConfig.MORPH_KERNEL_SIZE
+            )
+            kernel_close = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, kernel_size)
+            return cv2.morphologyEx(self.edges, cv2.MORPH_CLOSE, kernel_close)
+
+        return self._get(("closed_edges",), _compute)
+
+    def contours(self, use_morph: bool = False) -> List[MatLike]:
+        def _compute():
+            edges = self.closed_edges if use_morph else self.edges
+            contours, _ = cv2.findContours(
+                edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+            )
+            return list(contours)
+
+        return self._get(("contours", use_morph), _compute)
+
+
+class DebugLevel:
+    OFF = "off"
+    FINAL_ONLY = "final_only"
+    FULL = "full"
+
 
 class AnalogGaugeReader:
 
-    def __init__(self, img: bytes, category: str = "pressure") -> None:
+    def __init__(
+        self,
+        img: Frame,
+        category: str = "pressure",
+        kp_detector: Optional[KeyPointDetector] = None,
+        debug_level: Optional[str] = None,
+        calibration: Optional[GaugeCalibration] = None,
+        aruco_id: Optional[int] = None,
+        center_method: Optional[str] = None,
+        needle_detector: Optional[str] = None,
+    ) -> None:
         self._settings_manager = SettingsManager()
         self._category = category
-        self._img_bytes = img
-
-        img_array = np.frombuffer(img, dtype=np.uint8)
-        self._img: MatLike = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        self._aruco_id = aruco_id
+        self._frame = img
+        self._img: MatLike = img.bgr
+        self._preprocessing = GaugePreprocessing(img)
 
-        if self._img is None:
-            raise ValueError("Failed to decode image")
+        # resolved lazily, a valid stored calibration needs no keypoint model
+        self._kp_detector = kp_detector
 
-        self.kp_detector = KeyPointDetector()
-        self._images_log: List[bytes] = []
+        # debug images are only drawn if the level asks for them
+        self._debug_level = (
+            debug_level or self._settings_manager.getDebugArtifactLevel()
+        )
+        self._log_full = self._debug_level == DebugLevel.FULL
+        self._log_final = self._debug_level in (DebugLevel.FINAL_ONLY, DebugLevel.FULL)
+        self._center_method = (
+            center_method or self._settings_manager.getCalibrationCenterMethod()
+        )
+        self._images_log: List[Frame] = []
+        self._stored_calibration = calibration
+        # result of the drift check, computed once
+        self._reusable_checked = False
+        self._reusable: Optional[GaugeCalibration] = None
         self._calibration: Optional[GaugeCalibration] = None
-
-    def __enter__(self):
-        self.start_point, self.end_point, self.kp_resolution = (
-            self.kp_detector.detect_key_points(self._img_bytes)
+        # detected lazily, or handed in by read_analog_gauges
+        self._key_points: Optional[KeyPoints] = None
+        self.recalibrated = False
+        self._needle_estimator = NeedleEstimator(
+            min_d1=GaugeDetectionConfig.LINE_FILTER_MIN_D1,
+            max_d1=GaugeDetectionConfig.LINE_FILTER_MAX_D1,
+            min_d2=GaugeDetectionConfig.LINE_FILTER_MIN_D2,
+            max_d2=GaugeDetectionConfig.LINE_FILTER_MAX_D2,
+            cluster_window_deg=GaugeDetectionConfig.NEEDLE_CLUSTER_WINDOW,
+            max_center_offset=GaugeDetectionConfig.NEEDLE_MAX_CENTER_OFFSET,
+        )
+        self.needle: Optional[NeedleEstimate] = None
+        self._needle_detector = needle_detector
+        self._polar_needle_estimator = PolarNeedleEstimator(
+            angle_bins=GaugeDetectionConfig.POLAR_ANGLE_BINS,
+            min_radius=GaugeDetectionConfig.POLAR_MIN_RADIUS,
+            max_radius=GaugeDetectionConfig.POLAR_MAX_RADIUS,
+            min_contrast=GaugeDetectionConfig.POLAR_MIN_CONTRAST,
         )
+        self._heatmap_needle_estimator = HeatmapNeedleEstimator()
+        self._tick_estimator = TickCircleEstimator(
+            inlier_tolerance=GaugeDetectionConfig.TICK_INLIER_TOLERANCE,
+            min_points=GaugeDetectionConfig.TICK_MIN_POINTS,
+            min_arc=GaugeDetectionConfig.TICK_MIN_ARC,
+        )
+
+    @property
+    def kp_detector(self) -> KeyPointDetector:
+        if self._kp_detector is None:
+            self._kp_detector = ModelRegistry().get_key_point_detector()
+        return self._kp_detector
 
+    @property
+    def calibration(self) -> Optional[GaugeCalibration]:
+        return self._calibration
+
+    @property
+    def frame(self) -> Frame:
+        return self._frame
+
+    @property
+    def _single_pass(self) -> bool:
+        return self._needle_detector == NEEDLE_DETECTOR_KEYPOINTS
+
+    def __enter__(self):
         self.min_value, self.max_value = self._settings_manager.getMinMaxValue(
-            category_name=self._category
+            category_name=self._category, aruco_id=self._aruco_id
         )
+        if self._needle_detector is None:
+            self._needle_detector = self._settings_manager.getNeedleDetector(
+                category_name=self._category, aruco_id=self._aruco_id
+            )
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
         self._images_log.clear()
 
     def _log_image(self, img: MatLike) -> None:
-        success, encoded_img = cv2.imencode(".png", img)
-
-        if not success:
-            raise ImageEncodingFailed(error_code=1765392430)
-
-        img_bytes = encoded_img.tobytes()
-        self._images_log.append(img_bytes)
+        # kept decoded, encoding happens only if the artifact is persisted
+        self._images_log.append(
+            Frame.from_array(img, source_name=self._frame.source_name)
+        )
 
-    def get_images_log(self) -> List[bytes]:
+    def get_images_log(self) -> List[Frame]:
         return self._images_log
 
-    @staticmethod
-    def _calculate_distance(x1: float, y1: float, x2: float, y2: float) -> float:
-        return np.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2)
+    def _preprocessed(self, img: MatLike) -> GaugePreprocessing:
+        # the reader's own crop shares one graph, other images get a fresh one
+        if img is self._img:
+            return self._preprocessing
+        return GaugePreprocessing(Frame.from_array(img))
 
     def _get_edges(self, img: MatLike) -> MatLike:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        gray = cv2.GaussianBlur(gray, GaugeDetectionConfig.GAUSSIAN_KERNEL, 0)
-        edges = cv2.Canny(
-            gray,
-            GaugeDetectionConfig.CANNY_THRESHOLD_LOW,
-            GaugeDetectionConfig.CANNY_THRESHOLD_HIGH,
-        )
-        return edges
+        return self._preprocessed(img).edges
 
     def _get_contours(self, img: MatLike, use_morph: bool = False) -> List[MatLike]:
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        gray_blur = cv2.medianBlur(gray, GaugeDetectionConfig.MEDIAN_BLUR_KERNEL)
-        self._log_image(gray_blur)
-
-        edges = self._get_edges(img)
-
-        if use_morph:
-            kernel_close = cv2.getStructuringElement(
-                cv2.MORPH_ELLIPSE, GaugeDetectionConfig.MORPH_KERNEL_SIZE
+        preprocessed = self._preprocessed(img)
+        if self._log_full:
+            self._log_image(preprocessed.median)
+            self._log_image(
+                preprocessed.closed_edges if use_morph else preprocessed.edges
             )
-            edges = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel_close)
 
-        self._log_image(edges)
-
-        contours, _ = cv2.findContours(
-            edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
-        )
+        contours = preprocessed.contours(use_morph=use_morph)
 
         if not contours:
             print("Warning: No contours found")
             return []
 
-        out_img = img.copy()
-        cv2.drawContours(out_img, contours, -1, (0, 255, 0), 2)
-        self._log_image(out_img)
+        if self._log_full:
+            out_img = img.copy()
+            cv2.drawContours(out_img, contours, -1, (0, 255, 0), 2)
+            self._log_image(out_img)
 
         return contours
 
@@ -166,14 +421,114 @@ class AnalogGaugeReader:
         cx, cy = int(cx), int(cy)
         radius = int((MA + ma) / 4)
 
-        out = img.copy()
-        cv2.ellipse(out, ellipse, (0, 255, 0), 2)
-        cv2.circle(out, (cx, cy), 3, (0, 0, 255), -1)
-        self._log_image(out)
+        if self._log_full:
+            out = img.copy()
+            cv2.ellipse(out, ellipse, (0, 255, 0), 2)
+            cv2.circle(out, (cx, cy), 3, (0, 0, 255), -1)
+            self._log_image(out)
 
         print(f"Ellipse center: ({cx}, {cy}), approximate radius: {radius}")
         return cx, cy, radius
 
+    def _detected_key_points(self) -> KeyPoints:
+        if self._key_points is None:
+            self._key_points = self.kp_detector.detect_key_points(self._frame)
+        return self._key_points
+
+    def _rim_radius(self, cx: int, cy: int, tick_radius: int) -> int:
+        """
+        Radius of the dial rim around a tick circle: the radius between the
+        tick circle and TICK_RIM_SEARCH times it with the most edge support,
+        the tick circle itself if no rim stands out.
+        """
+        edges = self._get_edges(self._img)
+        radii = np.arange(
+            tick_radius, int(tick_radius * GaugeDetectionConfig.TICK_RIM_SEARCH) + 1
+        )
+        support = np.array([self._rim_support(edges, cx, cy, r) for r in radii])
+        best = int(np.argmax(support))
+        if support[best] < GaugeDetectionConfig.DRIFT_MIN_RIM_SUPPORT:
+            return tick_radius
+
+        # the tolerance band makes the support flat around the rim, take the
+        # middle of the plateau the maximum lies on
+        low = high = best
+        while low > 0 and support[low - 1] >= support[best]:
+            low -= 1
+        while high < len(radii) - 1 and support[high + 1] >= support[best]:
+            high += 1
+        return int(radii[(low + high) // 2])
+
+    def find_gauge_center_ticks(
+        self, img: np.ndarray, rim_search: bool = True
+    ) -> Tuple[int, int, int]:
+        """
+        Center and rim radius from a RANSAC circle fit through the pixels of
+        the tick heatmap, (0, 0, 0) if the ticks do not define a plausible
+        circle. Without `rim_search` the tick circle radius is returned and no
+        edges are computed.
+        """
+        key_points = self._detected_key_points()
+        if len(key_points.ticks) == 0:
+            print("Warning: No tick points found")
+            return 0, 0, 0
+
+        h, w = img.shape[:2]
+        rx, ry = key_points.resolution
+        ticks = key_points.ticks * np.array([w / rx, h / ry])
+
+        estimate = self._tick_estimator.fit(ticks)
+        if estimate is None:
+            print("Warning: Tick points do not define a circle")
+            return 0, 0, 0
+
+        cx, cy = round(estimate.center_x), round(estimate.center_y)
+        tick_radius = round(estimate.radius)
+        short_side = min(h, w)
+        if not (
+            0 <= cx < w
+            and 0 <= cy < h
+            and GaugeDetectionConfig.TICK_MIN_RADIUS * short_side
+            <= tick_radius
+            <= GaugeDetectionConfig.TICK_MAX_RADIUS * short_side
+        ):
+            print(f"Warning: Implausible tick circle ({cx}, {cy}), r={tick_radius}")
+            return 0, 0, 0
+
+        radius = self._rim_radius(cx, cy, tick_radius) if rim_search else tick_radius
+
+        if self._log_full:
+            out = img.copy()
+            for x, y in ticks.astype(int):
+                cv2.circle(out, (x, y), 1, (255, 0, 0), -1)
+            cv2.circle(out, (cx, cy), tick_radius, (0, 255, 255), 1)
+            cv2.circle(out, (cx, cy), radius, (0, 255, 0), 2)
+            self._log_image(out)
+
+        print(
+            f"Tick circle center: ({cx}, {cy}), radius: {radius} "
+            f"(ticks {tick_radius}, arc {estimate.arc:.0f}°, "
+            f"inliers {estimate.inlier_ratio:.2f})"
+        )
+        return cx, cy, radius
+
+    def find_gauge_center(self, img: np.ndarray) -> Tuple[int, int, int]:
+        """The configured center method, the contour ellipse as fallback."""
+        if self._single_pass:
+            center_x, center_y, radius = self.find_gauge_center_ticks(
+                img, rim_search=False
+            )
+            if radius > 0:
+                return center_x, center_y, radius
+            print("[CALIBRATION] tick circle fit failed, falling back to contours")
+        elif self._center_method == CENTER_METHOD_TICKS:
+            center_x, center_y, radius = self.find_gauge_center_ticks(img)
+            if radius > 0:
+                return center_x, center_y, radius
+            print("[CALIBRATION] tick circle fit failed, falling back to contours")
+
+        return self.find_gauge_center_combined(img)
+
     def _scale_keypoints(self) -> ScaledPoints:
         h, w = self._img.shape[:2]
         rx, ry = self.kp_resolution
@@ -183,10 +538,11 @@ class AnalogGaugeReader:
         end_x = self.end_point[0][0] * (w / rx)
         end_y = self.end_point[0][1] * (h / ry)
 
-        dbg = self._img.copy()
-        cv2.circle(dbg, (int(start_x), int(start_y)), 6, (0, 255, 0), -1)
-        cv2.circle(dbg, (int(end_x), int(end_y)), 6, (255, 0, 0), -1)
-        self._log_image(img=dbg)
+        if self._log_full:
+            dbg = self._img.copy()
+            cv2.circle(dbg, (int(start_x), int(start_y)), 6, (0, 255, 0), -1)
+            cv2.circle(dbg, (int(end_x), int(end_y)), 6, (255, 0, 0), -1)
+            self._log_image(img=dbg)
 
         return ScaledPoints(start_x, start_y, end_x, end_y)
 
@@ -205,6 +561,10 @@ class AnalogGaugeReader:
     def _calculate_angle_range(
         self, center_x: int, center_y: int
     ) -> Tuple[float, float]:
+        key_points = self._detected_key_points()
+        self.start_point = key_points.start
+        self.end_point = key_points.end
+        self.kp_resolution = key_points.resolution
         scaled = self._scale_keypoints()
 
         min_angle = self._point_to_gauge_angle(
@@ -256,14 +616,99 @@ class AnalogGaugeReader:
 
         return img
 
+    def _rim_support(self, edges: MatLike, cx: int, cy: int, r: int) -> float:
+        """Share of sampled rim angles with an edge pixel close to the circle."""
+        angles = np.deg2rad(np.arange(0, 360, GaugeDetectionConfig.DRIFT_ANGLE_STEP))
+        tolerance = max(2, int(r * GaugeDetectionConfig.DRIFT_RADIUS_TOLERANCE))
+        radii = r + np.arange(-tolerance, tolerance + 1)
+
+        xs = np.rint(cx + radii[:, None] * np.cos(angles)[None, :]).astype(int)
+        ys = np.rint(cy + radii[:, None] * np.sin(angles)[None, :]).astype(int)
+
+        h, w = edges.shape[:2]
+        inside = (xs >= 0) & (xs < w) & (ys >= 0) & (ys < h)
+        hits = np.zeros(xs.shape, dtype=bool)
+        hits[inside] = edges[ys[inside], xs[inside]] > 0
+
+        return float(hits.any(axis=0).mean())
+
+    def check_calibration(self, calibration: GaugeCalibration) -> bool:
+        """
+        Cheap drift check of a stored calibration against the current crop:
+        the crop must have about the same aspect ratio and the stored rim circle
+        must still lie on the edges of the image.
+        """
+        h, w = self._img.shape[:2]
+        if calibration.image_width and calibration.image_height:
+            stored_aspect = calibration.image_width / calibration.image_height
+            if (
+                abs(w / h - stored_aspect) / stored_aspect
+                > GaugeDetectionConfig.DRIFT_MAX_ASPECT_CHANGE
+            ):
+                return False
+
+        if calibration.radius <= 0:
+            return False
+
+        support = self._rim_support(
+            self._get_edges(self._img),
+            calibration.center_x,
+            calibration.center_y,
+            calibration.radius,
+        )
+        print(f"[CALIBRATION] rim support of stored calibration: {support:.2f}")
+        return support >= GaugeDetectionConfig.DRIFT_MIN_RIM_SUPPORT
+
+    def _reusable_calibration(self) -> Optional[GaugeCalibration]:
+        """The stored calibration on this crop if it passes the drift check."""
+        if self._reusable_checked:
+            return self._reusable
+        self._reusable_checked = True
+
+        # the single pass recalibrates from the forward pass it needs anyway
+        if self._stored_calibration is None or self._single_pass:
+            return None
+
+        h, w = self._img.shape[:2]
+        stored = replace(
+            self._stored_calibration.scaled_to(width=w, height=h),
+            min_value=self.min_value,
+            max_value=self.max_value,
+        )
+        with trace_span("calibration_check"):
+            is_valid = self.check_calibration(stored)
+
+        if not is_valid:
+            print("[CALIBRATION] stored calibration drifted, recalibrating")
+            return None
+
+        self._reusable = stored
+        return stored
+
+    def needs_key_points(self) -> bool:
+        """True if calibrate() has to run the keypoint model."""
+        return self._key_points is None and self._reusable_calibration() is None
+
+    def use_key_points(self, key_points: KeyPoints) -> None:
+        """Hands in the key points detected for this crop by a batch."""
+        self._key_points = key_points
+
     def calibrate(self) -> Tuple[int, int, int]:
-        center_x, center_y, radius = self.find_gauge_center_combined(self._img)
+        stored = self._reusable_calibration()
+        if stored is not None:
+            self._calibration = stored
+            self.recalibrated = False
+            return stored.center_x, stored.center_y, stored.radius
+
+        with trace_span("calibration"):
+            center_x, center_y, radius = self.find_gauge_center(self._img)
 
         if radius == 0:
             raise CenterNotFound(error_code=1765392500)
 
         min_angle, max_angle = self._calculate_angle_range(center_x, center_y)
 
+        h, w = self._img.shape[:2]
         self._calibration = GaugeCalibration(
             center_x=center_x,
             center_y=center_y,
@@ -272,53 +717,21 @@ class AnalogGaugeReader:
             max_angle=max_angle,
             min_value=self.min_value,
             max_value=self.max_value,
+            image_width=w,
+            image_height=h,
         )
+        self.recalibrated = True
 
-        img = self._visualize_angles(
-            img=self._img.copy(), x=center_x, y=center_y, r=radius
-        )
-        self._log_image(img)
+        if self._log_full:
+            img = self._visualize_angles(
+                img=self._img.copy(), x=center_x, y=center_y, r=radius
+            )
+            self._log_image(img)
 
         print(f"[CALIBRATION] min_angle={min_angle:.2f}°, max_angle={max_angle:.2f}°")
 
         return center_x, center_y, radius
 
-    def _filter_lines_by_radius(
-        self, lines: np.ndarray, center_x: int, center_y: int, radius: int
-    ) -> List[List[int]]:
-        final_lines = []
-
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-
-            d1 = self._calculate_distance(center_x, center_y, x1, y1)
-            d2 = self._calculate_distance(center_x, center_y, x2, y2)
-
-            if d1 > d2:
-                d1, d2 = d2, d1
-
-            if (
-                GaugeDetectionConfig.LINE_FILTER_MIN_D1 * radius
-                < d1
-                < GaugeDetectionConfig.LINE_FILTER_MAX_D1 * radius
-                and GaugeDetectionConfig.LINE_FILTER_MIN_D2 * radius
-                < d2
-                < GaugeDetectionConfig.LINE_FILTER_MAX_D2 * radius
-            ):
-                final_lines.append([x1, y1, x2, y2])
-
-        return final_lines
-
-    def _find_pointer_tip(
-        self, line: List[int], center_x: int, center_y: int
-    ) -> Tuple[int, int]:
-        x1, y1, x2, y2 = line
-
-        d1 = self._calculate_distance(center_x, center_y, x1, y1)
-        d2 = self._calculate_distance(center_x, center_y, x2, y2)
-
-        return (x1, y1) if d1 > d2 else (x2, y2)
-
     def _angle_to_value(self, gauge_angle: float) -> float:
         if self._calibration is None:
             raise RuntimeError("Gauge must be calibrated before reading values")
@@ -335,48 +748,108 @@ class AnalogGaugeReader:
 
         return float(new_value)
 
-    def get_current_value(self, x: int, y: int, r: int) -> float:
+    def _hough_needle(self, x: int, y: int, r: int) -> Optional[NeedleEstimate]:
         edges = self._get_edges(self._img)
-        self._log_image(edges)
-
-        lines = cv2.HoughLinesP(
-            edges,
-            rho=GaugeDetectionConfig.HOUGH_RHO,
-            theta=GaugeDetectionConfig.HOUGH_THETA,
-            threshold=GaugeDetectionConfig.HOUGH_THRESHOLD,
-            minLineLength=GaugeDetectionConfig.HOUGH_MIN_LINE_LENGTH,
-            maxLineGap=GaugeDetectionConfig.HOUGH_MAX_LINE_GAP,
-        )
+        if self._log_full:
+            self._log_image(edges)
+
+        with trace_span("hough"):
+            lines = cv2.HoughLinesP(
+                edges,
+                rho=GaugeDetectionConfig.HOUGH_RHO,
+                theta=GaugeDetectionConfig.HOUGH_THETA,
+                threshold=GaugeDetectionConfig.scaled(
+                    GaugeDetectionConfig.HOUGH_THRESHOLD, edges
+                ),
+                minLineLength=GaugeDetectionConfig.scaled(
+                    GaugeDetectionConfig.HOUGH_MIN_LINE_LENGTH, edges
+                ),
+                maxLineGap=GaugeDetectionConfig.scaled(
+                    GaugeDetectionConfig.HOUGH_MAX_LINE_GAP, edges
+                ),
+            )
 
         if lines is None:
             print("Warning: No lines detected")
-            return -1.0
+            return None
 
-        out_img = self._img.copy()
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            cv2.line(out_img, (x1, y1), (x2, y2), (255, 0, 0), 2)
-        self._log_image(out_img)
+        if self._log_full:
+            out_img = self._img.copy()
+            cv2.polylines(out_img, lines.reshape(-1, 2, 2), False, (255, 0, 0), 2)
+            self._log_image(out_img)
 
-        final_lines = self._filter_lines_by_radius(lines, x, y, r)
+        needle = self._needle_estimator.estimate(lines, x, y, r)
 
-        if len(final_lines) == 0:
+        if needle is None:
             print("Warning: No lines found within expected radius range")
-            return -1.0
+        return needle
 
-        best_line = max(
-            final_lines,
-            key=lambda line: self._calculate_distance(
-                line[0], line[1], line[2], line[3]
-            ),
+    def _polar_needle(self, x: int, y: int, r: int) -> NeedleEstimate:
+        with trace_span("polar_needle"):
+            needle = self._polar_needle_estimator.estimate(
+                self._preprocessing.gray, x, y, r
+            )
+
+        if self._log_full:
+            polar = self._polar_needle_estimator.unwrap(
+                self._preprocessing.gray, x, y, r
+            )
+            self._log_image(cv2.cvtColor(polar, cv2.COLOR_GRAY2BGR))
+
+        # no -1 sentinel: a missing needle must not be replaced by a
+        # fallback value further down
+        if needle is None:
+            raise NeedleNotFound(error_code=1792620010)
+        return needle
+
+    def _keypoint_needle(self, x: int, y: int, r: int) -> NeedleEstimate:
+        key_points = self._detected_key_points()
+        h, w = self._img.shape[:2]
+        rx, ry = key_points.resolution
+        scale = np.array([w / rx, h / ry])
+
+        needle = self._heatmap_needle_estimator.estimate(
+            key_points.needle_tip * scale, key_points.needle_axis * scale, x, y, r
         )
 
-        tip = self._find_pointer_tip(best_line, x, y)
+        if self._log_full:
+            dbg = self._img.copy()
+            for px, py in (key_points.needle_axis * scale).astype(int):
+                cv2.circle(dbg, (px, py), 1, (255, 0, 0), -1)
+            self._log_image(dbg)
 
-        dx = tip[0] - x
-        dy = tip[1] - y
-        angle_rad = np.arctan2(dy, dx)
-        gauge_angle = (np.rad2deg(angle_rad) - 90) % 360
+        if needle is None:
+            if len(key_points.needle_tip) == 0 and len(key_points.needle_axis) == 0:
+                print("Warning: keypoint model returned no needle heatmaps")
+            raise NeedleNotFound(error_code=1792620020)
+        return needle
+
+    def get_current_value(self, x: int, y: int, r: int) -> float:
+        if self._single_pass:
+            needle = self._keypoint_needle(x, y, r)
+        elif self._needle_detector == NEEDLE_DETECTOR_POLAR:
+            needle = self._polar_needle(x, y, r)
+        else:
+            needle = self._hough_needle(x, y, r)
+            if needle is None:
+                return -1.0
+
+        self.needle = needle
+        tip = (needle.tip_x, needle.tip_y)
+        gauge_angle = needle.angle
+
+        print(
+            f"Debug: gauge_angle = {gauge_angle:.2f}° "
+            f"(confidence {needle.confidence:.2f}, support {needle.support})"
+        )
+
+        # the final annotated reading, the only artifact kept in production;
+        # logged before the clamps, out-of-range readings need it the most
+        if self._log_final:
+            img_circles = self._img.copy()
+            cv2.line(img_circles, (x, y), tip, (0, 255, 0), 2)
+            cv2.circle(img_circles, tip, 3, (0, 0, 255), -1)
+            self._log_image(img_circles)
 
         if gauge_angle <= self._calibration.min_angle:
             return self.min_value
@@ -384,32 +857,156 @@ class AnalogGaugeReader:
         if gauge_angle >= self._calibration.max_angle:
             return self.max_value
 
-        print(f"Debug: gauge_angle = {gauge_angle:.2f}°")
-
-        img_circles = self._img.copy()
-        cv2.line(img_circles, (x, y), tip, (0, 255, 0), 2)
-        cv2.circle(img_circles, tip, 3, (0, 0, 255), -1)
-        self._log_image(img_circles)
-
         gauge_value = self._angle_to_value(gauge_angle)
         print(f"Debug: gauge_value = {gauge_value:.2f}")
 
         return gauge_value
 
 
+def _reading(reader: AnalogGaugeReader) -> AnalogGaugeReading:
+    center_x, center_y, radius = reader.calibrate()
+    value = reader.get_current_value(x=center_x, y=center_y, r=radius)
+    debug_images = [debug_frame.bgr for debug_frame in reader.get_images_log()]
+
+    return AnalogGaugeReading(
+        center_x=int(center_x),
+        center_y=int(center_y),
+        radius=int(radius),
+        value=float(value),
+        debug_images=debug_images,
+        calibration=reader.calibration,
+        recalibrated=reader.recalibrated,
+        confidence=reader.needle.confidence if reader.needle else None,
+    )
+
+
+def read_analog_gauge(
+    frame: Frame,
+    category: str = "pressure",
+    debug_level: Optional[str] = None,
+    calibration: Optional[GaugeCalibration] = None,
+    aruco_id: Optional[int] = None,
+) -> AnalogGaugeReading:
+    """
+    Calibrates and reads one cropped gauge. Module level and free of Frame
+    references in its result, so it can run inside a worker process.
+
+    A stored `calibration` of the gauge is reused if it passes the drift
+    check, the reading is then needle detection only.
+    """
+    with AnalogGaugeReader(
+        img=frame,
+        category=category,
+        debug_level=debug_level,
+        calibration=calibration,
+        aruco_id=aruco_id,
+    ) as reader:
+        return _reading(reader)
+
+
+def read_analog_gauges(
+    frames: List[Frame],
+    categories: List[str],
+    aruco_ids: Optional[List[Optional[int]]] = None,
+    calibrations: Optional[List[Optional[GaugeCalibration]]] = None,
+    debug_level: Optional[str] = None,
+) -> List[Union[AnalogGaugeReading, AnalogGaugeFailure]]:
+    """
+    Reads several cropped gauges of one capture. The key points of every
+    gauge that needs a (re)calibration come from a single batched forward
+    pass of the keypoint model. A gauge that cannot be read yields an
+    AnalogGaugeFailure with its error, the others are still read; unlike the
+    exception it pickles back from a worker process as it is.
+    """
+    aruco_ids = aruco_ids or [None] * len(frames)
+    calibrations = calibrations or [None] * len(frames)
+
+    with ExitStack() as stack:
+        readers = [
+            stack.enter_context(
+                AnalogGaugeReader(
+                    img=frame,
+                    category=category,
+                    debug_level=debug_level,
+                    calibration=calibration,
+                    aruco_id=aruco_id,
+                )
+            )
+            for frame, category, aruco_id, calibration in zip(
+                frames, categories, aruco_ids, calibrations
+            )
+        ]
+
+        pending = [reader for reader in readers if reader.needs_key_points()]
+        if pending:
+            batch = pending[0].kp_detector.detect_key_points_batch(
+                [reader.frame for reader in pending]
+            )
+            for reader, key_points in zip(pending, batch):
+                reader.use_key_points(key_points)
+
+        readings: List[Union[AnalogGaugeReading, AnalogGaugeFailure]] = []
+        for reader, category in zip(readers, categories):
+            try:
+                readings.append(_reading(reader))
+            except (Exception, BaseAppException) as e:
+                print(f"[AnalogGaugeReader] reading {category} failed: {e}")
+                readings.append(
+                    AnalogGaugeFailure(
+                        category=category,
+                        error=str(e),
+                        error_code=getattr(e, "error_code", None),
+                    )
+                )
+
+    return readings
+
+
+def read_analog_gauges_in_boxes(
+    frame: Frame,
+    boxes: List[np.ndarray],
+    categories: List[str],
+    aruco_ids: Optional[List[Optional[int]]] = None,
+    calibrations: Optional[List[Optional[GaugeCalibration]]] = None,
+    output_size: Optional[Tuple[int, int]] = None,
+    debug_level: Optional[str] = None,
+) -> List[Union[AnalogGaugeReading, AnalogGaugeFailure]]:
+    """
+    read_analog_gauges on the square crops of `boxes`, at the gauge canvas
+    size unless `output_size` is given. Takes the whole capture, so a CV
+    executor shares it once instead of one crop per gauge.
+    """
+    if output_size is None:
+        size = SettingsManager().getGaugeCanvasSize()
+        output_size = (size, size)
+    crops = [
+        Frame.from_array(
+            square_crop(frame.bgr, box, output_size), source_name=frame.source_name
+        )
+        for box in boxes
+    ]
+    return read_analog_gauges(
+        crops,
+        categories,
+        aruco_ids=aruco_ids,
+        calibrations=calibrations,
+        debug_level=debug_level,
+    )
+
+
 # def main() -> None:
 #     with open("test2.jpg", "rb") as f:
-#         image_bytes = f.read()
+#         frame = Frame.from_bytes(f.read())
 
-#     with AnalogGaugeReader(image_bytes, category="pressure") as gauge:
+#     with AnalogGaugeReader(frame, category="pressure") as gauge:
 #         cx, cy, r = gauge.calibrate()
 #         value = gauge.get_current_value(cx, cy, r)
 
 #         print(f"Gauge Value: {value:.2f} {gauge.units}")
 
-#         for idx, img_bytes in enumerate(gauge.get_images_log()):
+#         for idx, debug_frame in enumerate(gauge.get_images_log()):
 #             with open(f"test-{idx}.png", "wb") as f:
-#                 f.write(img_bytes)
+#                 f.write(debug_frame.encode(ext=".png"))
 
 
 # if __name__ == "__main__":
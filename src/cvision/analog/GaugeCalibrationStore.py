@@ -0,0 +1,100 @@
+import threading
+
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import Dict, Optional, Tuple
+from cvision.analog.AnalogGaugeReader import GaugeCalibration
+from db.dal.DataAccessLayer import DataAccessLayer
+from db.mapping.input.GaugeCalibrationMapper import GaugeCalibrationMapper
+
+
+class GaugeCalibrationStore:
+    """
+    Calibrations of the mounted gauges, keyed by (aruco_id, category).
+
+    Held in memory and backed by the gauge_calibrations table, so a restart
+    does not recalibrate every gauge. Only the geometry is stored, min / max
+    value always come from sensors.yaml. Storage errors are logged and never
+    fail a reading: without a calibration the gauge is simply calibrated again.
+    """
+
+    def __init__(self):
+        self._calibrations: Dict[Tuple[int, str], GaugeCalibration] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, dal: DataAccessLayer, aruco_id: Optional[int], category: str
+    ) -> Optional[GaugeCalibration]:
+        if aruco_id is None:
+            return None
+
+        key = (aruco_id, category)
+        with self._lock:
+            calibration = self._calibrations.get(key)
+        if calibration is not None:
+            return calibration
+
+        try:
+            dto = dal.get_gauge_calibration(aruco_id=aruco_id, category=category)
+        except (Exception, BaseAppException) as e:
+            print(f"[GaugeCalibrationStore] lookup failed for {key}: {e}")
+            return None
+
+        if dto is None:
+            return None
+
+        calibration = GaugeCalibration(
+            center_x=dto.center_x,
+            center_y=dto.center_y,
+            radius=dto.radius,
+            min_angle=dto.min_angle,
+            max_angle=dto.max_angle,
+            min_value=0.0,
+            max_value=0.0,
+            image_width=dto.image_width,
+            image_height=dto.image_height,
+        )
+        with self._lock:
+            self._calibrations[key] = calibration
+        return calibration
+
+    def put(
+        self,
+        dal: DataAccessLayer,
+        aruco_id: Optional[int],
+        category: str,
+        calibration: GaugeCalibration,
+    ) -> None:
+        if aruco_id is None:
+            return
+
+        with self._lock:
+            self._calibrations[(aruco_id, category)] = calibration
+
+        try:
+            dal.upsert_gauge_calibration(
+                calibration_with_metadata=GaugeCalibrationMapper.map_calibration(
+                    aruco_id=aruco_id,
+                    category=category,
+                    center_x=calibration.center_x,
+                    center_y=calibration.center_y,
+                    radius=calibration.radius,
+                    min_angle=calibration.min_angle,
+                    max_angle=calibration.max_angle,
+                    image_width=calibration.image_width,
+                    image_height=calibration.image_height,
+                )
+            )
+        except (Exception, BaseAppException) as e:
+            print(f"[GaugeCalibrationStore] storing failed for {aruco_id}: {e}")
+
+    def invalidate(
+        self, aruco_id: Optional[int] = None, category: Optional[str] = None
+    ) -> None:
+        """Drops cached entries (all if no filter), the table is left untouched."""
+        with self._lock:
+            for key in list(self._calibrations):
+                if aruco_id is not None and key[0] != aruco_id:
+                    continue
+                if category is not None and key[1] != category:
+                    continue
+                del self._calibrations[key]
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from common.imports.Typing import Dict, List, Optional, Tuple
+from credentials.manager.SettingsManager import SettingsManager
+
+
+@dataclass
+class GaugeAssignment:
+    # position of the box in the detector output
+    index: int
+    box: np.ndarray
+    category: str
+    # node of the category in sensors.yaml, None for the node without marker
+    aruco_id: Optional[int]
+    # marker that identifies the mounted gauge (calibration / ROI key)
+    marker_id: Optional[int]
+
+
+class GaugeSensorMapper:
+    """
+    Maps the gauges found in one capture to their configured sensors.
+
+    Every gauge goes to the nearest ArUco marker whose node still has an
+    unassigned analog category (sensor_type: analog in sensors.yaml); the
+    categories of a node are handed out left to right. Markers further away
+    than `max_distance` gauge diagonals are ignored. A gauge no marker claims
+    takes an analog category of the node without aruco_id, gauges that cannot
+    be attributed to any sensor are left out.
+    """
+
+    def __init__(
+        self,
+        settings_manager: Optional[SettingsManager] = None,
+        max_distance: float = 1.5,
+    ) -> None:
+        self._settings_manager = settings_manager or SettingsManager()
+        self.max_distance = max_distance
+
+    def _free_categories(
+        self, aruco_ids: List[Optional[int]]
+    ) -> Dict[Optional[int], List[str]]:
+        return {
+            aruco_id: list(self._settings_manager.getAnalogCategoriesByNodeID(aruco_id))
+            for aruco_id in aruco_ids
+        }
+
+    def assign(
+        self,
+        boxes: List[np.ndarray],
+        markers: List[Tuple[int, Tuple[float, float]]],
+        fallback_marker_id: Optional[int] = None,
+    ) -> List[GaugeAssignment]:
+        marker_ids = list(dict.fromkeys(marker_id for marker_id, _ in markers))
+        free = self._free_categories([*marker_ids, None])
+
+        assignments: List[GaugeAssignment] = []
+        order = sorted(range(len(boxes)), key=lambda i: (boxes[i][0] + boxes[i][2]))
+        for index in order:
+            box = np.asarray(boxes[index])
+            center = np.array([(box[0] + box[2]) / 2, (box[1] + box[3]) / 2])
+            diagonal = float(np.hypot(box[2] - box[0], box[3] - box[1]))
+
+            distances = sorted(
+                (float(np.hypot(*(np.asarray(position) - center))), marker_id)
+                for marker_id, position in markers
+            )
+            assignment = None
+            for distance, marker_id in distances:
+                if distance > self.max_distance * diagonal:
+                    break
+                if free[marker_id]:
+                    assignment = GaugeAssignment(
+                        index=index,
+                        box=box,
+                        category=free[marker_id].pop(0),
+                        aruco_id=marker_id,
+                        marker_id=marker_id,
+                    )
+                    break
+
+            if assignment is None and free[None]:
+                assignment = GaugeAssignment(
+                    index=index,
+                    box=box,
+                    category=free[None].pop(0),
+                    aruco_id=None,
+                    marker_id=fallback_marker_id,
+                )
+
+            if assignment is None:
+                print(f"[GaugeSensorMapper] no sensor configured for gauge {box}")
+                continue
+            assignments.append(assignment)
+
+        return assignments
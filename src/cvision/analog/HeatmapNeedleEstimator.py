@@ -0,0 +1,88 @@
+import numpy as np
+
+from common.imports.Typing import Optional
+from cvision.analog.NeedleEstimator import NeedleEstimate
+
+
+class HeatmapNeedleEstimator:
+    """
+    Needle estimation from the needle heatmaps of the keypoint model.
+
+    The tip heatmap gives the direction, the axis heatmap (pixels along the
+    needle) refines it: the angle is the circular mean of the axis pixels
+    within `window_deg` of the tip direction, weighted by their distance from
+    the center, with the tip voting as much as all of them together. Without
+    a tip the strongest direction of the axis pixels is used. Pixels inside
+    `min_radius` (hub, tail) or beyond `max_radius` of the radius are ignored.
+    """
+
+    def __init__(
+        self,
+        min_radius: float = 0.15,
+        max_radius: float = 1.1,
+        window_deg: float = 10.0,
+    ) -> None:
+        self.min_radius = min_radius
+        self.max_radius = max_radius
+        # half width of the cone around the needle direction
+        self.window_deg = window_deg
+
+    def _in_band(self, points: np.ndarray, center: np.ndarray, radius: float):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        distance = np.hypot(*(points - center).T)
+        keep = (distance >= self.min_radius * radius) & (
+            distance <= self.max_radius * radius
+        )
+        return points[keep], distance[keep]
+
+    def estimate(
+        self,
+        tip: np.ndarray,
+        axis: np.ndarray,
+        center_x: float,
+        center_y: float,
+        radius: float,
+    ) -> Optional[NeedleEstimate]:
+        if radius <= 0:
+            return None
+
+        center = np.array([center_x, center_y], dtype=np.float64)
+        tip, _ = self._in_band(tip, center, radius)
+        axis, axis_distance = self._in_band(axis, center, radius)
+        if len(tip) == 0 and len(axis) == 0:
+            return None
+
+        theta = np.arctan2(axis[:, 1] - center_y, axis[:, 0] - center_x)
+        if len(tip):
+            reference = np.arctan2(tip[0, 1] - center_y, tip[0, 0] - center_x)
+        else:
+            # strongest 2 * window cone of the axis pixels
+            bins = np.floor(np.rad2deg(theta) % 360).astype(int)
+            histogram = np.bincount(bins, weights=axis_distance, minlength=360)
+            half = max(1, round(self.window_deg))
+            wrapped = np.concatenate([histogram[-half:], histogram, histogram[:half]])
+            window_sum = np.convolve(wrapped, np.ones(2 * half + 1), mode="valid")
+            reference = np.deg2rad(np.argmax(window_sum) + 0.5)
+
+        delta = np.angle(np.exp(1j * (theta - reference)))
+        in_cone = np.abs(delta) <= np.deg2rad(self.window_deg)
+        weight = axis_distance[in_cone]
+
+        vote = np.sum(weight * np.exp(1j * theta[in_cone]))
+        if len(tip):
+            vote += max(weight.sum(), 1.0) * np.exp(1j * reference)
+        consensus = float(np.angle(vote))
+
+        if len(tip):
+            tip_x, tip_y = tip[0]
+        else:
+            tip_x, tip_y = axis[in_cone][np.argmax(weight)]
+
+        confidence = float(weight.sum() / axis_distance.sum()) if len(axis) else 1.0
+        return NeedleEstimate(
+            angle=float((np.rad2deg(consensus) - 90) % 360),
+            tip_x=round(tip_x),
+            tip_y=round(tip_y),
+            confidence=confidence,
+            support=int(in_cone.sum()) + len(tip),
+        )
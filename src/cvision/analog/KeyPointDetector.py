@@ -1,45 +1,128 @@
+from cvision.analog.key_point_detection.key_point_extraction import (
+    heatmap_to_input_coordinates,
+    needle_key_points,
+    tick_key_points,
+)
 from cvision.analog.key_point_detection.key_point_inference import (
     KeyPointInference,
     detect_key_points,
 )
+from cvision.analog.key_point_detection.model import (
+    HEATMAP_NEEDLE_AXIS,
+    HEATMAP_NEEDLE_TIP,
+    HEATMAP_TICKS,
+)
+from dataclasses import dataclass, field
 import numpy as np
 from PIL import Image, ImageDraw
 import io
-from common.imports.Typing import Tuple
+from common.imports.Typing import List, Optional, Tuple
+from credentials.manager.SettingsManager import SettingsManager
+from cvision.registry.ModelRegistry import KEY_POINT_MODEL_PATH
+from cvision.frame.Frame import Frame
+import cv2
+from common.tracing.InspectionTrace import trace_span
+from common.resources.ResourceManager import ResourceManager
+
+
+@dataclass
+class GaugeKeyPoints:
+    # [[x, y]] of the scale start / end, (0, 2) if not found
+    start: np.ndarray
+    end: np.ndarray
+    # (width, height) of the key point coordinate space
+    resolution: Tuple[int, int]
+    # (N, 2) pixels of the tick heatmap, the dial circle is fitted to them
+    ticks: np.ndarray = field(default_factory=lambda: np.empty((0, 2)))
+    # [[x, y]] of the needle tip and (N, 2) pixels along the needle, empty
+    # unless the model has a needle head
+    needle_tip: np.ndarray = field(default_factory=lambda: np.empty((0, 2)))
+    needle_axis: np.ndarray = field(default_factory=lambda: np.empty((0, 2)))
 
 
 class KeyPointDetector:
 
-    RESOLUTION = (448, 448)
-
     def __init__(
-        self, key_point_model_path: str = "src/cvision/analog/models/key_point_model.pt"
+        self,
+        key_point_model_path: str = KEY_POINT_MODEL_PATH,
+        extraction_mode: Optional[str] = None,
+        runtime: Optional[str] = None,
+        input_size: Optional[int] = None,
+        decode: Optional[str] = None,
     ) -> None:
         self.key_point_model_path = key_point_model_path
-        self.key_point_inferencer = KeyPointInference(key_point_model_path)
-
-    def detect_key_points(
-        self, image_bytes: bytes
-    ) -> Tuple[np.ndarray, np.ndarray, Tuple[int, int]]:
-
-        img_resized = self.resize_image_bytes(image_bytes)
-
-        buf = io.BytesIO()
-        img_resized.save(buf, format="JPEG")
-        resized_bytes = buf.getvalue()
-
-        heatmaps = self.key_point_inferencer.predict_heatmaps(resized_bytes)
-        key_point_list = detect_key_points(heatmaps)
-
-        start_point = key_point_list[0]
-        end_point = key_point_list[2]
-
-        return start_point, end_point, self.RESOLUTION
+        # square model input, the gauge canvas by default: crops of the cropper
+        # then go into the model without another resize and the key points
+        # are already in crop pixels
+        size = input_size or SettingsManager().getKeyPointInputSize()
+        self.resolution = (size, size)
+        # eager (torch.hub DINOv2) or a graph exported with export_model.py
+        self.key_point_inferencer = KeyPointInference(
+            key_point_model_path,
+            runtime=runtime or SettingsManager().getKeyPointRuntime(),
+            input_size=self.resolution,
+            decode=decode or SettingsManager().getKeyPointDecode(),
+        )
+        # "fast" (peaks of start / end only) or "cluster" (KMeans / MeanShift)
+        self.extraction_mode = (
+            extraction_mode or SettingsManager().getKeyPointExtractionMode()
+        )
+
+    def detect_key_points(self, frame: Frame) -> GaugeKeyPoints:
+
+        return self.detect_key_points_batch([frame])[0]
+
+    def detect_key_points_batch(self, frames: List[Frame]) -> List[GaugeKeyPoints]:
+        """Key points of several gauge crops from a single forward pass."""
+
+        # RGB crops at the model resolution, handed to the model without any
+        # encode / decode round trip
+        images = [
+            frame.resized(self.resolution, interpolation=cv2.INTER_CUBIC, rgb=True)
+            for frame in frames
+        ]
+
+        results = []
+        with trace_span("keypoint_inference"):
+            batch_heatmaps = self.key_point_inferencer.predict_heatmaps_batch(images)
+            for heatmaps in batch_heatmaps:
+                key_point_list = detect_key_points(
+                    heatmaps,
+                    n_jobs=ResourceManager().sklearn_jobs,
+                    mode=self.extraction_mode,
+                    input_size=self.resolution,
+                )
+                point_sets = [np.empty((0, 2))] * 3
+                if len(heatmaps) > HEATMAP_TICKS:
+                    point_sets[0] = tick_key_points(heatmaps[HEATMAP_TICKS])
+                if len(heatmaps) > HEATMAP_NEEDLE_AXIS:
+                    point_sets[1:] = needle_key_points(
+                        heatmaps[HEATMAP_NEEDLE_TIP], heatmaps[HEATMAP_NEEDLE_AXIS]
+                    )
+                ticks, needle_tip, needle_axis = heatmap_to_input_coordinates(
+                    point_sets, heatmaps.shape[-2:], self.resolution
+                )
+                results.append(
+                    GaugeKeyPoints(
+                        start=key_point_list[0],
+                        end=key_point_list[2],
+                        resolution=self.resolution,
+                        ticks=ticks,
+                        needle_tip=needle_tip,
+                        needle_axis=needle_axis,
+                    )
+                )
+
+        return results
+
+    def warm_up(self) -> None:
+        dummy = np.zeros((*self.resolution, 3), dtype=np.uint8)
+        self.key_point_inferencer.predict_heatmaps_from_array(dummy)
 
     def resize_image_bytes(self, image_bytes: bytes):
 
         img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        img_resized = img.resize(self.RESOLUTION, Image.BICUBIC)
+        img_resized = img.resize(self.resolution, Image.BICUBIC)
         return img_resized
 
 
@@ -0,0 +1,149 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from common.imports.Typing import Optional, Tuple
+
+
+@dataclass
+class NeedleEstimate:
+    # gauge angle in degrees, 0 = pointing down, clockwise like the calibration
+    angle: float
+    tip_x: int
+    tip_y: int
+    # share of the total segment weight that supports the consensus, 0..1
+    confidence: float
+    # number of segments in the consensus cluster (Hough) or of dark radial
+    # samples along the needle (polar)
+    support: int
+
+
+class NeedleEstimator:
+    """
+    Vectorized needle estimation from HoughLinesP segments.
+
+    All segments are filtered, scored and clustered in one NumPy pass:
+    endpoints must lie in the radius band of a needle (near end close to the
+    center, far end close to the rim), every segment is weighted by its length
+    times how well it points through the center, and the weights are
+    accumulated in a circular angle histogram. The consensus angle is the
+    weighted circular mean of the segments around the strongest histogram
+    window, so thick needles (two edge lines) and broken needles (several
+    short segments) vote for the same angle and the result is sub-degree.
+    """
+
+    def __init__(
+        self,
+        min_d1: float = 0.05,
+        max_d1: float = 0.3,
+        min_d2: float = 0.5,
+        max_d2: float = 1.05,
+        cluster_window_deg: float = 6.0,
+        max_center_offset: float = 0.15,
+    ) -> None:
+        # radius bands (relative to the radius) for the near / far endpoint
+        self.min_d1 = min_d1
+        self.max_d1 = max_d1
+        self.min_d2 = min_d2
+        self.max_d2 = max_d2
+        # full width of the window that forms one needle cluster
+        self.cluster_window_deg = cluster_window_deg
+        # perpendicular distance of the line from the center (relative to the
+        # radius) at which the radial alignment weight drops to zero
+        self.max_center_offset = max_center_offset
+
+    def filter_segments(
+        self, segments: np.ndarray, center_x: float, center_y: float, radius: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns (near, far, far_distance) of the segments inside the radius
+        bands; near / far are (N, 2) endpoint arrays.
+        """
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        center = np.array([center_x, center_y], dtype=np.float64)
+
+        p1 = segments[:, 0:2]
+        p2 = segments[:, 2:4]
+        d1 = np.hypot(*(p1 - center).T)
+        d2 = np.hypot(*(p2 - center).T)
+
+        swap = d1 > d2
+        near = np.where(swap[:, None], p2, p1)
+        far = np.where(swap[:, None], p1, p2)
+        d_near = np.minimum(d1, d2)
+        d_far = np.maximum(d1, d2)
+
+        keep = (
+            (d_near > self.min_d1 * radius)
+            & (d_near < self.max_d1 * radius)
+            & (d_far > self.min_d2 * radius)
+            & (d_far < self.max_d2 * radius)
+        )
+        return near[keep], far[keep], d_far[keep]
+
+    def estimate(
+        self,
+        segments: Optional[np.ndarray],
+        center_x: float,
+        center_y: float,
+        radius: float,
+    ) -> Optional[NeedleEstimate]:
+        if segments is None or len(segments) == 0 or radius <= 0:
+            return None
+
+        near, far, d_far = self.filter_segments(segments, center_x, center_y, radius)
+        if len(far) == 0:
+            return None
+
+        center = np.array([center_x, center_y], dtype=np.float64)
+        direction = far - near
+        length = np.hypot(direction[:, 0], direction[:, 1])
+        valid = length > 0
+        if not valid.any():
+            return None
+        near, far, d_far = near[valid], far[valid], d_far[valid]
+        direction, length = direction[valid], length[valid]
+
+        # perpendicular distance of the infinite line from the center
+        to_center = center - near
+        offset = (
+            np.abs(
+                direction[:, 0] * to_center[:, 1] - direction[:, 1] * to_center[:, 0]
+            )
+            / length
+        )
+        alignment = np.clip(1.0 - offset / (self.max_center_offset * radius), 0.0, 1.0)
+        weight = length * alignment**2
+        if weight.sum() <= 0:
+            return None
+
+        # image angle of the far endpoint, the needle points from center to tip
+        theta = np.arctan2(far[:, 1] - center_y, far[:, 0] - center_x)
+
+        # circular histogram (1° bins) smoothed with the cluster window
+        bins = np.floor(np.rad2deg(theta) % 360).astype(int)
+        histogram = np.bincount(bins, weights=weight, minlength=360)
+        half = max(1, round(self.cluster_window_deg / 2))
+        kernel = np.ones(2 * half + 1)
+        wrapped = np.concatenate([histogram[-half:], histogram, histogram[:half]])
+        window_sum = np.convolve(wrapped, kernel, mode="valid")
+        peak = np.deg2rad(np.argmax(window_sum) + 0.5)
+
+        # distance to the peak on the circle, in radians
+        delta = np.angle(np.exp(1j * (theta - peak)))
+        in_cluster = np.abs(delta) <= np.deg2rad(half + 0.5)
+
+        cluster_weight = weight[in_cluster]
+        consensus = np.angle(np.sum(cluster_weight * np.exp(1j * theta[in_cluster])))
+
+        tip_distance = float(np.max(d_far[in_cluster]))
+        tip_x = round(center_x + tip_distance * np.cos(consensus))
+        tip_y = round(center_y + tip_distance * np.sin(consensus))
+
+        return NeedleEstimate(
+            angle=float((np.rad2deg(consensus) - 90) % 360),
+            tip_x=tip_x,
+            tip_y=tip_y,
+            confidence=float(cluster_weight.sum() / weight.sum()),
+            support=int(in_cluster.sum()),
+        )
@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+
+from common.imports.Typing import MatLike, Optional
+from cvision.analog.NeedleEstimator import NeedleEstimate
+
+
+class PolarNeedleEstimator:
+    """
+    Needle estimation on the polar unwrap of the gauge face.
+
+    The grayscale face is unwrapped once with cv2.warpPolar around the
+    calibrated center (rows = angles, columns = radii up to the rim). The
+    median of every radius column over all angles is the dial background
+    (face, printed rings), so the darkness above it is what lies on a single
+    angle only. Averaged over the radius band of the needle - outside the hub,
+    inside the tick ring - this gives one profile value per angle, its
+    circular maximum is the needle. A parabola through the peak and its
+    neighbours refines the angle below one bin.
+
+    Confidence is 1 minus the ratio of the strongest competing angle (outside
+    `exclusion_deg` of the peak) to the peak, a shadow or a second needle of
+    the same darkness gives 0.
+    """
+
+    def __init__(
+        self,
+        angle_bins: int = 720,
+        min_radius: float = 0.2,
+        max_radius: float = 0.75,
+        smoothing_deg: float = 2.0,
+        exclusion_deg: float = 20.0,
+        min_contrast: float = 10.0,
+    ) -> None:
+        self.angle_bins = angle_bins
+        # radius band (relative to the radius) averaged into the profile
+        self.min_radius = min_radius
+        self.max_radius = max_radius
+        # width of the circular box filter over the profile
+        self.smoothing_deg = smoothing_deg
+        # half width around the peak ignored when looking for a competitor
+        self.exclusion_deg = exclusion_deg
+        # minimum darkness (gray levels) of the peak above the background
+        self.min_contrast = min_contrast
+
+    def unwrap(self, gray: MatLike, center_x: float, center_y: float, radius: float):
+        """(angle_bins, radius) polar image, row i at i * 360 / angle_bins."""
+        return cv2.warpPolar(
+            gray,
+            (int(np.ceil(radius)), self.angle_bins),
+            (float(center_x), float(center_y)),
+            float(radius),
+            cv2.INTER_LINEAR + cv2.WARP_POLAR_LINEAR,
+        )
+
+    def _circular_smooth(self, profile: np.ndarray) -> np.ndarray:
+        half = round(self.smoothing_deg / 2 * self.angle_bins / 360)
+        if half < 1:
+            return profile
+        kernel = np.ones(2 * half + 1) / (2 * half + 1)
+        wrapped = np.concatenate([profile[-half:], profile, profile[:half]])
+        return np.convolve(wrapped, kernel, mode="valid")
+
+    def estimate(
+        self,
+        gray: MatLike,
+        center_x: float,
+        center_y: float,
+        radius: float,
+    ) -> Optional[NeedleEstimate]:
+        if radius <= 0:
+            return None
+
+        polar = self.unwrap(gray, center_x, center_y, radius).astype(np.float32)
+        # darkness above the per-radius background
+        contrast = np.median(polar, axis=0, keepdims=True) - polar
+
+        low = int(self.min_radius * polar.shape[1])
+        high = max(low + 1, int(self.max_radius * polar.shape[1]))
+        profile = self._circular_smooth(contrast[:, low:high].mean(axis=1))
+
+        n = self.angle_bins
+        peak = int(np.argmax(profile))
+        if profile[peak] < self.min_contrast:
+            return None
+
+        # sub-bin vertex of the parabola through the peak and its neighbours
+        left, right = profile[(peak - 1) % n], profile[(peak + 1) % n]
+        curvature = left - 2 * profile[peak] + right
+        shift = 0.5 * (left - right) / curvature if curvature < 0 else 0.0
+        theta = np.deg2rad((peak + shift) * 360 / n)
+
+        distance = np.abs((np.arange(n) - peak + n // 2) % n - n // 2)
+        exclusion = round(self.exclusion_deg * n / 360)
+        competitor = max(float(profile[distance > exclusion].max()), 0.0)
+        confidence = float(np.clip(1.0 - competitor / profile[peak], 0.0, 1.0))
+
+        # the tip is where the needle row stops being dark, outwards from the
+        # start of the band
+        column = contrast[peak, low:]
+        faded = column < 0.5 * column[: high - low].max()
+        length = int(np.argmax(faded)) if faded.any() else len(column)
+        tip_distance = float(low + max(length - 1, 0))
+
+        return NeedleEstimate(
+            angle=float((np.rad2deg(theta) - 90) % 360),
+            tip_x=round(center_x + tip_distance * np.cos(theta)),
+            tip_y=round(center_y + tip_distance * np.sin(theta)),
+            confidence=confidence,
+            support=length,
+        )
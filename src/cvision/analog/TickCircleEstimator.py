@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from common.imports.Typing import Optional, Tuple
+
+
+@dataclass
+class CircleEstimate:
+    center_x: float
+    center_y: float
+    radius: float
+    # share of the points within the inlier band, 0..1
+    inlier_ratio: float
+    # angular span of the inliers around the center in degrees
+    arc: float
+
+
+class TickCircleEstimator:
+    """
+    Circle through the scale ticks of a gauge.
+
+    The tick points (pixels of the keypoint model's middle heatmap) lie on
+    an arc of the dial. RANSAC draws all candidate circles at once from
+    random point triples, keeps the one with the most points inside a band of
+    `inlier_tolerance` times its radius and refines it by an algebraic least
+    squares fit (Kasa) on those inliers. Fits whose inliers cover less than
+    `min_arc` degrees are rejected, a short arc does not pin down the center.
+    """
+
+    def __init__(
+        self,
+        iterations: int = 200,
+        inlier_tolerance: float = 0.03,
+        min_points: int = 8,
+        min_arc: float = 90.0,
+        max_points: int = 2000,
+        seed: int = 0,
+    ) -> None:
+        self.iterations = iterations
+        self.inlier_tolerance = inlier_tolerance
+        self.min_points = min_points
+        self.min_arc = min_arc
+        # larger point sets are subsampled evenly before fitting
+        self.max_points = max_points
+        self.seed = seed
+
+    @staticmethod
+    def least_squares(points: np.ndarray) -> Optional[Tuple[float, float, float]]:
+        """Kasa fit: x^2 + y^2 = D x + E y + F solved in one lstsq call."""
+        x, y = points[:, 0], points[:, 1]
+        a = np.column_stack([x, y, np.ones_like(x)])
+        b = x**2 + y**2
+        (d, e, f), *_ = np.linalg.lstsq(a, b, rcond=None)
+
+        cx, cy = d / 2, e / 2
+        r2 = f + cx**2 + cy**2
+        if r2 <= 0:
+            return None
+        return float(cx), float(cy), float(np.sqrt(r2))
+
+    @staticmethod
+    def arc_coverage(points: np.ndarray, cx: float, cy: float) -> float:
+        """360 minus the largest angular gap between the points, in degrees."""
+        angles = np.degrees(np.arctan2(points[:, 1] - cy, points[:, 0] - cx))
+        angles = np.sort(angles)
+        gaps = np.diff(np.concatenate([angles, angles[:1] + 360]))
+        return float(360 - gaps.max())
+
+    def _candidates(self, points: np.ndarray, rng) -> Tuple[np.ndarray, np.ndarray]:
+        triples = points[rng.integers(0, len(points), size=(self.iterations, 3))]
+        (ax, ay), (bx, by), (qx, qy) = (triples[:, i].T for i in range(3))
+
+        d = 2 * (ax * (by - qy) + bx * (qy - ay) + qx * (ay - by))
+        valid = np.abs(d) > 1e-9
+        d = np.where(valid, d, 1.0)
+
+        a2, b2, q2 = ax**2 + ay**2, bx**2 + by**2, qx**2 + qy**2
+        ux = (a2 * (by - qy) + b2 * (qy - ay) + q2 * (ay - by)) / d
+        uy = (a2 * (qx - bx) + b2 * (ax - qx) + q2 * (bx - ax)) / d
+        r = np.hypot(ax - ux, ay - uy)
+
+        centers = np.column_stack([ux, uy])[valid]
+        return centers, r[valid]
+
+    def fit(self, points: np.ndarray) -> Optional[CircleEstimate]:
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(points) < self.min_points:
+            return None
+        if len(points) > self.max_points:
+            points = points[:: int(np.ceil(len(points) / self.max_points))]
+
+        rng = np.random.default_rng(self.seed)
+        centers, radii = self._candidates(points, rng)
+        if len(radii) == 0:
+            return None
+
+        # (candidates, points) distance of every point from every circle
+        distance = np.hypot(
+            points[None, :, 0] - centers[:, None, 0],
+            points[None, :, 1] - centers[:, None, 1],
+        )
+        inliers = np.abs(distance - radii[:, None]) <= (
+            self.inlier_tolerance * radii[:, None]
+        )
+        best = int(np.argmax(inliers.sum(axis=1)))
+        inlier_points = points[inliers[best]]
+        if len(inlier_points) < self.min_points:
+            return None
+
+        refined = self.least_squares(inlier_points)
+        if refined is None:
+            return None
+        cx, cy, radius = refined
+
+        residual = np.abs(np.hypot(*(points - [cx, cy]).T) - radius)
+        inlier_mask = residual <= self.inlier_tolerance * radius
+        if inlier_mask.sum() < self.min_points:
+            return None
+        arc = self.arc_coverage(points[inlier_mask], cx, cy)
+        if arc < self.min_arc:
+            return None
+
+        return CircleEstimate(
+            center_x=cx,
+            center_y=cy,
+            radius=radius,
+            inlier_ratio=float(inlier_mask.mean()),
+            arc=arc,
+        )
@@ -0,0 +1,13 @@
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import List
+
+
+class GaugeReadingFailed(BaseAppException):
+    def __init__(self, error_code: int, failures: List[str]):
+        self.error_code = error_code
+        self.failures = failures
+        self.message = (
+            f"Error: '{error_code}', Analog gauges could not be read: "
+            f"{'; '.join(failures)}"
+        )
+        super().__init__(self.message)
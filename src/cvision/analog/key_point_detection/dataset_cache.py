@@ -0,0 +1,257 @@
+"""
+Preprocessed, memory-mapped copy of a keypoint dataset split.
+
+KeypointImageDataSet decodes a PNG / JPEG, loads an .npy label and resizes
+both for every sample. build_dataset_cache does that once per split and
+writes the resized images (uint8) and label heatmaps (uint8, heatmap * 255,
+middle channel already merged) into contiguous .npy arrays.
+CachedKeypointDataSet reads them as memmaps - a sample or a whole batch is a
+slice, no decoding and no resize - and augments whole batches on tensors
+with augment_batch: rotation, zoom and crop as one affine grid_sample,
+brightness and contrast as broadcast arithmetic.
+
+augment_batch uses the probabilities and ranges of custom_transforms but is
+not the same distribution: angles and crop offsets are continuous instead of
+whole degrees / pixels, the geometry is resampled once instead of three
+times (sharper images and heatmaps), images and heatmaps are quantized to
+uint8 and a seed draws other augmentations. A model trained on the cache is
+therefore not bit-comparable to one trained on KeypointImageDataSet; the
+training scripts only use the cache when asked to (train_decoder.py
+--dataset-cache).
+
+Examples:
+    python src/cvision/analog/key_point_detection/dataset_cache.py \
+        --data training_data
+
+Writes <split>/cache for every split (train, val, test) of training_data.
+Layout of a cache directory:
+    images.npy    (n, h, w, 3) uint8 RGB
+    heatmaps.npy  (n, n_heatmaps, h, w) uint8
+    meta.json     names, input_size, n_heatmaps, sources
+
+sources is the source_digest of the image and label files; open_dataset_cache
+only returns a cache that still matches them.
+"""
+
+import argparse
+import json
+import math
+import os
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.utils.data import Dataset
+
+from cvision.analog.key_point_detection.feature_cache import source_digest
+from cvision.analog.key_point_detection.key_point_dataset import (
+    IMG_PATH,
+    LABEL_PATH,
+    TEST_PATH,
+    TRAIN_PATH,
+    VAL_PATH,
+    KeypointImageDataSet,
+)
+from cvision.analog.key_point_detection.model import INPUT_SIZE
+
+CACHE_PATH = "cache"
+IMAGES_FILE = "images.npy"
+HEATMAPS_FILE = "heatmaps.npy"
+META_FILE = "meta.json"
+
+# probabilities and ranges of custom_transforms in key_point_dataset.py
+AUGMENT_PROBABILITY = 0.9
+AUGMENT_ZOOM = 1.2
+AUGMENT_MAX_ANGLE = 180.0
+JITTER_PROBABILITY = 0.5
+JITTER_RANGE = (0.8, 1.2)
+
+
+def build_dataset_cache(dataset, directory):
+    """
+    Writes the unaugmented samples of `dataset` (KeypointImageDataSet) into
+    a cache at `directory`. The arrays are filled one sample at a time, the
+    split never has to fit into memory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    image, heatmaps = dataset.sample(0, augment=False, seed=0)
+    n, (height, width) = len(dataset), tuple(image.shape[-2:])
+
+    images = np.lib.format.open_memmap(
+        os.path.join(directory, IMAGES_FILE),
+        mode="w+",
+        dtype=np.uint8,
+        shape=(n, height, width, 3),
+    )
+    targets = np.lib.format.open_memmap(
+        os.path.join(directory, HEATMAPS_FILE),
+        mode="w+",
+        dtype=np.uint8,
+        shape=(n, heatmaps.shape[0], height, width),
+    )
+    for index in range(n):
+        image, heatmaps = dataset.sample(index, augment=False, seed=0)
+        images[index] = image.permute(1, 2, 0).mul(255).round().byte().numpy()
+        targets[index] = heatmaps.clamp(0, 1).mul(255).round().byte().numpy()
+    images.flush()
+    targets.flush()
+
+    meta = {
+        "names": [dataset.get_name(index) for index in range(n)],
+        "input_size": [height, width],
+        "n_heatmaps": int(targets.shape[1]),
+        "sources": source_digest(dataset.source_files()),
+    }
+    with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    print(f"[dataset_cache] wrote {n} samples to {directory}")
+
+
+def _affine_theta(angles, shifts, zoom):
+    """(B, 2, 3) sampling grids: rotate by `angles` (radians), zoom, shift."""
+    cos, sin = torch.cos(angles), torch.sin(angles)
+    rotation = torch.stack(
+        [torch.stack([cos, -sin], dim=-1), torch.stack([sin, cos], dim=-1)], dim=-2
+    )
+    translation = rotation @ shifts.unsqueeze(-1)
+    return torch.cat([rotation / zoom, translation], dim=-1)
+
+
+def augment_batch(images, heatmaps, generator=None):
+    """
+    Batch version of the augmentations of custom_transforms. images
+    (B, 3, H, W) and heatmaps (B, C, H, W) float in [0, 1]; per sample, with
+    AUGMENT_PROBABILITY, a random rotation, AUGMENT_ZOOM and a random crop
+    of the zoomed image, all sampled in one grid_sample for both tensors,
+    and with JITTER_PROBABILITY of those a brightness / contrast jitter.
+    """
+    batch = images.shape[0]
+
+    def uniform(low, high, size=(batch,)):
+        return torch.rand(size, generator=generator) * (high - low) + low
+
+    augmented = torch.rand(batch, generator=generator) < AUGMENT_PROBABILITY
+    if not augmented.any():
+        return images, heatmaps
+
+    max_angle = math.radians(AUGMENT_MAX_ANGLE)
+    angles = torch.where(augmented, uniform(-max_angle, max_angle), 0.0)
+    # the crop window moves inside the zoomed image, in normalized coordinates
+    max_shift = 1.0 - 1.0 / AUGMENT_ZOOM
+    shifts = uniform(-max_shift, max_shift, (batch, 2)) * augmented[:, None]
+    zoom = torch.where(augmented, AUGMENT_ZOOM, 1.0)[:, None, None]
+
+    theta = _affine_theta(angles, shifts, zoom).to(images.dtype)
+    grid = F.affine_grid(theta, list(images.shape), align_corners=False)
+    images = F.grid_sample(images, grid, mode="bilinear", align_corners=False)
+    heatmaps = F.grid_sample(heatmaps, grid, mode="bilinear", align_corners=False)
+
+    jitter = augmented & (torch.rand(batch, generator=generator) < JITTER_PROBABILITY)
+    brightness = torch.where(jitter, uniform(*JITTER_RANGE), 1.0)[:, None, None, None]
+    contrast = torch.where(jitter, uniform(*JITTER_RANGE), 1.0)[:, None, None, None]
+
+    images = (images * brightness).clamp_(0, 1)
+    # contrast around the mean gray value, like TF.adjust_contrast
+    gray = (0.299 * images[:, 0] + 0.587 * images[:, 1] + 0.114 * images[:, 2]).mean(
+        dim=(1, 2)
+    )[:, None, None, None]
+    images = ((images - gray) * contrast + gray).clamp_(0, 1)
+
+    return images, heatmaps
+
+
+class CachedKeypointDataSet(Dataset):
+    """
+    Samples of a build_dataset_cache directory. batch() reads many samples
+    with one slice of each memmap and augments them together; with a
+    DataLoader prefer a BatchSampler and batch() over per-sample collation.
+    """
+
+    def __init__(self, directory, train=False):
+        self.directory = directory
+        self.train = train
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.images = np.load(os.path.join(directory, IMAGES_FILE), mmap_mode="r")
+        self.heatmaps = np.load(os.path.join(directory, HEATMAPS_FILE), mmap_mode="r")
+        self.n_channels = self.meta["n_heatmaps"]
+
+    def __len__(self):
+        return self.images.shape[0]
+
+    def get_name(self, index):
+        return self.meta["names"][index]
+
+    def _read(self, indices):
+        # memmap fancy indexing reads best in file order
+        indices = np.asarray(indices)
+        order = np.argsort(indices)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        images = self.images[indices[order]][inverse]
+        heatmaps = self.heatmaps[indices[order]][inverse]
+
+        images = torch.from_numpy(images).permute(0, 3, 1, 2).float().div_(255.0)
+        heatmaps = torch.from_numpy(heatmaps).float().div_(255.0)
+        return images, heatmaps
+
+    def batch(self, indices, augment=None, generator=None):
+        """(images, heatmaps) of `indices`, augmented if training."""
+        images, heatmaps = self._read(indices)
+        if self.train if augment is None else augment:
+            images, heatmaps = augment_batch(images, heatmaps, generator)
+        return images, heatmaps
+
+    def sample(self, index, augment, seed):
+        """Same contract as KeypointImageDataSet.sample."""
+        generator = torch.Generator().manual_seed(seed)
+        images, heatmaps = self.batch([index], augment=augment, generator=generator)
+        return images[0], heatmaps[0]
+
+    def __getitem__(self, index):
+        images, heatmaps = self.batch([index])
+        return images[0], heatmaps[0]
+
+
+def open_dataset_cache(directory, dataset, train=False):
+    """
+    The cache at `directory` if it was built from the files of `dataset`
+    (KeypointImageDataSet) at the current input size, None if there is none
+    or it is stale.
+    """
+    if not os.path.exists(os.path.join(directory, META_FILE)):
+        return None
+
+    cached = CachedKeypointDataSet(directory, train=train)
+    expected = {
+        "input_size": list(INPUT_SIZE),
+        "n_heatmaps": dataset.n_channels,
+        "sources": source_digest(dataset.source_files()),
+    }
+    stale = [key for key, value in expected.items() if cached.meta.get(key) != value]
+    if len(cached) != len(dataset):
+        stale.append("names")
+    if stale:
+        print(f"[dataset_cache] {directory} is stale ({', '.join(stale)})")
+        return None
+    return cached
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the keypoint dataset cache")
+    parser.add_argument("--data", required=True, help="training_data directory")
+    parser.add_argument("--needle", action="store_true", help="Keep needle heatmaps")
+    args = parser.parse_args()
+
+    for split in (TRAIN_PATH, VAL_PATH, TEST_PATH):
+        img_dir = os.path.join(args.data, split, IMG_PATH)
+        if not os.path.isdir(img_dir):
+            continue
+        dataset = KeypointImageDataSet(
+            img_dir, os.path.join(args.data, split, LABEL_PATH), needle=args.needle
+        )
+        build_dataset_cache(dataset, os.path.join(args.data, split, CACHE_PATH))
+
+
+if __name__ == "__main__":
+    main()
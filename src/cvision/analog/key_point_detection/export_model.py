@@ -0,0 +1,78 @@
+"""
+Exports the keypoint model to a serialized CPU graph, so inference can skip
+building DINOv2 through torch.hub at startup.
+
+Examples:
+    python src/cvision/analog/key_point_detection/export_model.py
+    python src/cvision/analog/key_point_detection/export_model.py --runtime onnx
+    python src/cvision/analog/key_point_detection/export_model.py \
+        --input-size 224 --decode patch
+
+The exported file is written next to the checkpoint (exported_model_path) and
+picked up when cvision.yaml sets keypoints.runtime accordingly. The graph is
+fixed to the input size and decode mode it was exported with; they are
+written next to it (export_params_path) and inference falls back to the eager
+model when keypoints.input_size / keypoints.decode differ from them.
+"""
+
+import argparse
+
+from cvision.analog.key_point_detection.key_point_inference import (
+    DECODE_FULL,
+    DECODE_PATCH,
+)
+from cvision.analog.key_point_detection.model import (
+    INPUT_SIZE,
+    RUNTIME_ONNX,
+    RUNTIME_TORCHSCRIPT,
+    export_model,
+    exported_model_path,
+    load_model,
+)
+from cvision.registry.ModelRegistry import KEY_POINT_MODEL_PATH
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the keypoint model")
+    parser.add_argument(
+        "--model",
+        default=KEY_POINT_MODEL_PATH,
+        help=f"Checkpoint to export (default: {KEY_POINT_MODEL_PATH})",
+    )
+    parser.add_argument(
+        "--runtime",
+        choices=(RUNTIME_TORCHSCRIPT, RUNTIME_ONNX),
+        default=RUNTIME_TORCHSCRIPT,
+        help="Export format (default: torchscript)",
+    )
+    parser.add_argument(
+        "--input-size",
+        type=int,
+        default=INPUT_SIZE[0],
+        help=f"Square input size, multiple of 14 (default: {INPUT_SIZE[0]})",
+    )
+    parser.add_argument(
+        "--decode",
+        choices=(DECODE_FULL, DECODE_PATCH),
+        default=DECODE_FULL,
+        help="Heatmap resolution of the graph (default: full)",
+    )
+    args = parser.parse_args()
+
+    input_size = (args.input_size, args.input_size)
+    model = load_model(
+        args.model, input_size=input_size, upsample=args.decode == DECODE_FULL
+    )
+    out_path = exported_model_path(args.model, args.runtime)
+    export_model(
+        model,
+        out_path,
+        runtime=args.runtime,
+        input_size=input_size,
+        decode=args.decode,
+    )
+    print(f"[export_model] wrote {out_path}")
+
+
+if __name__ == "__main__":
+    main()
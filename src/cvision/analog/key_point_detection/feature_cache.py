@@ -0,0 +1,222 @@
+"""
+Memory-mapped store of frozen encoder features for decoder-only training.
+
+The DINOv2 encoder is frozen, so its patch features of an (image,
+augmentation) pair never change. build_feature_store runs every training
+image through the encoder once per variant - variant 0 unaugmented, the
+others with an augmentation drawn from a fixed seed - and writes the
+features (float16) and target heatmaps (uint8) into .npy files opened as
+memmaps. The decoder then trains from them without touching the backbone;
+refresh() re-draws the augmentation of a fraction of the entries between
+epochs so the head still sees new augmentations.
+
+Layout of a store directory:
+    features.npy     (entries, DINO_CHANNELS, h / 14, w / 14) float16
+    targets.npy      (entries, n_heatmaps, h, w) uint8, heatmap * 255
+    generations.npy  (entries,) int64, augmentation draw of each entry
+    meta.json        n_images, variants, seed, input_size, sources, dataset
+Entry e belongs to image e // variants, variant e % variants. sources is the
+source_digest of the image and label files, dataset the class the samples
+came from (the dataset cache augments differently); open_feature_store only
+reuses a store whose meta.json matches the current data and settings.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+FEATURES_FILE = "features.npy"
+TARGETS_FILE = "targets.npy"
+GENERATIONS_FILE = "generations.npy"
+META_FILE = "meta.json"
+
+
+def augmentation_seed(seed, index, generation):
+    """Seed of the augmentation of one entry, stable across runs."""
+    return int(np.random.SeedSequence([seed, index, generation]).generate_state(1)[0])
+
+
+def source_digest(paths):
+    """sha256 over name, size and mtime of every file, changes with any of them."""
+    sha = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(path)
+        sha.update(
+            f"{os.path.basename(path)}\t{stat.st_size}\t{stat.st_mtime_ns}\n".encode()
+        )
+    return sha.hexdigest()
+
+
+class FeatureStore:
+    def __init__(self, directory, mode="r"):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.n_images = self.meta["n_images"]
+        self.variants = self.meta["variants"]
+        self.seed = self.meta["seed"]
+
+        self.features = np.load(os.path.join(directory, FEATURES_FILE), mmap_mode=mode)
+        self.targets = np.load(os.path.join(directory, TARGETS_FILE), mmap_mode=mode)
+        self.generations = np.load(
+            os.path.join(directory, GENERATIONS_FILE), mmap_mode=mode
+        )
+
+    @classmethod
+    def create(
+        cls,
+        directory,
+        n_images,
+        variants,
+        feature_shape,
+        target_shape,
+        seed=0,
+        sources=None,
+        dataset=None,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        entries = n_images * variants
+        arrays = {
+            FEATURES_FILE: ((entries, *feature_shape), np.float16),
+            TARGETS_FILE: ((entries, *target_shape), np.uint8),
+            GENERATIONS_FILE: ((entries,), np.int64),
+        }
+        for name, (shape, dtype) in arrays.items():
+            array = np.lib.format.open_memmap(
+                os.path.join(directory, name), mode="w+", dtype=dtype, shape=shape
+            )
+            del array
+
+        meta = {
+            "n_images": n_images,
+            "variants": variants,
+            "seed": seed,
+            "input_size": list(target_shape[-2:]),
+            "sources": sources,
+            "dataset": dataset,
+        }
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return cls(directory, mode="r+")
+
+    def __len__(self):
+        return self.n_images * self.variants
+
+    def fill(self, dataset, encoder, entries, batch_size=8):
+        """
+        Encodes the given entries with their current generation. The encoder
+        is frozen, so it runs under inference_mode.
+        """
+        entries = list(entries)
+        for start in range(0, len(entries), batch_size):
+            chunk = entries[start : start + batch_size]
+            images, targets = [], []
+            for entry in chunk:
+                index, variant = divmod(entry, self.variants)
+                seed = augmentation_seed(self.seed, entry, int(self.generations[entry]))
+                image, target = dataset.sample(index, augment=variant > 0, seed=seed)
+                images.append(image)
+                targets.append(target)
+
+            with torch.inference_mode():
+                features = encoder(torch.stack(images))
+
+            self.features[chunk] = features.numpy().astype(np.float16)
+            self.targets[chunk] = (
+                torch.stack(targets).clamp(0, 1).mul(255).round().byte().numpy()
+            )
+
+    def refresh(self, dataset, encoder, fraction, rng, batch_size=8):
+        """
+        Draws a new augmentation for `fraction` of the augmented entries and
+        re-encodes them. Returns the refreshed entries.
+        """
+        augmented = np.array(
+            [e for e in range(len(self)) if e % self.variants > 0], dtype=np.int64
+        )
+        count = round(fraction * len(augmented))
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+
+        entries = np.sort(rng.choice(augmented, size=count, replace=False))
+        self.generations[entries] += 1
+        self.fill(dataset, encoder, entries.tolist(), batch_size=batch_size)
+        return entries
+
+    def flush(self):
+        for array in (self.features, self.targets, self.generations):
+            if isinstance(array, np.memmap):
+                array.flush()
+
+
+def build_feature_store(
+    dataset, encoder, directory, variants=4, seed=0, batch_size=8, sources=None
+):
+    """
+    Encodes every image of `dataset` (KeypointImageDataSet) in `variants`
+    versions into a new store at `directory`. `sources` (source_digest of the
+    files behind the dataset) is recorded for open_feature_store.
+    """
+    image, target = dataset.sample(0, augment=False, seed=0)
+    with torch.inference_mode():
+        feature_shape = tuple(encoder(image[None]).shape[1:])
+
+    store = FeatureStore.create(
+        directory,
+        n_images=len(dataset),
+        variants=variants,
+        feature_shape=feature_shape,
+        target_shape=tuple(target.shape),
+        seed=seed,
+        sources=sources,
+        dataset=type(dataset).__name__,
+    )
+    store.fill(dataset, encoder, range(len(store)), batch_size=batch_size)
+    store.flush()
+    print(f"[feature_cache] encoded {len(store)} entries into {directory}")
+    return store
+
+
+def open_feature_store(directory, dataset, variants, seed, input_size, sources):
+    """
+    The store at `directory` if it was built from `dataset` with the same
+    files (`sources`) and settings, None if there is none or it is stale.
+    """
+    if not os.path.exists(os.path.join(directory, META_FILE)):
+        return None
+
+    store = FeatureStore(directory, mode="r+")
+    expected = {
+        "n_images": len(dataset),
+        "variants": variants,
+        "seed": seed,
+        "input_size": list(input_size),
+        "sources": sources,
+        "dataset": type(dataset).__name__,
+    }
+    stale = [key for key, value in expected.items() if store.meta.get(key) != value]
+    if store.targets.shape[1] != dataset.n_channels:
+        stale.append("n_heatmaps")
+    if stale:
+        print(f"[feature_cache] {directory} is stale ({', '.join(stale)}), rebuilding")
+        return None
+    return store
+
+
+class CachedFeatureDataset(Dataset):
+    """(features, heatmaps) float tensors read straight from a FeatureStore."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, index):
+        features = torch.from_numpy(self.store.features[index].astype(np.float32))
+        targets = torch.from_numpy(self.store.targets[index].astype(np.float32))
+        return features, targets.div_(255.0)
@@ -8,7 +8,11 @@ from PIL import Image
 from torchvision import transforms
 import torchvision.transforms.functional as TF
 
-from cvision.analog.key_point_detection.model import INPUT_SIZE, N_HEATMAPS
+from cvision.analog.key_point_detection.model import (
+    INPUT_SIZE,
+    N_HEATMAPS,
+    N_NEEDLE_HEATMAPS,
+)
 
 # Constants
 
@@ -24,7 +28,21 @@ KEY_POINT_PREFIX = "K_"
 
 
 class KeypointImageDataSet(Dataset):
-    def __init__(self, img_dir, annotations_dir, train=False, val=False, debug=False):
+    """
+    Label files hold N_HEATMAPS (start, middle, end) heatmaps, with `needle`
+    they must also hold the N_NEEDLE_HEATMAPS needle heatmaps (tip, axis)
+    behind them.
+    """
+
+    def __init__(
+        self,
+        img_dir,
+        annotations_dir,
+        train=False,
+        val=False,
+        debug=False,
+        needle=False,
+    ):
         random.seed(0)
         self.img_dir = img_dir
         self.annotations_dir = annotations_dir
@@ -36,6 +54,7 @@ class KeypointImageDataSet(Dataset):
         self.val = val
 
         self.debug = debug
+        self.n_channels = N_HEATMAPS + (N_NEEDLE_HEATMAPS if needle else 0)
 
         assert len(self.image_files) == len(self.annotation_files)
 
@@ -43,6 +62,26 @@ class KeypointImageDataSet(Dataset):
         return len(self.image_files)
 
     def __getitem__(self, index):
+        image, transformed_image, transformed_annotation = self._load(
+            index, self.train, random
+        )
+
+        # Convert to tensors
+        if self.val:
+            return transformed_image, image, transformed_annotation
+        return transformed_image, transformed_annotation
+
+    def sample(self, index, augment, seed):
+        """
+        (image, annotation) tensors of one image with the augmentation drawn
+        from `seed`, the same seed gives the same sample.
+        """
+        _, transformed_image, transformed_annotation = self._load(
+            index, augment, random.Random(seed)
+        )
+        return transformed_image, transformed_annotation
+
+    def _load(self, index, augment, rng):
         image_path = os.path.join(self.img_dir, self.image_files[index])
         annotation_path = os.path.join(
             self.annotations_dir, self.annotation_files[index]
@@ -53,31 +92,44 @@ class KeypointImageDataSet(Dataset):
 
         # Load annotations
         annotations = np.load(annotation_path)
-        annotations_image = annotations_np_to_img(annotations)
+        if annotations.shape[0] < self.n_channels:
+            raise ValueError(
+                f"{annotation_path} has {annotations.shape[0]} heatmaps, "
+                f"{self.n_channels} expected"
+            )
+        annotations_tensor = annotations_np_to_tensor(annotations[: self.n_channels])
 
         transformed_image, transformed_annotation = custom_transforms(
-            self.train, image, annotations_image, self.debug
+            augment, image, annotations_tensor, self.debug, rng=rng
         )
 
+        # the key point heatmaps only, needle channels stay as they are
+        key_points = transformed_annotation[:N_HEATMAPS]
         if N_HEATMAPS == 1:
-            transformed_annotation = torch.max(
-                transformed_annotation, axis=0
-            ).values.unsqueeze(0)
+            key_points = torch.max(key_points, axis=0).values.unsqueeze(0)
         elif N_HEATMAPS == 3:
-            transformed_annotation[1, :, :] = torch.max(
-                transformed_annotation, axis=0
-            ).values
-
-        # Convert to tensors
-        if self.val:
-            return transformed_image, image, transformed_annotation
-        return transformed_image, transformed_annotation
+            key_points[1, :, :] = torch.max(key_points, axis=0).values
+        transformed_annotation = torch.cat(
+            [key_points, transformed_annotation[N_HEATMAPS:]]
+        )
+        return image, transformed_image, transformed_annotation
 
     def get_name(self, index):
         return self.image_files[index][:-4]
 
+    def source_files(self):
+        """Image and label paths, the files every sample is decoded from."""
+        return [os.path.join(self.img_dir, name) for name in self.image_files] + [
+            os.path.join(self.annotations_dir, name) for name in self.annotation_files
+        ]
+
 
-def custom_transforms(train, image, annotation=None, debug=False):
+def custom_transforms(train, image, annotation=None, debug=False, rng=random):
+    """
+    annotation is a (C, H, W) float tensor, any number of heatmaps; the same
+    geometric augmentations are applied to it as to the PIL image. The random
+    draws come from `rng` (the random module or a seeded random.Random).
+    """
 
     resize = transforms.Resize(INPUT_SIZE, transforms.InterpolationMode.BILINEAR)
     image = resize(image)
@@ -87,10 +139,10 @@ def custom_transforms(train, image, annotation=None, debug=False):
     toTensor = transforms.ToTensor()
     # random crop image and annotation
     if train:
-        if random.random() > 0.1:
+        if rng.random() > 0.1:
 
-            if random.random() > 0:
-                angle = random.randint(-180, 180)
+            if rng.random() > 0:
+                angle = rng.randint(-180, 180)
                 image = TF.rotate(image, angle)
                 annotation = TF.rotate(annotation, angle)
 
@@ -103,17 +155,17 @@ def custom_transforms(train, image, annotation=None, debug=False):
             image = resize(image)
             annotation = resize(annotation)
 
-            top = random.randint(0, new_size - INPUT_SIZE[0])
-            left = random.randint(0, new_size - INPUT_SIZE[0])
+            top = rng.randint(0, new_size - INPUT_SIZE[0])
+            left = rng.randint(0, new_size - INPUT_SIZE[0])
             image = TF.crop(image, top, left, INPUT_SIZE[0], INPUT_SIZE[1])
             annotation = TF.crop(annotation, top, left, INPUT_SIZE[0], INPUT_SIZE[1])
 
             if debug:
                 _plot_annotation_image(image, annotation)
 
-            if random.random() > 0.5:
-                brightness_factor = random.uniform(0.8, 1.2)
-                contrast_factor = random.uniform(0.8, 1.2)
+            if rng.random() > 0.5:
+                brightness_factor = rng.uniform(0.8, 1.2)
+                contrast_factor = rng.uniform(0.8, 1.2)
                 image = TF.adjust_brightness(image, brightness_factor)
                 image = TF.adjust_contrast(image, contrast_factor)
 
@@ -121,13 +173,14 @@ def custom_transforms(train, image, annotation=None, debug=False):
                     _plot_annotation_image(image, annotation)
 
     if annotation is not None:
-        return toTensor(image), toTensor(annotation)
+        return toTensor(image), annotation
     return toTensor(image)
 
 
 def _plot_annotation_image(image, annotation):
     image_np = np.asarray(image)
-    annotation_np = np.asarray(annotation)
+    # the first three heatmaps as RGB
+    annotation_np = (annotation[:3].permute(1, 2, 0).numpy() * 255).astype(np.uint8)
     mask = np.max(annotation_np, axis=2) < 0.99
     mask = np.stack([mask] * 3, axis=-1)
     merge = np.where(mask, image_np, annotation_np)
@@ -136,10 +189,8 @@ def _plot_annotation_image(image, annotation):
     merge_img.show()
 
 
-def annotations_np_to_img(annotations):
-    annotations = annotations.transpose(1, 2, 0)
-    annotations = (annotations * 255).astype(np.uint8)
-    return Image.fromarray(annotations, mode="RGB")
+def annotations_np_to_tensor(annotations):
+    return torch.from_numpy(np.ascontiguousarray(annotations, dtype=np.float32))
 
 
 # Debug code, to see augmentations
@@ -7,12 +7,14 @@ PCK_KEY = "Percentage of true where at least one predicted is close"
 NON_ASSIGNED_KEY = "Percentage non assigned predicted points"
 
 
-def full_key_point_extraction(heatmaps, threshold=0.5, bandwidth=20):
+def full_key_point_extraction(heatmaps, threshold=0.5, bandwidth=20, n_jobs=1):
     key_point_list = []
     for i in range(heatmaps.shape[0]):
         # middle
         if i == 1:
-            cluster_centers = extract_key_points(heatmaps[i], threshold, bandwidth)
+            cluster_centers = extract_key_points(
+                heatmaps[i], threshold, bandwidth, n_jobs=n_jobs
+            )
             key_point_list.append(cluster_centers)
         # start and end
         else:
@@ -21,6 +23,93 @@ def full_key_point_extraction(heatmaps, threshold=0.5, bandwidth=20):
     return key_point_list
 
 
+def fast_key_point_extraction(heatmaps, threshold=0.5, indices=(0, 2), window=3):
+    """
+    Peak based alternative to full_key_point_extraction for the single-point
+    heatmaps (start / end). Only the heatmaps in `indices` are processed, the
+    others stay empty. Per heatmap the argmax is refined to sub-pixel
+    precision by the weighted centroid of the (2 * window + 1)^2 neighbourhood,
+    counting only pixels above `threshold` of the peak value.
+
+    Returns the same layout as full_key_point_extraction: one array per
+    heatmap, (1, 2) as [[x, y]] for a found peak, (0, 2) otherwise.
+    """
+    n_maps, height, width = heatmaps.shape
+    key_point_list = [np.empty((0, 2)) for _ in range(n_maps)]
+
+    indices = [i for i in indices if 0 <= i < n_maps]
+    if not indices:
+        return key_point_list
+
+    maps = np.asarray(heatmaps[indices], dtype=np.float64)
+    flat_peak = maps.reshape(len(indices), -1).argmax(axis=1)
+    peak_y, peak_x = np.unravel_index(flat_peak, (height, width))
+    peak_value = maps[np.arange(len(indices)), peak_y, peak_x]
+
+    # neighbourhood of every peak, pixels outside the heatmap get no weight
+    offsets = np.arange(-window, window + 1)
+    ys = peak_y[:, None] + offsets[None, :]
+    xs = peak_x[:, None] + offsets[None, :]
+    inside = ((ys >= 0) & (ys < height))[:, :, None] & ((xs >= 0) & (xs < width))[
+        :, None, :
+    ]
+    patches = maps[
+        np.arange(len(indices))[:, None, None],
+        np.clip(ys, 0, height - 1)[:, :, None],
+        np.clip(xs, 0, width - 1)[:, None, :],
+    ]
+
+    weights = np.where(
+        inside & (patches > threshold * peak_value[:, None, None]), patches, 0.0
+    )
+    total = weights.sum(axis=(1, 2))
+
+    safe_total = np.where(total > 0, total, 1.0)
+    centroid_y = (weights.sum(axis=2) * ys).sum(axis=1) / safe_total
+    centroid_x = (weights.sum(axis=1) * xs).sum(axis=1) / safe_total
+
+    for slot, i in enumerate(indices):
+        if peak_value[slot] <= 0 or total[slot] <= 0:
+            continue
+        key_point_list[i] = np.array([[centroid_x[slot], centroid_y[slot]]])
+
+    return key_point_list
+
+
+def tick_key_points(heatmap, threshold=0.5):
+    """
+    (x, y) of every pixel of the tick heatmap above `threshold` of its peak,
+    the raw point cloud the dial circle is fitted to.
+    """
+    peak = np.max(heatmap)
+    if peak <= 0:
+        return np.empty((0, 2))
+    ys, xs = np.nonzero(heatmap > threshold * peak)
+    return np.column_stack([xs, ys]).astype(np.float64)
+
+
+def needle_key_points(tip_heatmap, axis_heatmap, threshold=0.5):
+    """
+    ([[x, y]] of the needle tip, (N, 2) pixels of the needle axis) from the
+    needle heatmaps, (0, 2) arrays where a heatmap is empty.
+    """
+    (tip,) = fast_key_point_extraction(tip_heatmap[None], threshold, indices=(0,))
+    return tip, tick_key_points(axis_heatmap, threshold)
+
+
+def heatmap_to_input_coordinates(key_point_list, heatmap_size, input_size):
+    """
+    Maps (x, y) key points from a (height, width) heatmap grid to the model
+    input. Heatmap cell i covers input pixels [i * s, (i + 1) * s) with
+    s = input / heatmap, its center is (i + 0.5) * s - 0.5 - the same mapping
+    the bilinear (align_corners=False) upsampling of the decoder uses.
+    """
+    scale = np.array([input_size[1] / heatmap_size[1], input_size[0] / heatmap_size[0]])
+    if np.allclose(scale, 1.0):
+        return key_point_list
+    return [(points + 0.5) * scale - 0.5 for points in key_point_list]
+
+
 def extract_start_end_points(heatmap, threshold):
     # normalize heatmap to range 0, 1
     heatmap = heatmap / np.max(heatmap)
@@ -37,7 +126,7 @@ def extract_start_end_points(heatmap, threshold):
     return cluster_center
 
 
-def extract_key_points(heatmap, threshold, bandwidth):
+def extract_key_points(heatmap, threshold, bandwidth, n_jobs=1):
 
     # normalize heatmap to range 0, 1
     heatmap = heatmap / np.max(heatmap)
@@ -48,7 +137,8 @@ def extract_key_points(heatmap, threshold, bandwidth):
     coords[:, [1, 0]] = coords[:, [0, 1]]
 
     # Perform mean shift clustering
-    ms = MeanShift(bandwidth=bandwidth, n_jobs=-1)
+    # n_jobs=-1 would start one job per core in every pool worker
+    ms = MeanShift(bandwidth=bandwidth, n_jobs=n_jobs)
     ms.fit(coords)
 
     # Plot results
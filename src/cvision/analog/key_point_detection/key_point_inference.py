@@ -1,32 +1,175 @@
 from PIL import Image
 import io
+import os
+import threading
+
+import cv2
+import numpy as np
+import torch
+import torch.nn.functional as F
 
 from cvision.analog.key_point_detection.key_point_extraction import (
+    fast_key_point_extraction,
     full_key_point_extraction,
+    heatmap_to_input_coordinates,
+)
+from cvision.analog.key_point_detection.model import (
+    INPUT_SIZE,
+    N_HEATMAPS,
+    RUNTIME_EAGER,
+    exported_model_path,
+    load_exported_model,
+    load_model,
+    read_export_params,
 )
-from cvision.analog.key_point_detection.model import load_model
-from cvision.analog.key_point_detection.key_point_dataset import custom_transforms
+
+# full: heatmaps upsampled to the input size by the decoder
+# patch: heatmaps on the native patch grid, peaks are mapped back analytically
+DECODE_FULL = "full"
+DECODE_PATCH = "patch"
 
 
 class KeyPointInference:
-    def __init__(self, model_path):
+    def __init__(
+        self,
+        model_path,
+        runtime=RUNTIME_EAGER,
+        input_size=INPUT_SIZE,
+        decode=DECODE_FULL,
+    ):
+
+        self.input_size = tuple(input_size)
+        self.decode = decode
+        self.runtime, self.model = self._load(model_path, runtime)
+
+        # preallocated model input, refilled in place and grown for larger batches
+        self._input = torch.empty(1, 3, *self.input_size)
+        self._input_np = self._input.numpy()
+        self._lock = threading.Lock()
 
-        self.model = load_model(model_path)
+    def _load(self, model_path, runtime):
+        if runtime != RUNTIME_EAGER:
+            path = exported_model_path(model_path, runtime)
+            # the graph is fixed to the parameters it was exported with
+            expected = {"input_size": list(self.input_size), "decode": self.decode}
+            if not os.path.exists(path):
+                print(f"[KeyPointInference] {path} not found")
+            elif read_export_params(path) != expected:
+                print(
+                    f"[KeyPointInference] {path} was exported with "
+                    f"{read_export_params(path)}, configured are {expected}"
+                )
+            else:
+                try:
+                    return runtime, load_exported_model(path, runtime)
+                except Exception as e:
+                    print(f"[KeyPointInference] {runtime} model unusable: {e}")
+            print("[KeyPointInference] falling back to the eager model")
+
+        return RUNTIME_EAGER, load_model(
+            model_path,
+            input_size=self.input_size,
+            upsample=self.decode == DECODE_FULL,
+        )
 
     def predict_heatmaps(self, image_bytes: bytes):
 
         img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        image_t = custom_transforms(train=False, image=img)
-        image_t = image_t.unsqueeze(0)
 
-        heatmaps = self.model(image_t)
+        return self.predict_heatmaps_from_array(np.asarray(img))
+
+    def predict_heatmaps_from_array(self, image) -> np.ndarray:
+        """
+        image: RGB uint8 ndarray (H, W, 3) or float tensor (3, H, W) in [0, 1].
+        No encode / decode, at most one resize to the input size.
+        """
+        return self.predict_heatmaps_batch([image])[0]
+
+    def predict_heatmaps_batch(self, images) -> np.ndarray:
+        """
+        Runs all images (e.g. every gauge of a frame) in one forward pass.
+        Returns (N, N_HEATMAPS, h, w), (h, w) is the input size or the patch
+        grid depending on the decode mode.
+        """
+        if len(images) == 0:
+            return np.empty((0, 0, *self.input_size), dtype=np.float32)
+
+        with self._lock, torch.inference_mode():
+            batch = self._batch_input(len(images))
+            for i, image in enumerate(images):
+                self._fill(image, i)
+            heatmaps = self.model(batch)
+
+        return heatmaps.numpy()
+
+    def prepare_input(self, image) -> torch.Tensor:
+        """Resizes and scales the image into the preallocated (1, 3, H, W) tensor."""
+        batch = self._batch_input(1)
+        self._fill(image, 0)
+        return batch
+
+    def _batch_input(self, n: int) -> torch.Tensor:
+        if n > self._input.shape[0]:
+            self._input = torch.empty(n, 3, *self.input_size)
+            self._input_np = self._input.numpy()
+        return self._input[:n]
+
+    def _fill(self, image, index: int) -> None:
+        height, width = self.input_size
+
+        if isinstance(image, torch.Tensor):
+            image_t = image.unsqueeze(0) if image.dim() == 3 else image
+            if image_t.dtype == torch.uint8:
+                image_t = image_t.float().div_(255.0)
+            if tuple(image_t.shape[-2:]) != (height, width):
+                image_t = F.interpolate(
+                    image_t.float(),
+                    size=(height, width),
+                    mode="bilinear",
+                    align_corners=False,
+                    antialias=True,
+                )
+            self._input[index].copy_(image_t[0])
+            return
+
+        if image.shape[:2] != (height, width):
+            shrink = image.shape[0] > height or image.shape[1] > width
+            image = cv2.resize(
+                image,
+                dsize=(width, height),
+                interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LINEAR,
+            )
+
+        # HWC -> CHW and the scaling to [0, 1] in one pass into the buffer
+        scale = 255.0 if image.dtype == np.uint8 else 1.0
+        np.divide(
+            image.transpose(2, 0, 1), scale, out=self._input_np[index], casting="unsafe"
+        )
+
 
-        heatmaps = heatmaps.detach().squeeze(0).numpy()
+EXTRACTION_FAST = "fast"
+EXTRACTION_CLUSTER = "cluster"
 
-        return heatmaps
 
+def detect_key_points(
+    heatmaps, n_jobs=1, mode=EXTRACTION_CLUSTER, input_size=None, bandwidth=20
+):
+    # fast: argmax + sub-pixel centroid of start / end only
+    # cluster: KMeans / MeanShift over all heatmaps (accuracy mode)
+    # key points are returned in input_size coordinates, heatmaps smaller than
+    # the input (patch decode) are mapped back analytically
+    # needle channels of a decoder with needle head are not key points
+    heatmaps = heatmaps[:N_HEATMAPS]
+    heatmap_size = heatmaps.shape[-2:]
+    input_size = heatmap_size if input_size is None else input_size
 
-def detect_key_points(heatmaps):
-    key_point_list = full_key_point_extraction(heatmaps, 0.6)
+    if mode == EXTRACTION_FAST:
+        key_point_list = fast_key_point_extraction(heatmaps, 0.6, indices=(0, 2))
+    else:
+        # bandwidth is given in input pixels
+        grid_bandwidth = bandwidth * heatmap_size[1] / input_size[1]
+        key_point_list = full_key_point_extraction(
+            heatmaps, 0.6, bandwidth=grid_bandwidth, n_jobs=n_jobs
+        )
 
-    return key_point_list
+    return heatmap_to_input_coordinates(key_point_list, heatmap_size, input_size)
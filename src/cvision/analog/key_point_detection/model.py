@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 from torch import nn
@@ -10,11 +11,32 @@ DINOV2_WEIGHTS_ENV = "DINOV2_WEIGHTS"
 DEFAULT_DINOV2_WEIGHTS = DINOV2_SUBMODULE_PATH / "checkpoints" / "dinov2_vits14.pth"
 
 N_HEATMAPS = 3
+# optional needle channels the decoder appends behind the key point heatmaps
+N_NEEDLE_HEATMAPS = 2
+HEATMAP_START = 0
+HEATMAP_TICKS = 1
+HEATMAP_END = 2
+HEATMAP_NEEDLE_TIP = 3
+HEATMAP_NEEDLE_AXIS = 4
 N_CHANNELS = 50  # Number of intermediate channels for Nonlinearity
+# training resolution, the deployed size is gauge_canvas.size in cvision.yaml
 INPUT_SIZE = (448, 448)
+PATCH_SIZE = 14
 
 DINO_CHANNELS = 384
 
+# eager builds the model through torch.hub, the exported runtimes load a
+# serialized graph next to the checkpoint (see export_model.py)
+RUNTIME_EAGER = "eager"
+RUNTIME_TORCHSCRIPT = "torchscript"
+RUNTIME_ONNX = "onnx"
+RUNTIMES = (RUNTIME_EAGER, RUNTIME_TORCHSCRIPT, RUNTIME_ONNX)
+
+EXPORTED_SUFFIXES = {
+    RUNTIME_TORCHSCRIPT: ".torchscript.pt",
+    RUNTIME_ONNX: ".onnx",
+}
+
 
 def _resolve_weights_path() -> Path:
     """Get local weights path from env or default location."""
@@ -61,8 +83,8 @@ class Encoder(nn.Module):
         B, C, H, W = x.shape
         with torch.no_grad():
             x = self.model.forward_features(x)["x_norm_patchtokens"]
-        width_out = W // 14
-        height_out = H // 14
+        width_out = W // PATCH_SIZE
+        height_out = H // PATCH_SIZE
         return (
             x.reshape(B, height_out, width_out, DINO_CHANNELS)
             .detach()
@@ -71,20 +93,44 @@ class Encoder(nn.Module):
 
 
 class Decoder(nn.Module):
-    def __init__(self, n_input_channels, n_inter_channels, out_size, n_heatmaps):
+    def __init__(
+        self,
+        n_input_channels,
+        n_inter_channels,
+        out_size,
+        n_heatmaps,
+        n_needle_heatmaps=0,
+    ):
         super().__init__()
-        self.upsampling = nn.Sequential(
-            nn.Upsample(size=out_size, mode="bilinear", align_corners=False),
-            nn.Sigmoid(),
-        )
+        # out_size None keeps the heatmaps on the patch grid (H / 14, W / 14)
+        if out_size is None:
+            self.upsampling = nn.Sigmoid()
+        else:
+            self.upsampling = nn.Sequential(
+                nn.Upsample(size=out_size, mode="bilinear", align_corners=False),
+                nn.Sigmoid(),
+            )
         self.heatmaphead = nn.Sequential(
             nn.Conv2d(n_input_channels, n_inter_channels, (1, 1), bias=True),
             nn.ReLU(),
             nn.Conv2d(n_inter_channels, n_heatmaps, (1, 1), bias=True),
         )
+        # needle tip / needle axis on the same features, a separate head so
+        # checkpoints without it load unchanged and it can be trained alone
+        self.needlehead = None
+        if n_needle_heatmaps:
+            self.needlehead = nn.Sequential(
+                nn.Conv2d(n_input_channels, n_inter_channels, (1, 1), bias=True),
+                nn.ReLU(),
+                nn.Conv2d(n_inter_channels, n_needle_heatmaps, (1, 1), bias=True),
+            )
 
     def forward(self, x):
         processed_features = self.heatmaphead(x)
+        if self.needlehead is not None:
+            processed_features = torch.cat(
+                [processed_features, self.needlehead(x)], dim=1
+            )
         heatmap = self.upsampling(processed_features)
         return heatmap
 
@@ -101,12 +147,122 @@ class EncoderDecoder(nn.Module):
         return x
 
 
-def load_model(model_path):
+def has_needle_head(state_dict):
+    return any(key.startswith("decoder.needlehead.") for key in state_dict)
+
+
+def load_model(model_path, input_size=INPUT_SIZE, upsample=True, needle_head=None):
+    """
+    needle_head None builds the decoder the checkpoint was trained with,
+    True adds a freshly initialised needle head to a key point checkpoint
+    (to train it), False drops it.
+    """
+    # DDP-saved checkpoints require weights_only=False starting in PyTorch 2.6
+    state_dict = torch.load(model_path, weights_only=False)
+    stored_needle_head = has_needle_head(state_dict)
+    if needle_head is None:
+        needle_head = stored_needle_head
+    if not needle_head:
+        state_dict = {
+            key: value
+            for key, value in state_dict.items()
+            if not key.startswith("decoder.needlehead.")
+        }
+
     encoder = Encoder(pretrained=False)
     n_feature_channels = encoder.get_number_output_channels()
-    decoder = Decoder(n_feature_channels, N_CHANNELS, INPUT_SIZE, N_HEATMAPS)
+    out_size = tuple(input_size) if upsample else None
+    decoder = Decoder(
+        n_feature_channels,
+        N_CHANNELS,
+        out_size,
+        N_HEATMAPS,
+        n_needle_heatmaps=N_NEEDLE_HEATMAPS if needle_head else 0,
+    )
 
     model = EncoderDecoder(encoder, decoder)
-    # DDP-saved checkpoints require weights_only=False starting in PyTorch 2.6
-    model.load_state_dict(torch.load(model_path, weights_only=False))
+    model.load_state_dict(state_dict, strict=stored_needle_head or not needle_head)
     return model
+
+
+def exported_model_path(model_path, runtime):
+    """key_point_model.pt -> key_point_model.torchscript.pt / key_point_model.onnx"""
+    root, _ = os.path.splitext(model_path)
+    return root + EXPORTED_SUFFIXES[runtime]
+
+
+def export_params_path(exported_path):
+    """key_point_model.onnx -> key_point_model.onnx.json"""
+    return exported_path + ".json"
+
+
+def read_export_params(exported_path):
+    """Parameters written by export_model, None if there are none."""
+    path = export_params_path(exported_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_model(
+    model,
+    out_path,
+    runtime=RUNTIME_TORCHSCRIPT,
+    batch_size=1,
+    input_size=INPUT_SIZE,
+    decode=None,
+):
+    """
+    Serializes the eval graph; the batch dimension stays dynamic, the input
+    size is fixed to the one it was exported with. The input size and the
+    decode mode of the graph are written to export_params_path(out_path).
+    """
+    model.eval()
+    dummy = torch.zeros(batch_size, 3, *input_size)
+
+    with torch.no_grad():
+        if runtime == RUNTIME_TORCHSCRIPT:
+            traced = torch.jit.trace(model, dummy)
+            torch.jit.save(traced, out_path)
+        elif runtime == RUNTIME_ONNX:
+            torch.onnx.export(
+                model,
+                dummy,
+                out_path,
+                input_names=["image"],
+                output_names=["heatmaps"],
+                dynamic_axes={"image": {0: "batch"}, "heatmaps": {0: "batch"}},
+                opset_version=17,
+            )
+        else:
+            raise ValueError(f"Unknown export runtime: {runtime}")
+
+    params = {"input_size": list(input_size), "decode": decode}
+    with open(export_params_path(out_path), "w", encoding="utf-8") as f:
+        json.dump(params, f)
+    return out_path
+
+
+class OnnxModel:
+    """Callable wrapper so an onnxruntime session behaves like the torch model."""
+
+    def __init__(self, path):
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(
+            path, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        (heatmaps,) = self.session.run(None, {self.input_name: x.numpy()})
+        return torch.from_numpy(heatmaps)
+
+
+def load_exported_model(path, runtime):
+    if runtime == RUNTIME_TORCHSCRIPT:
+        return torch.jit.load(path, map_location="cpu").eval()
+    if runtime == RUNTIME_ONNX:
+        return OnnxModel(path)
+    raise ValueError(f"Unknown export runtime: {runtime}")
@@ -0,0 +1,216 @@
+"""
+Trains only the keypoint Decoder from cached encoder features.
+
+The frozen DINOv2 encoder runs once per (image, augmentation) while the
+feature store is built (feature_cache.py); every epoch after that is 1x1
+convolutions on the cached patch features, minutes on a CPU instead of hours
+of ViT forward passes.
+
+Examples:
+    python src/cvision/analog/key_point_detection/train_decoder.py \
+        --data training_data --cache feature_cache --epochs 30
+    python src/cvision/analog/key_point_detection/train_decoder.py \
+        --data training_data --cache feature_cache --variants 8 --refresh 0.25 \
+        --init path/to/key_point_model.pt --needle
+
+--data is the training_data directory of the README (train/images,
+train/labels). An existing store in --cache is reused if it was built from
+the same image and label files (names, sizes, mtimes) with the same
+--variants, --seed and input size, --rebuild re-encodes it. With
+--dataset-cache the images come from the dataset cache of dataset_cache.py
+(train/cache) if it matches the files; its batch augmentation is close to,
+but not the same as, custom_transforms (see dataset_cache.py). The result is
+a full EncoderDecoder checkpoint that load_model reads.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import torch
+from torch import nn
+from torch.utils.data import DataLoader
+
+from cvision.analog.key_point_detection.dataset_cache import (
+    CACHE_PATH,
+    open_dataset_cache,
+)
+from cvision.analog.key_point_detection.feature_cache import (
+    CachedFeatureDataset,
+    build_feature_store,
+    open_feature_store,
+    source_digest,
+)
+from cvision.analog.key_point_detection.key_point_dataset import (
+    IMG_PATH,
+    LABEL_PATH,
+    TRAIN_PATH,
+    KeypointImageDataSet,
+)
+from cvision.analog.key_point_detection.model import (
+    INPUT_SIZE,
+    N_CHANNELS,
+    N_HEATMAPS,
+    Decoder,
+    Encoder,
+    EncoderDecoder,
+)
+
+
+def train_decoder(
+    decoder,
+    store,
+    epochs,
+    learning_rate=3e-4,
+    batch_size=16,
+    refresh=0.0,
+    dataset=None,
+    encoder=None,
+    seed=0,
+):
+    """
+    Adam on the BCE of the decoder heatmaps against the cached targets, the
+    learning rate decays by 5% per epoch. With `refresh` > 0 that fraction
+    of the augmented entries is re-drawn and re-encoded (needs `dataset` and
+    `encoder`) before every epoch but the first. Returns the mean loss per
+    epoch.
+    """
+    if refresh > 0 and (dataset is None or encoder is None):
+        raise ValueError("refreshing augmentations needs the dataset and encoder")
+
+    rng = np.random.default_rng(seed)
+    generator = torch.Generator().manual_seed(seed)
+    optimizer = torch.optim.Adam(decoder.parameters(), lr=learning_rate)
+    scheduler = torch.optim.lr_scheduler.ExponentialLR(optimizer, gamma=0.95)
+    criterion = nn.BCELoss()
+
+    losses = []
+    for epoch in range(epochs):
+        if epoch > 0 and refresh > 0:
+            refreshed = store.refresh(dataset, encoder, refresh, rng)
+            print(f"[train_decoder] re-encoded {len(refreshed)} augmentations")
+
+        loader = DataLoader(
+            CachedFeatureDataset(store),
+            batch_size=batch_size,
+            shuffle=True,
+            generator=generator,
+        )
+        decoder.train()
+        total, count = 0.0, 0
+        for features, targets in loader:
+            optimizer.zero_grad()
+            loss = criterion(decoder(features), targets)
+            loss.backward()
+            optimizer.step()
+            total += loss.item() * len(features)
+            count += len(features)
+        scheduler.step()
+
+        losses.append(total / max(count, 1))
+        print(f"[train_decoder] epoch {epoch + 1}/{epochs} loss {losses[-1]:.5f}")
+
+    decoder.eval()
+    return losses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train the keypoint decoder")
+    parser.add_argument("--data", required=True, help="training_data directory")
+    parser.add_argument("--cache", required=True, help="Feature store directory")
+    parser.add_argument("--out", default="key_point_model.pt", help="Checkpoint")
+    parser.add_argument("--init", help="Checkpoint to start the decoder from")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--learning-rate", type=float, default=3e-4)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=4,
+        help="Cached versions per image, the first unaugmented (default: 4)",
+    )
+    parser.add_argument(
+        "--refresh",
+        type=float,
+        default=0.0,
+        help="Fraction of augmentations re-drawn per epoch (default: 0)",
+    )
+    parser.add_argument("--needle", action="store_true", help="Train a needle head")
+    parser.add_argument("--rebuild", action="store_true", help="Re-encode the cache")
+    parser.add_argument(
+        "--dataset-cache",
+        action="store_true",
+        help="Read the images from train/cache of dataset_cache.py, "
+        "augmented with augment_batch instead of custom_transforms",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = KeypointImageDataSet(
+        os.path.join(args.data, TRAIN_PATH, IMG_PATH),
+        os.path.join(args.data, TRAIN_PATH, LABEL_PATH),
+        train=True,
+        needle=args.needle,
+    )
+    sources = source_digest(dataset.source_files())
+    if args.dataset_cache:
+        dataset_cache = os.path.join(args.data, TRAIN_PATH, CACHE_PATH)
+        cached = open_dataset_cache(dataset_cache, dataset, train=True)
+        if cached is not None:
+            dataset = cached
+        else:
+            print(f"[train_decoder] no usable {dataset_cache}, decoding images")
+    encoder = Encoder(pretrained=False)
+
+    store = None
+    if not args.rebuild:
+        store = open_feature_store(
+            args.cache,
+            dataset,
+            variants=args.variants,
+            seed=args.seed,
+            input_size=INPUT_SIZE,
+            sources=sources,
+        )
+    if store is None:
+        store = build_feature_store(
+            dataset,
+            encoder,
+            args.cache,
+            variants=args.variants,
+            seed=args.seed,
+            sources=sources,
+        )
+
+    n_heatmaps = store.targets.shape[1]
+    decoder = Decoder(
+        encoder.get_number_output_channels(),
+        N_CHANNELS,
+        tuple(store.targets.shape[-2:]),
+        N_HEATMAPS,
+        n_needle_heatmaps=n_heatmaps - N_HEATMAPS,
+    )
+    model = EncoderDecoder(encoder, decoder)
+    if args.init:
+        state_dict = torch.load(args.init, weights_only=False)
+        model.load_state_dict(state_dict, strict=False)
+
+    train_decoder(
+        decoder,
+        store,
+        args.epochs,
+        learning_rate=args.learning_rate,
+        batch_size=args.batch_size,
+        refresh=args.refresh,
+        dataset=dataset,
+        encoder=encoder,
+        seed=args.seed,
+    )
+    store.flush()
+
+    torch.save(model.state_dict(), args.out)
+    print(f"[train_decoder] wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
-import cv2
 import cv2.aruco as aruco
-import numpy as np
+from common.imports.Typing import List, Tuple
 from credentials.manager.SettingsManager import SettingsManager
+from cvision.frame.Frame import Frame
+from common.tracing.InspectionTrace import trace_span
 
 
 class ArUcoIDExtraktor:
@@ -14,19 +15,28 @@ class ArUcoIDExtraktor:
         self.parameters = aruco.DetectorParameters()
         self.detector = aruco.ArucoDetector(self.aruco_dict, self.parameters)
 
-    def get_id(self, image_bytes: bytes) -> int | None:
+    def get_markers(self, frame: Frame) -> List[Tuple[int, Tuple[float, float]]]:
+        """(id, (center_x, center_y)) of every marker in the frame."""
 
-        np_arr = np.frombuffer(image_bytes, dtype=np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
+        gray = frame.gray
+        with trace_span("aruco"):
+            corners, ids, _ = self.detector.detectMarkers(gray)
 
-        if image is None:
-            return None
+        if ids is None:
+            return []
 
-        _, ids, _ = self.detector.detectMarkers(image)
+        markers = []
+        for marker_id, marker_corners in zip(ids.flatten().tolist(), corners):
+            center_x, center_y = marker_corners.reshape(-1, 2).mean(axis=0)
+            markers.append((int(marker_id), (float(center_x), float(center_y))))
 
-        if ids is None:
-            return None
+        return markers
 
-        ids = ids.flatten().tolist()
+    def get_id(self, frame: Frame) -> int | None:
+
+        markers = self.get_markers(frame=frame)
+
+        if not markers:
+            return None
 
-        return ids[0]
+        return markers[0][0]
@@ -4,11 +4,13 @@ from dataclasses import dataclass
 from pathlib import Path
 from common.imports.Typing import Optional, Tuple, List
 from datetime import datetime
-import os
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
+
+from cvision.frame.Frame import Frame
+from cvision.registry.ModelRegistry import ModelRegistry, DISPLAY_MODEL_PATH
+from common.tracing.InspectionTrace import trace_span
 
 
 # ---------- Byte utils ----------
@@ -27,8 +29,8 @@ def jpg_bytes_from_bgr(img_bgr: np.ndarray, quality: int = 95) -> bytes:
     return buf.tobytes()
 
 
-def sharpness_quality_0_1(img_bgr: np.ndarray) -> float:
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+def sharpness_quality_0_1(img: np.ndarray) -> float:
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     lap_var = cv2.Laplacian(gray, cv2.CV_64F).var()
     return min(lap_var / 500.0, 1.0)
 
@@ -41,10 +43,16 @@ class CropResult:
     cls_id: int
     conf: float
     bbox_xyxy: Tuple[int, int, int, int]  # x1,y1,x2,y2
-    crop_bytes: bytes
+    crop_frame: Frame
     crop_content_type: str
     crop_format: str
     quality_image: float
+    jpeg_quality: int = 95
+
+    @property
+    def crop_bytes(self) -> bytes:
+        # encoded lazily, only when the crop is persisted / debug-written
+        return self.crop_frame.encode(".jpg", quality=self.jpeg_quality)
 
 
 # ---------- DebugWriter ----------
@@ -143,15 +151,13 @@ class YoloDisplayCropper:
 
     def __init__(
         self,
-        model_path: str = os.path.join(
-            os.getcwd(), "src/cvision/digital/models/display_cropper.pt"
-        ),
+        model_path: str = DISPLAY_MODEL_PATH,
         conf: float = 0.30,
         jpeg_quality: int = 95,
         debug: Optional[DebugWriter] = None,
         verbose: bool = True,
     ):
-        self._model = YOLO(model_path)
+        self._model_path = model_path
         self._conf = conf
         self._jpeg_q = jpeg_quality
         self._debug = debug
@@ -165,18 +171,30 @@ class YoloDisplayCropper:
             if debug is not None:
                 print(f"[YoloDisplayCropper] debug_out_dir={debug.out_dir}")
 
+    @property
+    def _model(self):
+        return ModelRegistry().get_yolo_model(self._model_path)
+
     def crop_from_bytes(
         self, raw_image_bytes: bytes, source_name: str = "raw"
     ) -> List[CropResult]:
+        return self.crop_from_frame(
+            Frame.from_bytes(raw_image_bytes, source_name=source_name)
+        )
+
+    def crop_from_frame(self, frame: Frame) -> List[CropResult]:
+        source_name = frame.source_name
         if self._verbose:
             print(
-                f"\n[YoloDisplayCropper] crop_from_bytes source={source_name} bytes={len(raw_image_bytes)}"
+                f"\n[YoloDisplayCropper] crop_from_frame source={source_name} shape={frame.shape}"
             )
 
-        img = bgr_from_bytes(raw_image_bytes)
+        img = frame.bgr
 
         # YOLO inference
-        res = self._model(img, conf=self._conf)[0]
+        model = self._model
+        with trace_span("display_yolo"):
+            res = model(img, conf=self._conf)[0]
 
         if self._verbose:
             num_boxes = 0 if res.boxes is None else len(res.boxes)
@@ -219,8 +237,8 @@ class YoloDisplayCropper:
                     )
                 continue
 
-            q_img = sharpness_quality_0_1(crop_bgr)
-            crop_bytes = jpg_bytes_from_bgr(crop_bgr, quality=self._jpeg_q)
+            crop_frame = Frame.from_array(crop_bgr, source_name=source_name)
+            q_img = sharpness_quality_0_1(crop_frame.gray)
 
             cr = CropResult(
                 source_name=source_name,
@@ -228,17 +246,18 @@ class YoloDisplayCropper:
                 cls_id=cls_id,
                 conf=conf,
                 bbox_xyxy=(x1, y1, x2, y2),
-                crop_bytes=crop_bytes,
+                crop_frame=crop_frame,
                 crop_content_type="image/jpeg",
                 crop_format="jpg",
                 quality_image=q_img,
+                jpeg_quality=self._jpeg_q,
             )
             crops.append(cr)
 
             if self._verbose:
                 print(
                     f"[YoloDisplayCropper] crop idx={idx} cls={cls_id} "
-                    f"conf={conf:.3f} q_img={q_img:.3f} bytes={len(crop_bytes)}"
+                    f"conf={conf:.3f} q_img={q_img:.3f} shape={crop_bgr.shape}"
                 )
 
             if self._debug:
@@ -6,7 +6,10 @@ import re
 
 import cv2
 import numpy as np
-import easyocr
+
+from cvision.frame.Frame import Frame
+from cvision.registry.ModelRegistry import ModelRegistry
+from common.tracing.InspectionTrace import trace_span
 
 NUM_RE = re.compile(r"-?\d+(?:[\.,]\d+)?")
 
@@ -82,15 +85,21 @@ class EasyOcrDisplayValueReader:
         gpu: bool = False,
         verbose: bool = False,
     ):
-        self._reader = easyocr.Reader(languages, gpu=gpu)
+        self._languages = languages
+        self._gpu = gpu
         self._verbose = verbose
 
+    @property
+    def _reader(self):
+        return ModelRegistry().get_ocr_reader(languages=self._languages, gpu=self._gpu)
+
     def _ocr_text(self, img: np.ndarray) -> tuple[str, list[str]]:
         best_joined = ""
         best_len = 0
         best_texts: list[str] = []
         for proc in _preprocess_variants(img):
-            res = self._reader.readtext(proc)
+            with trace_span("easyocr"):
+                res = self._reader.readtext(proc)
             t = [tx for _, tx, conf in res if conf >= 0.08]
             joined = " ".join(t).lower()
             if len(joined) > best_len:
@@ -108,7 +117,8 @@ class EasyOcrDisplayValueReader:
         allowlist = "0123456789.,-"
 
         for proc in _preprocess_variants(img):
-            res = self._reader.readtext(proc, allowlist=allowlist)
+            with trace_span("easyocr"):
+                res = self._reader.readtext(proc, allowlist=allowlist)
             raw_text = [t for _, t, _ in res]
 
             for _, text, conf in res:
@@ -200,7 +210,14 @@ class EasyOcrDisplayValueReader:
     def read_from_crop_bytes(
         self, crop_jpg_bytes: bytes, fallback_cls_id: Optional[int] = None
     ) -> OcrValueResult:
-        img = bgr_from_jpg_bytes(crop_jpg_bytes)
+        return self.read_from_frame(
+            Frame.from_bytes(crop_jpg_bytes), fallback_cls_id=fallback_cls_id
+        )
+
+    def read_from_frame(
+        self, frame: Frame, fallback_cls_id: Optional[int] = None
+    ) -> OcrValueResult:
+        img = frame.bgr
 
         display_type, title_text, title_raw = self._classify_display(img)
 
@@ -0,0 +1,154 @@
+import threading
+
+import cv2
+import numpy as np
+
+from common.imports.Typing import Any, Callable, Dict, MatLike, Optional, Tuple
+from common.tracing.InspectionTrace import trace_span
+from cvision.frame.exceptions.FrameDecodingFailed import FrameDecodingFailed
+from cvision.frame.exceptions.FrameEncodingFailed import FrameEncodingFailed
+
+
+class Frame:
+    """
+    Decoded image shared by all pipeline stages.
+
+    The encoded source is decoded at most once; derived views (grayscale,
+    RGB, resized copies, tensors, encodings) are computed lazily and memoized,
+    so every stage that needs the same view reuses it.
+    """
+
+    def __init__(
+        self,
+        image: Optional[MatLike] = None,
+        encoded: Optional[bytes] = None,
+        source_name: str = "raw",
+    ) -> None:
+        if image is None and encoded is None:
+            raise ValueError("Frame needs either a decoded image or encoded bytes")
+
+        self._image = image
+        self._encoded = encoded
+        self.source_name = source_name
+        self._views: Dict[Tuple, Any] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_bytes(cls, image_bytes: bytes, source_name: str = "raw") -> "Frame":
+        return cls(encoded=image_bytes, source_name=source_name)
+
+    @classmethod
+    def from_array(cls, image: MatLike, source_name: str = "raw") -> "Frame":
+        return cls(image=image, source_name=source_name)
+
+    def _view(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        value = self._views.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            value = self._views.get(key)
+            if value is None:
+                value = compute()
+                self._views[key] = value
+            return value
+
+    @property
+    def bgr(self) -> MatLike:
+        if self._image is None:
+            with self._lock:
+                if self._image is None:
+                    with trace_span("decode"):
+                        img_array = np.frombuffer(self._encoded, dtype=np.uint8)
+                        image = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+                    if image is None:
+                        raise FrameDecodingFailed(error_code=1792400410)
+                    self._image = image
+        return self._image
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._image is not None
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.bgr.shape
+
+    @property
+    def height(self) -> int:
+        return self.bgr.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.bgr.shape[1]
+
+    @property
+    def gray(self) -> MatLike:
+        return self._view(("gray",), lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2GRAY))
+
+    @property
+    def rgb(self) -> MatLike:
+        return self._view(("rgb",), lambda: cv2.cvtColor(self.bgr, cv2.COLOR_BGR2RGB))
+
+    def resized(
+        self,
+        size: Tuple[int, int],
+        interpolation: int = cv2.INTER_LINEAR,
+        rgb: bool = False,
+    ) -> MatLike:
+        """Returns the frame resized to (width, height), optionally as RGB."""
+        size = (int(size[0]), int(size[1]))
+
+        def _compute():
+            source = self.rgb if rgb else self.bgr
+            if (source.shape[1], source.shape[0]) == size:
+                return source
+            return cv2.resize(source, dsize=size, interpolation=interpolation)
+
+        return self._view(("resized", size, interpolation, rgb), _compute)
+
+    def rgb_tensor(
+        self, size: Tuple[int, int], interpolation: int = cv2.INTER_LINEAR
+    ) -> Any:
+        """Returns a float CHW tensor in [0, 1] of the RGB frame resized to size."""
+
+        def _compute():
+            import torch
+
+            resized = self.resized(size, interpolation=interpolation, rgb=True)
+            tensor = torch.from_numpy(np.ascontiguousarray(resized))
+            return tensor.permute(2, 0, 1).float().div_(255.0)
+
+        return self._view(("rgb_tensor", tuple(size), interpolation), _compute)
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> "Frame":
+        # a copy, drawing on the crop must not change the persisted frame
+        return Frame.from_array(
+            self.bgr[y1:y2, x1:x2].copy(), source_name=self.source_name
+        )
+
+    def encode(self, ext: Optional[str] = None, quality: Optional[int] = None) -> bytes:
+        """
+        Encodes the frame for persistence. Without an extension the original
+        bytes are returned untouched if the frame was created from bytes,
+        otherwise PNG is used.
+        """
+        if ext is None:
+            if self._encoded is not None:
+                return self._encoded
+            ext = ".png"
+
+        def _compute():
+            params = []
+            if quality is not None:
+                if ext in (".jpg", ".jpeg"):
+                    params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+                elif ext == ".webp":
+                    params = [int(cv2.IMWRITE_WEBP_QUALITY), int(quality)]
+
+            success, encoded_img = cv2.imencode(ext, self.bgr, params)
+            if not success:
+                raise FrameEncodingFailed(error_code=1792400420, ext=ext)
+            return encoded_img.tobytes()
+
+        return self._view(("encoded", ext, quality), _compute)
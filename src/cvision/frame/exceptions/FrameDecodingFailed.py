@@ -0,0 +1,8 @@
+from common.exceptions.BaseAppException import BaseAppException
+
+
+class FrameDecodingFailed(BaseAppException):
+    def __init__(self, error_code: int):
+        self.error_code = error_code
+        self.message = f"Error: '{error_code}', Image bytes could not be decoded"
+        super().__init__(self.message)
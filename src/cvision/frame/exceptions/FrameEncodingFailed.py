@@ -0,0 +1,9 @@
+from common.exceptions.BaseAppException import BaseAppException
+
+
+class FrameEncodingFailed(BaseAppException):
+    def __init__(self, error_code: int, ext: str):
+        self.error_code = error_code
+        self.ext = ext
+        self.message = f"Error: '{error_code}', Image could not be encoded as '{ext}'"
+        super().__init__(self.message)
@@ -0,0 +1,113 @@
+import os
+import threading
+
+import numpy as np
+
+from common.imports.Typing import Any, Callable, Dict, List, Optional, Tuple
+from cvision.registry.exceptions.ModelLoadError import ModelLoadError
+
+ANALOG_GAUGE_MODEL_PATH = os.path.join(
+    os.getcwd(), "src/cvision/analog/models/analog_gauge_detection_model.pt"
+)
+DISPLAY_MODEL_PATH = os.path.join(
+    os.getcwd(), "src/cvision/digital/models/display_cropper.pt"
+)
+KEY_POINT_MODEL_PATH = "src/cvision/analog/models/key_point_model.pt"
+OCR_LANGUAGES = ["en", "de"]
+
+
+class ModelRegistry:
+    """
+    Process-wide owner of all heavyweight models (YOLO croppers, DINOv2 keypoint
+    model, EasyOCR). Every model is loaded lazily exactly once per process and
+    the same instance is handed out to every caller.
+    """
+
+    _instance = None
+    # warm_up runs on a background thread while request handlers construct
+    # the registry too
+    _instance_lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        with self._instance_lock:
+            if getattr(self, "_initialized", False):
+                return
+
+            self._lock = threading.RLock()
+            self._models: Dict[Tuple, Any] = {}
+            self._initialized = True
+
+    def _get_or_load(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                try:
+                    model = loader()
+                except Exception as e:
+                    raise ModelLoadError(
+                        exception=e, error_code=1792314010, model=str(key)
+                    )
+                self._models[key] = model
+            return model
+
+    def is_loaded(self, key: Tuple) -> bool:
+        return key in self._models
+
+    def get_yolo_model(self, model_path: str) -> Any:
+        def _load():
+            from ultralytics import YOLO
+
+            return YOLO(model_path)
+
+        return self._get_or_load(("yolo", model_path), _load)
+
+    def get_key_point_detector(self, model_path: str = KEY_POINT_MODEL_PATH) -> Any:
+        def _load():
+            from cvision.analog.KeyPointDetector import KeyPointDetector
+
+            return KeyPointDetector(key_point_model_path=model_path)
+
+        return self._get_or_load(("key_point", model_path), _load)
+
+    def get_ocr_reader(
+        self, languages: Optional[List[str]] = None, gpu: bool = False
+    ) -> Any:
+        languages = languages or OCR_LANGUAGES
+
+        def _load():
+            import easyocr
+
+            return easyocr.Reader(languages, gpu=gpu)
+
+        return self._get_or_load(("easyocr", tuple(languages), gpu), _load)
+
+    def warm_up(self, run_inference: bool = True) -> None:
+        """Loads every default model and optionally runs one dummy inference each."""
+        analog_model = self.get_yolo_model(ANALOG_GAUGE_MODEL_PATH)
+        display_model = self.get_yolo_model(DISPLAY_MODEL_PATH)
+        key_point_detector = self.get_key_point_detector()
+        ocr_reader = self.get_ocr_reader()
+
+        if not run_inference:
+            return
+
+        dummy = np.zeros((640, 640, 3), dtype=np.uint8)
+        analog_model(dummy, verbose=False)
+        display_model(dummy, verbose=False)
+        key_point_detector.warm_up()
+        ocr_reader.readtext(dummy[:64, :64, 0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+
+from common.imports.Typing import Any, Dict, List, Optional, Tuple
+from credentials.configs.enum.ConfigEnum import ConfigEnum
+from credentials.manager.SettingsManager import SettingsManager
+from cvision.registry.ModelRegistry import (
+    ANALOG_GAUGE_MODEL_PATH,
+    DISPLAY_MODEL_PATH,
+    KEY_POINT_MODEL_PATH,
+)
+
+# bump when a code change alters readings for unchanged models and configs
+PIPELINE_VERSION = "1"
+
+CONFIG_PATHS = [str(ConfigEnum.SENSOR_KEYS_CONFIG), str(ConfigEnum.CVISION_CONFIG)]
+
+_CHUNK_SIZE = 1 << 20
+
+# (path, size, mtime_ns) -> sha256, model files are only re-hashed after a change
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """sha256 of the file content, 'missing' if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is not None:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+
+    with _digests_lock:
+        _digests[key] = digest
+    return digest
+
+
+def key_point_settings() -> Dict[str, Any]:
+    """Resolved keypoints.* settings, input_size after the canvas fallback."""
+    settings_manager = SettingsManager()
+    return {
+        "runtime": settings_manager.getKeyPointRuntime(),
+        "input_size": settings_manager.getKeyPointInputSize(),
+        "decode": settings_manager.getKeyPointDecode(),
+        "extraction": settings_manager.getKeyPointExtractionMode(),
+    }
+
+
+def key_point_model_paths(runtime: str) -> List[str]:
+    """The checkpoint and, for torchscript / onnx, the graph exported from it."""
+    from cvision.analog.key_point_detection.model import (
+        RUNTIME_EAGER,
+        exported_model_path,
+    )
+
+    if runtime == RUNTIME_EAGER:
+        return [KEY_POINT_MODEL_PATH]
+    return [KEY_POINT_MODEL_PATH, exported_model_path(KEY_POINT_MODEL_PATH, runtime)]
+
+
+def pipeline_fingerprint(
+    model_paths: Optional[List[str]] = None,
+    config_paths: Optional[List[str]] = None,
+    key_points: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Identifies the models and configs a reading was produced with. Any change
+    of a model file (including the exported keypoint graph of the configured
+    runtime), of sensors.yaml (score functions, ranges, angles), of
+    cvision.yaml or of the resolved keypoint settings yields a different
+    fingerprint.
+    """
+    key_points = key_point_settings() if key_points is None else key_points
+    if model_paths is None:
+        model_paths = [
+            ANALOG_GAUGE_MODEL_PATH,
+            DISPLAY_MODEL_PATH,
+            *key_point_model_paths(key_points["runtime"]),
+        ]
+    config_paths = CONFIG_PATHS if config_paths is None else config_paths
+
+    sha = hashlib.sha256(PIPELINE_VERSION.encode())
+    for path in [*model_paths, *config_paths]:
+        sha.update(os.path.basename(path).encode())
+        sha.update(file_digest(path).encode())
+    for name, value in sorted(key_points.items()):
+        sha.update(f"{name}={value}".encode())
+    return sha.hexdigest()
+
+
+def content_hash(image_data: bytes) -> str:
+    return hashlib.sha256(image_data).hexdigest()
@@ -0,0 +1,10 @@
+from common.exceptions.BaseAppException import BaseAppException
+
+
+class ModelLoadError(BaseAppException):
+    def __init__(self, exception: Exception, error_code: int, model: str):
+        self.exception = exception
+        self.error_code = error_code
+        self.model = model
+        self.message = f"Error: '{error_code}', Model '{model}' could not be loaded, Exception: '{exception}'"
+        super().__init__(self.message)
@@ -10,20 +10,101 @@ from db.opcua.exceptions.OPCUARepositoryError import OPCUARepositoryError
 from db.mapping.input.RawImageMapper import RawImageDTO
 from db.mapping.input.AnalyzedImageMapper import AnalyzedImageDTO
 from db.mapping.input.AnomalyMapper import AnomalyDTO
+from db.mapping.input.InspectionTraceMapper import InspectionTraceDTO
+from db.mapping.input.InspectionCacheMapper import InspectionCacheDTO
+from db.mapping.input.GaugeCalibrationMapper import GaugeCalibrationDTO
 from db.mapping.output.OPCUANodeMapper import OPCUADTO
 
+from db.dal.WriteBehindQueue import WriteBehindQueue
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import Callable, Optional
+from common.tracing.InspectionTrace import trace_span
+from concurrent.futures import Future
+
 
 class DataAccessLayer:
-    def __init__(self):
-        pass
+    """
+    With `write_behind=True` the *_async inserts are queued and persisted by a
+    background writer (see WriteBehindQueue); everything still pending is
+    flushed on __exit__. Without it the *_async inserts run synchronously and
+    return an already completed future.
+    """
+
+    def __init__(
+        self,
+        write_behind: bool = False,
+        max_pending: int = 64,
+        batch_size: int = 16,
+        upload_workers: int = 4,
+    ):
+        self.write_behind = write_behind
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.upload_workers = upload_workers
+        self.write_queue: Optional[WriteBehindQueue] = None
 
     def __enter__(self):
         self.meta_repository = MetaRepository()
         self.opcua_repository = OPCUARepository()
+        if self.write_behind:
+            self.write_queue = WriteBehindQueue(
+                meta_repository=self.meta_repository,
+                max_pending=self.max_pending,
+                batch_size=self.batch_size,
+                upload_workers=self.upload_workers,
+            )
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        pass
+        if self.write_queue is None:
+            return
+
+        write_queue, self.write_queue = self.write_queue, None
+        try:
+            write_queue.close()
+        except DataAccessLayerError:
+            # do not mask the exception that is already propagating
+            if exc_type is None:
+                raise
+
+    def flush(self) -> None:
+        if self.write_queue is not None:
+            self.write_queue.flush()
+
+    def _run_sync(self, insert: Callable[[], int]) -> Future:
+        future = Future()
+        try:
+            future.set_result(insert())
+        except (Exception, BaseAppException) as e:
+            future.set_exception(e)
+        return future
+
+    def insert_raw_image_async(self, raw_image_with_metadata: RawImageDTO) -> Future:
+        if self.write_queue is None:
+            return self._run_sync(
+                lambda: self.insert_raw_image(
+                    raw_image_with_metadata=raw_image_with_metadata
+                )
+            )
+        return self.write_queue.submit_raw_image(dto=raw_image_with_metadata)
+
+    def insert_analyzed_image_async(
+        self, anaylzed_image_with_metadata: AnalyzedImageDTO
+    ) -> Future:
+        if self.write_queue is None:
+            return self._run_sync(
+                lambda: self.insert_analyzed_image(
+                    anaylzed_image_with_metadata=anaylzed_image_with_metadata
+                )
+            )
+        return self.write_queue.submit_analyzed_image(dto=anaylzed_image_with_metadata)
+
+    def insert_anomaly_async(self, anomaly_with_metadata: AnomalyDTO) -> Future:
+        if self.write_queue is None:
+            return self._run_sync(
+                lambda: self.insert_anomaly(anomaly_with_metadata=anomaly_with_metadata)
+            )
+        return self.write_queue.submit_anomaly(dto=anomaly_with_metadata)
 
     def create_object_name(self, name: str, format: str) -> str:
         return f"{name}.{format}"
@@ -39,15 +120,17 @@ class DataAccessLayer:
                 format=raw_image_with_metadata.format,
             )
 
-            id, name = self.meta_repository.insert_raw_image_metadata(
-                metadata=raw_image_with_metadata
-            )
+            with trace_span("sqlite_insert"):
+                id, name = self.meta_repository.insert_raw_image_metadata(
+                    metadata=raw_image_with_metadata
+                )
 
-            self.media_repository.put_media(
-                object_name=object_name,
-                image_data=raw_image_with_metadata.image_data,
-                content_type=raw_image_with_metadata.content_type,
-            )
+            with trace_span("minio_upload"):
+                self.media_repository.put_media(
+                    object_name=object_name,
+                    image_data=raw_image_with_metadata.image_data,
+                    content_type=raw_image_with_metadata.content_type,
+                )
             return id
         except MetaRepositoryError as e:
             raise DataAccessLayerError(exception=e, error_code=1761502460)
@@ -69,15 +152,17 @@ class DataAccessLayer:
                 format=anaylzed_image_with_metadata.format,
             )
 
-            id, name = self.meta_repository.insert_analyzed_image_metadata(
-                metadata=anaylzed_image_with_metadata
-            )
+            with trace_span("sqlite_insert"):
+                id, name = self.meta_repository.insert_analyzed_image_metadata(
+                    metadata=anaylzed_image_with_metadata
+                )
 
-            self.media_repository.put_media(
-                object_name=object_name,
-                image_data=anaylzed_image_with_metadata.image_data,
-                content_type=anaylzed_image_with_metadata.content_type,
-            )
+            with trace_span("minio_upload"):
+                self.media_repository.put_media(
+                    object_name=object_name,
+                    image_data=anaylzed_image_with_metadata.image_data,
+                    content_type=anaylzed_image_with_metadata.content_type,
+                )
 
             return id
 
@@ -90,7 +175,8 @@ class DataAccessLayer:
 
     def insert_anomaly(self, anomaly_with_metadata: AnomalyDTO) -> None:
         try:
-            self.meta_repository.insert_anomaly(metadata=anomaly_with_metadata)
+            with trace_span("sqlite_insert"):
+                self.meta_repository.insert_anomaly(metadata=anomaly_with_metadata)
         except MetaRepositoryError as e:
             raise DataAccessLayerError(exception=e, error_code=1762882020)
         except Exception as e:
@@ -98,10 +184,82 @@ class DataAccessLayer:
 
     def get_value_from_opcua_node(self, opcua_node_id: str) -> OPCUADTO:
         try:
-            return self.opcua_repository.get_node_value_by_id(
-                opcua_node_id=opcua_node_id
-            )
+            with trace_span("opcua_read"):
+                return self.opcua_repository.get_node_value_by_id(
+                    opcua_node_id=opcua_node_id
+                )
         except OPCUARepositoryError as e:
             raise DataAccessLayerError(exception=e, error_code=1762858740)
         except Exception as e:
             raise DataAccessLayerError(exception=e, error_code=1762858750)
+
+    def insert_inspection_trace(self, trace_with_metadata: InspectionTraceDTO) -> None:
+        if self.write_queue is not None:
+            # persisted once the writes and uploads of the inspection are done
+            self.write_queue.submit_inspection_trace(dto=trace_with_metadata)
+            return
+
+        try:
+            self.meta_repository.insert_inspection_trace(metadata=trace_with_metadata)
+        except MetaRepositoryError as e:
+            raise DataAccessLayerError(exception=e, error_code=1792580210)
+        except Exception as e:
+            raise DataAccessLayerError(exception=e, error_code=1792580220)
+
+    def get_cached_inspection(
+        self, content_hash: str, fingerprint: str
+    ) -> Optional[InspectionCacheDTO]:
+        """
+        Returns the stored result of an earlier analysis of the same bytes with
+        the same models and configs and counts the hit, None otherwise.
+        """
+        try:
+            with trace_span("cache_lookup"):
+                cached = self.meta_repository.get_inspection_cache(
+                    content_hash=content_hash, fingerprint=fingerprint
+                )
+                if cached is not None:
+                    self.meta_repository.record_inspection_cache_hit(cache_id=cached.id)
+            return cached
+        except MetaRepositoryError as e:
+            raise DataAccessLayerError(exception=e, error_code=1792601310)
+        except Exception as e:
+            raise DataAccessLayerError(exception=e, error_code=1792601320)
+
+    def insert_inspection_cache(self, cache_with_metadata: InspectionCacheDTO) -> None:
+        # synchronous in both modes: the referenced rows are committed already,
+        # the caller waited for their ids
+        try:
+            with trace_span("sqlite_insert"):
+                self.meta_repository.insert_inspection_cache(
+                    metadata=cache_with_metadata
+                )
+        except MetaRepositoryError as e:
+            raise DataAccessLayerError(exception=e, error_code=1792601330)
+        except Exception as e:
+            raise DataAccessLayerError(exception=e, error_code=1792601340)
+
+    def get_gauge_calibration(
+        self, aruco_id: int, category: str
+    ) -> Optional[GaugeCalibrationDTO]:
+        try:
+            return self.meta_repository.get_gauge_calibration(
+                aruco_id=aruco_id, category=category
+            )
+        except MetaRepositoryError as e:
+            raise DataAccessLayerError(exception=e, error_code=1792611210)
+        except Exception as e:
+            raise DataAccessLayerError(exception=e, error_code=1792611220)
+
+    def upsert_gauge_calibration(
+        self, calibration_with_metadata: GaugeCalibrationDTO
+    ) -> None:
+        try:
+            with trace_span("sqlite_insert"):
+                self.meta_repository.upsert_gauge_calibration(
+                    metadata=calibration_with_metadata
+                )
+        except MetaRepositoryError as e:
+            raise DataAccessLayerError(exception=e, error_code=1792611230)
+        except Exception as e:
+            raise DataAccessLayerError(exception=e, error_code=1792611240)
@@ -0,0 +1,278 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from common.exceptions.BaseAppException import BaseAppException
+from common.imports.Typing import Any, Dict, List, Optional
+from common.tracing.InspectionTrace import InspectionTrace, trace_span
+from db.dal.exceptions.DataAccessLayerError import DataAccessLayerError
+from db.mapping.input.AnalyzedImageMapper import AnalyzedImageDTO
+from db.mapping.input.AnomalyMapper import AnomalyDTO
+from db.mapping.input.InspectionTraceMapper import InspectionTraceDTO
+from db.mapping.input.RawImageMapper import RawImageDTO
+from db.media.repository.MediaRepository import MediaRepository
+from db.meta.repository.MetaRepository import MetaRepository
+
+RAW_IMAGE = "raw_image"
+ANALYZED_IMAGE = "analyzed_image"
+ANOMALY = "anomaly"
+INSPECTION_TRACE = "inspection_trace"
+
+
+@dataclass
+class _WriteJob:
+    kind: str
+    dto: Any
+    future: Future = field(default_factory=Future)
+    row_id: Optional[int] = None
+    # trace of the submitting inspection, the writer threads record into it
+    trace: Optional[InspectionTrace] = field(default_factory=InspectionTrace.current)
+
+
+class WriteBehindQueue:
+    """
+    Decouples persistence from the CV pipeline.
+
+    Jobs are put into a bounded queue (put blocks while it is full) and drained
+    by one writer thread. The writer inserts up to `batch_size` metadata rows in
+    a single SQLite transaction, resolves each job's future with the row id and
+    hands the image upload to a thread pool. The number of uploads in flight is
+    bounded as well, so image bytes cannot pile up in memory.
+
+    Upload errors cannot be reported through the future (the id is already
+    handed out), they are collected and raised by `flush()`.
+
+    An inspection trace is written as soon as every write and upload its
+    inspection submitted has finished (successfully or not), so the spans of
+    the deferred writes are included and nothing is held until close().
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        meta_repository: MetaRepository,
+        max_pending: int = 64,
+        batch_size: int = 16,
+        upload_workers: int = 4,
+    ):
+        self.meta_repository = meta_repository
+        self.batch_size = batch_size
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._upload_slots = threading.BoundedSemaphore(max_pending)
+        self._uploader = ThreadPoolExecutor(
+            max_workers=upload_workers, thread_name_prefix="minio-upload"
+        )
+        self._uploads: set[Future] = set()
+        self._uploads_lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._closed = False
+        # id(trace) -> unfinished jobs of the trace / its waiting trace job
+        self._open_jobs: Dict[int, int] = {}
+        self._waiting_traces: Dict[int, _WriteJob] = {}
+        self._traces_lock = threading.Lock()
+
+        self._writer = threading.Thread(
+            target=self._run, name="write-behind", daemon=True
+        )
+        self._writer.start()
+
+    def submit_raw_image(self, dto: RawImageDTO) -> Future:
+        return self._submit(_WriteJob(kind=RAW_IMAGE, dto=dto))
+
+    def submit_analyzed_image(self, dto: AnalyzedImageDTO) -> Future:
+        return self._submit(_WriteJob(kind=ANALYZED_IMAGE, dto=dto))
+
+    def submit_anomaly(self, dto: AnomalyDTO) -> Future:
+        return self._submit(_WriteJob(kind=ANOMALY, dto=dto))
+
+    def submit_inspection_trace(self, dto: InspectionTraceDTO) -> Future:
+        """Written once the jobs of the current trace submitted so far finished."""
+        trace = InspectionTrace.current()
+        job = _WriteJob(kind=INSPECTION_TRACE, dto=dto, trace=None)
+        with self._traces_lock:
+            if trace is not None and self._open_jobs.get(id(trace), 0) > 0:
+                self._waiting_traces[id(trace)] = job
+                return job.future
+        return self._submit(job)
+
+    def _submit(self, job: _WriteJob) -> Future:
+        if self._closed:
+            raise DataAccessLayerError(
+                exception=RuntimeError("write-behind queue is closed"),
+                error_code=1792501010,
+            )
+        if job.trace is not None:
+            with self._traces_lock:
+                key = id(job.trace)
+                self._open_jobs[key] = self._open_jobs.get(key, 0) + 1
+        # blocks while the queue is full -> backpressure on the producer
+        self._queue.put(job)
+        return job.future
+
+    def _finish(self, job: _WriteJob) -> Optional[_WriteJob]:
+        """Counts `job` as done, returns the trace job it released, if any."""
+        if job.trace is None:
+            return None
+        key = id(job.trace)
+        with self._traces_lock:
+            self._open_jobs[key] -= 1
+            if self._open_jobs[key] > 0:
+                return None
+            del self._open_jobs[key]
+            return self._waiting_traces.pop(key, None)
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is self._STOP:
+                self._queue.task_done()
+                return
+
+            batch = [first]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is self._STOP:
+                    stop = True
+                    break
+                batch.append(job)
+
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if stop:
+                self._queue.task_done()
+                return
+
+    def _write_batch(self, batch: List[_WriteJob]) -> None:
+        inserted: List[_WriteJob] = []
+        failed: List[_WriteJob] = []
+        try:
+            with self.meta_repository.transaction() as cursor:
+                for job in batch:
+                    try:
+                        with trace_span("sqlite_insert", trace=job.trace):
+                            job.row_id = self._insert_metadata(job, cursor)
+                        inserted.append(job)
+                    except (Exception, BaseAppException) as e:
+                        self._fail(
+                            job,
+                            DataAccessLayerError(exception=e, error_code=1792501020),
+                        )
+                        failed.append(job)
+        except (Exception, BaseAppException) as e:
+            # the transaction was rolled back, none of the ids exist
+            for job in inserted:
+                self._fail(
+                    job, DataAccessLayerError(exception=e, error_code=1792501030)
+                )
+            failed.extend(inserted)
+            inserted = []
+
+        finished = list(failed)
+        for job in inserted:
+            job.future.set_result(job.row_id)
+            if job.kind in (RAW_IMAGE, ANALYZED_IMAGE):
+                self._schedule_upload(job)
+            else:
+                finished.append(job)
+
+        # written right away, the writer must not put into its own queue
+        released = [trace_job for trace_job in map(self._finish, finished) if trace_job]
+        if released:
+            self._write_batch(released)
+
+    def _fail(self, job: _WriteJob, error: DataAccessLayerError) -> None:
+        job.future.set_exception(error)
+        if job.kind == INSPECTION_TRACE:
+            # nobody waits on a trace future
+            self._errors.append(error)
+
+    def _insert_metadata(self, job: _WriteJob, cursor) -> int:
+        if job.kind == RAW_IMAGE:
+            row_id, _ = self.meta_repository.insert_raw_image_metadata(
+                metadata=job.dto, cursor=cursor
+            )
+        elif job.kind == ANALYZED_IMAGE:
+            row_id, _ = self.meta_repository.insert_analyzed_image_metadata(
+                metadata=job.dto, cursor=cursor
+            )
+        elif job.kind == ANOMALY:
+            row_id = self.meta_repository.insert_anomaly(
+                metadata=job.dto, cursor=cursor
+            )
+        else:
+            row_id = self.meta_repository.insert_inspection_trace(
+                metadata=job.dto, cursor=cursor
+            )
+        return row_id
+
+    def _schedule_upload(self, job: _WriteJob) -> None:
+        self._upload_slots.acquire()
+        upload = self._uploader.submit(self._upload, job.dto, job.trace)
+        with self._uploads_lock:
+            self._uploads.add(upload)
+        upload.add_done_callback(lambda done: self._upload_done(done, job))
+
+    def _upload(self, dto: Any, trace: Optional[InspectionTrace]) -> None:
+        try:
+            with trace_span("minio_upload", trace=trace):
+                MediaRepository(bucket_name=dto.bucket).put_media(
+                    object_name=f"{dto.name}.{dto.format}",
+                    image_data=dto.image_data,
+                    content_type=dto.content_type,
+                )
+        except (Exception, BaseAppException) as e:
+            self._errors.append(
+                DataAccessLayerError(exception=e, error_code=1792501040)
+            )
+
+    def _upload_done(self, upload: Future, job: _WriteJob) -> None:
+        # the slot first, the writer may wait for it while the queue is full
+        self._upload_slots.release()
+        trace_job = self._finish(job)
+        if trace_job is not None:
+            self._queue.put(trace_job)
+        # last, flush() waits until the released trace job is queued
+        with self._uploads_lock:
+            self._uploads.discard(upload)
+
+    def pending(self) -> int:
+        with self._uploads_lock:
+            return self._queue.qsize() + len(self._uploads)
+
+    def flush(self) -> None:
+        """Blocks until every queued row is committed and every upload finished."""
+        while True:
+            self._queue.join()
+            with self._uploads_lock:
+                uploads = list(self._uploads)
+            if not uploads:
+                break
+            # finished uploads may queue the trace of their inspection
+            wait(uploads)
+
+        if self._errors:
+            errors, self._errors = self._errors, []
+            print(f"[WriteBehindQueue] {len(errors)} upload(s) failed")
+            raise errors[0]
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._queue.put(self._STOP)
+            self._writer.join()
+            self._uploader.shutdown(wait=True)
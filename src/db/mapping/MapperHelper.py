@@ -19,6 +19,8 @@ class MapperHelper:
                 return "image/bmp"
             elif detected == "tiff":
                 return "image/tiff"
+            elif detected == "webp":
+                return "image/webp"
             else:
                 return "application/octet-stream"
 
@@ -36,6 +38,8 @@ class MapperHelper:
                 return "bmp"
             elif detected == "tiff":
                 return "tiff"
+            elif detected == "webp":
+                return "webp"
             else:
                 return "bin"
 
@@ -0,0 +1,79 @@
+from dataclasses import asdict, dataclass
+
+from common.imports.Typing import Any, Dict
+
+
+@dataclass
+class GaugeCalibrationDTO:
+
+    aruco_id: int
+    category: str
+    center_x: int
+    center_y: int
+    radius: int
+    min_angle: float
+    max_angle: float
+    image_width: int
+    image_height: int
+
+    def __post_init__(self):
+        for field_name, field_value in self.to_dict().items():
+            if field_value is None:
+                raise ValueError(f"Field '{field_name}' must not be None")
+
+        for field_name in (
+            "aruco_id",
+            "center_x",
+            "center_y",
+            "radius",
+            "image_width",
+            "image_height",
+        ):
+            if not isinstance(getattr(self, field_name), int):
+                raise TypeError(f"'{field_name}' must be an integer")
+
+        if not isinstance(self.category, str):
+            raise TypeError("'category' must be a str")
+
+        for field_name in ("min_angle", "max_angle"):
+            if not isinstance(getattr(self, field_name), float):
+                raise TypeError(f"'{field_name}' must be a float")
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        return d
+
+
+class GaugeCalibrationMapper:
+
+    @staticmethod
+    def map_calibration(
+        aruco_id: int,
+        category: str,
+        center_x: int,
+        center_y: int,
+        radius: int,
+        min_angle: float,
+        max_angle: float,
+        image_width: int,
+        image_height: int,
+    ) -> GaugeCalibrationDTO:
+
+        dto = GaugeCalibrationDTO(
+            aruco_id=int(aruco_id),
+            category=category,
+            center_x=int(center_x),
+            center_y=int(center_y),
+            radius=int(radius),
+            min_angle=float(min_angle),
+            max_angle=float(max_angle),
+            image_width=int(image_width),
+            image_height=int(image_height),
+        )
+
+        return dto
+
+    @staticmethod
+    def map_row(row: tuple) -> GaugeCalibrationDTO:
+        # column order of DatabaseReader.get_gauge_calibration
+        return GaugeCalibrationMapper.map_calibration(*row)
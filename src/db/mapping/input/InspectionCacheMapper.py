@@ -0,0 +1,87 @@
+import json
+from dataclasses import asdict, dataclass
+
+from common.imports.Typing import Any, Dict, List, Optional
+
+
+@dataclass
+class InspectionCacheDTO:
+
+    content_hash: str
+    fingerprint: str
+    raw_image_id: int
+    readings: str
+    aruco_id: Optional[int] = None
+    id: Optional[int] = None
+
+    def __post_init__(self):
+        not_null_fields = [
+            "content_hash",
+            "fingerprint",
+            "raw_image_id",
+            "readings",
+        ]
+
+        for field_name in not_null_fields:
+            value = getattr(self, field_name)
+            if value is None:
+                raise ValueError(f"Field '{field_name}' must not be None")
+
+        if not isinstance(self.content_hash, str):
+            raise TypeError("'content_hash' must be a str")
+
+        if not isinstance(self.fingerprint, str):
+            raise TypeError("'fingerprint' must be a str")
+
+        if not isinstance(self.raw_image_id, int):
+            raise TypeError("'raw_image_id' must be an integer")
+
+        if not isinstance(self.readings, str):
+            raise TypeError("'readings' must be a str")
+
+    def to_readings(self) -> List[Dict[str, Any]]:
+        return json.loads(self.readings)
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        return d
+
+
+class InspectionCacheMapper:
+
+    @staticmethod
+    def map_result(
+        content_hash: str,
+        fingerprint: str,
+        raw_image_id: int,
+        readings: List[Dict[str, Any]],
+        aruco_id: Optional[int] = None,
+    ) -> InspectionCacheDTO:
+
+        readings_json = json.dumps(readings)
+
+        dto = InspectionCacheDTO(
+            content_hash=content_hash,
+            fingerprint=fingerprint,
+            raw_image_id=raw_image_id,
+            readings=readings_json,
+            aruco_id=aruco_id,
+        )
+
+        return dto
+
+    @staticmethod
+    def map_row(row: tuple) -> InspectionCacheDTO:
+        # column order of DatabaseReader.get_inspection_cache
+        id, content_hash, fingerprint, raw_image_id, aruco_id, readings = row
+
+        dto = InspectionCacheDTO(
+            id=id,
+            content_hash=content_hash,
+            fingerprint=fingerprint,
+            raw_image_id=raw_image_id,
+            readings=readings,
+            aruco_id=aruco_id,
+        )
+
+        return dto
@@ -0,0 +1,52 @@
+from dataclasses import asdict, dataclass
+
+from common.imports.Typing import Any, Dict, List
+from common.tracing.InspectionTrace import InspectionTrace, Span
+
+
+@dataclass
+class InspectionTraceDTO:
+
+    raw_image_id: int
+    # live list of the trace, spans finishing later (e.g. uploads) are included
+    spans: List[Span]
+
+    def __post_init__(self):
+        if self.raw_image_id is None:
+            raise ValueError("Field 'raw_image_id' must not be None")
+
+        if not isinstance(self.raw_image_id, int):
+            raise TypeError("'raw_image_id' must be an integer")
+
+        if not isinstance(self.spans, list):
+            raise TypeError("'spans' must be a list")
+
+    def to_rows(self) -> List[tuple]:
+        return [
+            (
+                self.raw_image_id,
+                span.name,
+                span.parent,
+                span.start_offset_s * 1000.0,
+                span.wall_s * 1000.0,
+                span.cpu_s * 1000.0,
+                span.thread,
+            )
+            for span in list(self.spans)
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        return d
+
+
+class InspectionTraceMapper:
+
+    @staticmethod
+    def map_trace(trace: InspectionTrace) -> InspectionTraceDTO:
+        dto = InspectionTraceDTO(
+            raw_image_id=trace.raw_image_id,
+            spans=trace.spans,
+        )
+
+        return dto
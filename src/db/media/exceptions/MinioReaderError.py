@@ -0,0 +1,9 @@
+from common.exceptions.BaseAppException import BaseAppException
+
+
+class MinioReaderError(BaseAppException):
+    def __init__(self, exception: Exception, error_code: int):
+        self.exception = exception
+        self.error_code = error_code
+        self.message = f"Error: '{error_code}', Minio could not read media, Exception: '{exception}'"
+        super().__init__(self.message)
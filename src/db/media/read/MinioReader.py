@@ -0,0 +1,39 @@
+from common.imports.Typing import List
+from db.media.connector.MinioConnector import MinioConnector
+from db.media.exceptions.MinioReaderError import MinioReaderError
+
+
+class MinioReader(MinioConnector):
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        super().__init__()
+
+    def __enter__(self) -> "MinioReader":
+        self._connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.client = None
+
+    def list_object_names(self, prefix: str = "", recursive: bool = True) -> List[str]:
+        try:
+            objects = self.client.list_objects(
+                bucket_name=self.bucket_name, prefix=prefix, recursive=recursive
+            )
+            return [obj.object_name for obj in objects if not obj.is_dir]
+        except Exception as e:
+            raise MinioReaderError(exception=e, error_code=1792487010)
+
+    def get_media(self, object_name: str) -> bytes:
+        response = None
+        try:
+            response = self.client.get_object(
+                bucket_name=self.bucket_name, object_name=object_name
+            )
+            return response.read()
+        except Exception as e:
+            raise MinioReaderError(exception=e, error_code=1792487020)
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
@@ -1,18 +1,34 @@
 from db.media.write.MinioWriter import MinioWriter
+from db.media.read.MinioReader import MinioReader
 from db.media.infrastructure.MinioBucketInitializer import MinioBucketInitializer
 
 from db.media.exceptions.MinioWriterError import MinioWriterError
+from db.media.exceptions.MinioReaderError import MinioReaderError
 from db.media.exceptions.BucketInitializerError import BucketInitializerError
 from db.media.exceptions.MediaRepositoryError import MediaRepositoryError
+from common.imports.Typing import List
+import threading
 
 
 class MediaRepository:
+    # buckets already ensured in this process, saves a bucket_exists round trip per upload
+    _initialized_buckets: set[str] = set()
+    _bucket_lock = threading.Lock()
+
     def __init__(self, bucket_name: str):
         self.bucket_name = bucket_name
 
     def __initialize_bucket(self) -> str:
+        if self.bucket_name in MediaRepository._initialized_buckets:
+            return self.bucket_name
+
         try:
-            return MinioBucketInitializer(self.bucket_name).initalize_bucket()
+            with MediaRepository._bucket_lock:
+                bucket_name = MinioBucketInitializer(
+                    self.bucket_name
+                ).initalize_bucket()
+                MediaRepository._initialized_buckets.add(bucket_name)
+                return bucket_name
         except BucketInitializerError as e:
             # TODO: Improve error handling, e.g. try again?
             raise MediaRepositoryError(exception=e, error_code=1761337500)
@@ -33,3 +49,21 @@ class MediaRepository:
             raise MediaRepositoryError(exception=e, error_code=1761332280)
         except Exception as e:
             raise MediaRepositoryError(exception=e, error_code=1761332290)
+
+    def list_media(self, prefix: str = "") -> List[str]:
+        try:
+            with MinioReader(self.bucket_name) as minio:
+                return minio.list_object_names(prefix=prefix)
+        except MinioReaderError as e:
+            raise MediaRepositoryError(exception=e, error_code=1792487110)
+        except Exception as e:
+            raise MediaRepositoryError(exception=e, error_code=1792487120)
+
+    def get_media(self, object_name: str) -> bytes:
+        try:
+            with MinioReader(self.bucket_name) as minio:
+                return minio.get_media(object_name=object_name)
+        except MinioReaderError as e:
+            raise MediaRepositoryError(exception=e, error_code=1792487130)
+        except Exception as e:
+            raise MediaRepositoryError(exception=e, error_code=1792487140)
@@ -1,3 +1,4 @@
+from common.imports.Typing import Optional
 from db.meta.manager.SqliteConnectionManager import SqliteConnectionManager
 
 
@@ -18,3 +19,26 @@ class DatabaseReader:
             cursor.execute(query)
             result = cursor.fetchone()[0]
             return (result or 0) + 1
+
+    def get_inspection_cache(
+        self, content_hash: str, fingerprint: str
+    ) -> Optional[tuple]:
+        query = """
+            SELECT id, content_hash, fingerprint, raw_image_id, aruco_id, readings
+            FROM inspection_cache
+            WHERE content_hash = ? AND fingerprint = ?;
+        """
+        with self.connector as cursor:
+            cursor.execute(query, (content_hash, fingerprint))
+            return cursor.fetchone()
+
+    def get_gauge_calibration(self, aruco_id: int, category: str) -> Optional[tuple]:
+        query = """
+            SELECT aruco_id, category, center_x, center_y, radius,
+                   min_angle, max_angle, image_width, image_height
+            FROM gauge_calibrations
+            WHERE aruco_id = ? AND category = ?;
+        """
+        with self.connector as cursor:
+            cursor.execute(query, (aruco_id, category))
+            return cursor.fetchone()
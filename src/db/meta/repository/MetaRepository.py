@@ -1,4 +1,5 @@
 from db.meta.write.DatabaseWriter import DatabaseWriter
+from db.meta.read.DatabaseReader import DatabaseReader
 from db.meta.exceptions.DatabaseWriterError import DatabaseWriterError
 
 from db.meta.exceptions.MetaRepositoryError import MetaRepositoryError
@@ -6,15 +7,32 @@ from db.meta.exceptions.MetaRepositoryError import MetaRepositoryError
 from db.mapping.input.RawImageMapper import RawImageDTO
 from db.mapping.input.AnalyzedImageMapper import AnalyzedImageDTO
 from db.mapping.input.AnomalyMapper import AnomalyDTO
+from db.mapping.input.InspectionTraceMapper import InspectionTraceDTO
+from db.mapping.input.InspectionCacheMapper import (
+    InspectionCacheDTO,
+    InspectionCacheMapper,
+)
+from db.mapping.input.GaugeCalibrationMapper import (
+    GaugeCalibrationDTO,
+    GaugeCalibrationMapper,
+)
+from db.meta.connector.SqliteConnector import SqliteConnector
+from common.imports.Typing import Optional
+from sqlite3 import Cursor
 
 
 class MetaRepository:
     def __init__(self):
         self.writer = DatabaseWriter()
+        self.reader = DatabaseReader()
+
+    def transaction(self) -> SqliteConnector:
+        return self.writer.transaction()
 
     def insert_raw_image_metadata(
         self,
         metadata: RawImageDTO,
+        cursor: Optional[Cursor] = None,
     ) -> tuple[int, str]:
         try:
             return self.writer.insert_raw_image_metadata(
@@ -25,6 +43,7 @@ class MetaRepository:
                 size=metadata.size,
                 compressed=metadata.compressed,
                 compression_method=metadata.compression_method,
+                cursor=cursor,
             )
         except DatabaseWriterError as e:
             raise MetaRepositoryError(exception=e, error_code=1761492730)
@@ -32,7 +51,7 @@ class MetaRepository:
             raise MetaRepositoryError(exception=e, error_code=1761492740)
 
     def insert_analyzed_image_metadata(
-        self, metadata: AnalyzedImageDTO
+        self, metadata: AnalyzedImageDTO, cursor: Optional[Cursor] = None
     ) -> tuple[int, str]:
         try:
             return self.writer.insert_analyzed_image_metadata(
@@ -50,13 +69,16 @@ class MetaRepository:
                 value=metadata.value,
                 unit=metadata.unit,
                 category=metadata.category,
+                cursor=cursor,
             )
         except DatabaseWriterError as e:
             raise MetaRepositoryError(exception=e, error_code=1761932480)
         except Exception as e:
             raise MetaRepositoryError(exception=e, error_code=1761932490)
 
-    def insert_anomaly(self, metadata: AnomalyDTO) -> int:
+    def insert_anomaly(
+        self, metadata: AnomalyDTO, cursor: Optional[Cursor] = None
+    ) -> int:
         try:
             return self.writer.insert_anomaly(
                 analyzed_image_id=metadata.analyzed_image_id,
@@ -64,8 +86,87 @@ class MetaRepository:
                 anomaly_score=metadata.anomaly_score,
                 used_funtion=metadata.used_funtion,
                 parameters=metadata.parameters,
+                cursor=cursor,
             )
         except DatabaseWriterError as e:
             raise MetaRepositoryError(exception=e, error_code=1762881900)
         except Exception as e:
             raise MetaRepositoryError(exception=e, error_code=1762881910)
+
+    def insert_inspection_trace(
+        self, metadata: InspectionTraceDTO, cursor: Optional[Cursor] = None
+    ) -> int:
+        try:
+            return self.writer.insert_trace_spans(
+                rows=metadata.to_rows(),
+                cursor=cursor,
+            )
+        except DatabaseWriterError as e:
+            raise MetaRepositoryError(exception=e, error_code=1792580110)
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792580120)
+
+    def get_inspection_cache(
+        self, content_hash: str, fingerprint: str
+    ) -> Optional[InspectionCacheDTO]:
+        try:
+            row = self.reader.get_inspection_cache(
+                content_hash=content_hash, fingerprint=fingerprint
+            )
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792601210)
+
+        if row is None:
+            return None
+        return InspectionCacheMapper.map_row(row)
+
+    def insert_inspection_cache(
+        self, metadata: InspectionCacheDTO, cursor: Optional[Cursor] = None
+    ) -> int:
+        try:
+            return self.writer.insert_inspection_cache(
+                content_hash=metadata.content_hash,
+                fingerprint=metadata.fingerprint,
+                raw_image_id=metadata.raw_image_id,
+                aruco_id=metadata.aruco_id,
+                readings=metadata.readings,
+                cursor=cursor,
+            )
+        except DatabaseWriterError as e:
+            raise MetaRepositoryError(exception=e, error_code=1792601220)
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792601230)
+
+    def record_inspection_cache_hit(
+        self, cache_id: int, cursor: Optional[Cursor] = None
+    ) -> None:
+        try:
+            self.writer.record_inspection_cache_hit(cache_id=cache_id, cursor=cursor)
+        except DatabaseWriterError as e:
+            raise MetaRepositoryError(exception=e, error_code=1792601240)
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792601250)
+
+    def get_gauge_calibration(
+        self, aruco_id: int, category: str
+    ) -> Optional[GaugeCalibrationDTO]:
+        try:
+            row = self.reader.get_gauge_calibration(
+                aruco_id=aruco_id, category=category
+            )
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792611110)
+
+        if row is None:
+            return None
+        return GaugeCalibrationMapper.map_row(row)
+
+    def upsert_gauge_calibration(
+        self, metadata: GaugeCalibrationDTO, cursor: Optional[Cursor] = None
+    ) -> None:
+        try:
+            self.writer.upsert_gauge_calibration(**metadata.to_dict(), cursor=cursor)
+        except DatabaseWriterError as e:
+            raise MetaRepositoryError(exception=e, error_code=1792611120)
+        except Exception as e:
+            raise MetaRepositoryError(exception=e, error_code=1792611130)
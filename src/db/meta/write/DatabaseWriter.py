@@ -1,13 +1,29 @@
 from db.meta.manager.SqliteConnectionManager import SqliteConnectionManager
+from db.meta.connector.SqliteConnector import SqliteConnector
 from db.meta.exceptions.SqliteConnectionError import SqliteConnectionError
 from db.meta.exceptions.DatabaseWriterError import DatabaseWriterError
-from sqlite3 import IntegrityError, OperationalError, DatabaseError
+from sqlite3 import IntegrityError, OperationalError, DatabaseError, Cursor
+from contextlib import nullcontext
+from common.imports.Typing import List, Optional
 
 
 class DatabaseWriter:
     def __init__(self):
         self.connector = SqliteConnectionManager.get_connector()
 
+    def transaction(self) -> SqliteConnector:
+        """
+        Opens one transaction on the shared connection. The yielded cursor can be
+        passed to the insert methods to commit several rows at once.
+        """
+        return self.connector
+
+    def __cursor(self, cursor: Optional[Cursor]):
+        # an outer transaction owns commit / rollback, otherwise every insert commits
+        if cursor is not None:
+            return nullcontext(cursor)
+        return self.connector
+
     def insert_raw_image_metadata(
         self,
         name: str,
@@ -17,6 +33,7 @@ class DatabaseWriter:
         size: int,
         compressed: bool,
         compression_method: str,
+        cursor: Optional[Cursor] = None,
     ) -> tuple[int, str]:
         query = """
             INSERT INTO cvision_images_raw (
@@ -30,7 +47,7 @@ class DatabaseWriter:
             VALUES (?, ?, ?, ?, ?, ?, ?);
         """
         try:
-            with self.connector as cursor:
+            with self.__cursor(cursor) as cursor:
                 cursor.execute(
                     query,
                     (
@@ -71,6 +88,7 @@ class DatabaseWriter:
         value: float,
         unit: str,
         category: str,
+        cursor: Optional[Cursor] = None,
     ) -> tuple[int, str]:
         query = """
             INSERT INTO cvision_images_analyzed (
@@ -93,7 +111,7 @@ class DatabaseWriter:
         """
 
         try:
-            with self.connector as cursor:
+            with self.__cursor(cursor) as cursor:
                 cursor.execute(
                     query,
                     (
@@ -132,6 +150,7 @@ class DatabaseWriter:
         anomaly_score: float,
         used_funtion: str,
         parameters: str,
+        cursor: Optional[Cursor] = None,
     ) -> int:
         query = """
             INSERT INTO anomalies (
@@ -145,7 +164,7 @@ class DatabaseWriter:
         """
 
         try:
-            with self.connector as cursor:
+            with self.__cursor(cursor) as cursor:
                 cursor.execute(
                     query,
                     (
@@ -167,3 +186,171 @@ class DatabaseWriter:
             raise DatabaseWriterError(exception=e, error_code=1762880840)
         except Exception as e:
             raise DatabaseWriterError(exception=e, error_code=1762880850)
+
+    def insert_trace_spans(
+        self,
+        rows: List[tuple],
+        cursor: Optional[Cursor] = None,
+    ) -> int:
+        query = """
+            INSERT INTO inspection_traces (
+                raw_image_id,
+                span_name,
+                parent_span,
+                start_offset_ms,
+                wall_ms,
+                cpu_ms,
+                thread
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+        """
+
+        try:
+            with self.__cursor(cursor) as cursor:
+                cursor.executemany(query, rows)
+                return len(rows)
+        except IntegrityError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792580010)
+        except OperationalError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792580020)
+        except DatabaseError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792580030)
+        except SqliteConnectionError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792580040)
+        except Exception as e:
+            raise DatabaseWriterError(exception=e, error_code=1792580050)
+
+    def insert_inspection_cache(
+        self,
+        content_hash: str,
+        fingerprint: str,
+        raw_image_id: int,
+        aruco_id: Optional[int],
+        readings: str,
+        cursor: Optional[Cursor] = None,
+    ) -> int:
+        # a concurrent analysis of the same bytes may have won the race, the
+        # newer result replaces it
+        query = """
+            INSERT INTO inspection_cache (
+                content_hash,
+                fingerprint,
+                raw_image_id,
+                aruco_id,
+                readings
+            )
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (content_hash, fingerprint) DO UPDATE SET
+                raw_image_id = excluded.raw_image_id,
+                aruco_id = excluded.aruco_id,
+                readings = excluded.readings;
+        """
+
+        try:
+            with self.__cursor(cursor) as cursor:
+                cursor.execute(
+                    query,
+                    (
+                        content_hash,
+                        fingerprint,
+                        raw_image_id,
+                        aruco_id,
+                        readings,
+                    ),
+                )
+                return cursor.lastrowid
+        except IntegrityError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601010)
+        except OperationalError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601020)
+        except DatabaseError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601030)
+        except SqliteConnectionError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601040)
+        except Exception as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601050)
+
+    def record_inspection_cache_hit(
+        self, cache_id: int, cursor: Optional[Cursor] = None
+    ) -> None:
+        query = """
+            UPDATE inspection_cache
+            SET hits = hits + 1, last_hit_at = CURRENT_TIMESTAMP
+            WHERE id = ?;
+        """
+
+        try:
+            with self.__cursor(cursor) as cursor:
+                cursor.execute(query, (cache_id,))
+        except OperationalError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601110)
+        except DatabaseError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601120)
+        except SqliteConnectionError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601130)
+        except Exception as e:
+            raise DatabaseWriterError(exception=e, error_code=1792601140)
+
+    def upsert_gauge_calibration(
+        self,
+        aruco_id: int,
+        category: str,
+        center_x: int,
+        center_y: int,
+        radius: int,
+        min_angle: float,
+        max_angle: float,
+        image_width: int,
+        image_height: int,
+        cursor: Optional[Cursor] = None,
+    ) -> None:
+        query = """
+            INSERT INTO gauge_calibrations (
+                aruco_id,
+                category,
+                center_x,
+                center_y,
+                radius,
+                min_angle,
+                max_angle,
+                image_width,
+                image_height
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (aruco_id, category) DO UPDATE SET
+                center_x = excluded.center_x,
+                center_y = excluded.center_y,
+                radius = excluded.radius,
+                min_angle = excluded.min_angle,
+                max_angle = excluded.max_angle,
+                image_width = excluded.image_width,
+                image_height = excluded.image_height,
+                updated_at = CURRENT_TIMESTAMP;
+        """
+
+        try:
+            with self.__cursor(cursor) as cursor:
+                cursor.execute(
+                    query,
+                    (
+                        aruco_id,
+                        category,
+                        center_x,
+                        center_y,
+                        radius,
+                        min_angle,
+                        max_angle,
+                        image_width,
+                        image_height,
+                    ),
+                )
+        except IntegrityError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792611010)
+        except OperationalError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792611020)
+        except DatabaseError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792611030)
+        except SqliteConnectionError as e:
+            raise DatabaseWriterError(exception=e, error_code=1792611040)
+        except Exception as e:
+            raise DatabaseWriterError(exception=e, error_code=1792611050)
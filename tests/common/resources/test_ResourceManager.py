@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+
+from common.resources.ResourceManager import (
+    MAIN,
+    WORKER,
+    ResourceManager,
+    init_pool_worker,
+)
+
+
+class TestResourceManager(unittest.TestCase):
+
+    def setUp(self):
+        ResourceManager._instance = None
+        self.reader = MagicMock()
+        self.reader.getThreads.side_effect = lambda role: {MAIN: 3, WORKER: 1}[role]
+        self.reader.getCpuAffinity.return_value = False
+        self.reader.getSklearnJobs.return_value = 1
+        self.previous_cv2_threads = cv2.getNumThreads()
+
+    def tearDown(self):
+        manager = ResourceManager._instance
+        if manager is not None and manager._threadpool_limits is not None:
+            manager._threadpool_limits.restore_original_limits()
+        ResourceManager._instance = None
+        cv2.setNumThreads(self.previous_cv2_threads)
+
+    def test_apply_sets_opencv_torch_and_env(self):
+        manager = ResourceManager(resources_config_reader=self.reader)
+
+        with patch("torch.set_num_threads") as set_torch_threads, patch.dict(
+            os.environ, {}, clear=False
+        ):
+            threads = manager.apply(role=MAIN)
+
+            self.assertEqual(threads, 3)
+            self.assertEqual(cv2.getNumThreads(), 3)
+            set_torch_threads.assert_called_once_with(3)
+            self.assertEqual(os.environ["OMP_NUM_THREADS"], "3")
+            self.assertEqual(os.environ["LOKY_MAX_CPU_COUNT"], "1")
+
+    def test_missing_config_falls_back_to_defaults(self):
+        with patch(
+            "common.resources.ResourceManager.ResourcesConfigReader",
+            side_effect=FileNotFoundError("resources.yaml"),
+        ):
+            manager = ResourceManager()
+
+        self.assertEqual(manager.threads(WORKER), 1)
+        self.assertEqual(manager.pool_size("upload"), 4)
+        self.assertEqual(manager.sklearn_jobs, 1)
+        self.assertFalse(manager.cpu_affinity)
+
+    def test_cores_for_worker_are_disjoint_blocks(self):
+        with patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+            self.assertEqual(ResourceManager.cores_for_worker(0, 2), [0, 1])
+            self.assertEqual(ResourceManager.cores_for_worker(1, 2), [2, 3])
+            # more workers than cores wrap around
+            self.assertEqual(ResourceManager.cores_for_worker(2, 2), [0, 1])
+
+    def test_worker_is_pinned_only_with_cpu_affinity(self):
+        self.reader.getCpuAffinity.return_value = True
+        manager = ResourceManager(resources_config_reader=self.reader)
+
+        with patch.object(ResourceManager, "_pin") as pin, patch.object(
+            ResourceManager, "cores_for_worker", return_value=[1]
+        ), patch("torch.set_num_threads"):
+            manager.apply(role=MAIN)
+            pin.assert_not_called()
+
+            manager.apply(role=WORKER, worker_index=1)
+            pin.assert_called_once_with([1])
+
+    def test_init_pool_worker_numbers_workers(self):
+        ResourceManager(resources_config_reader=self.reader)
+        counter = multiprocessing.Value("i", 0)
+
+        with patch.object(ResourceManager, "apply") as apply:
+            self.assertEqual(init_pool_worker(counter), 0)
+            self.assertEqual(init_pool_worker(counter), 1)
+
+        apply.assert_called_with(role=WORKER, worker_index=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
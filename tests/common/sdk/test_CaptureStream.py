@@ -0,0 +1,51 @@
+import threading
+import unittest
+
+from common.sdk.CaptureStream import Capture, CaptureStream
+
+
+class TestCaptureStream(unittest.TestCase):
+
+    def test_iteration_yields_captures_in_order_until_closed(self):
+        stream = CaptureStream()
+        stream.publish(Capture(image_data=b"a", waypoint_id="wp-1"))
+        stream.publish(Capture(image_data=b"b", waypoint_id="wp-2"))
+        stream.close()
+
+        got = [capture.waypoint_id for capture in stream]
+
+        self.assertEqual(got, ["wp-1", "wp-2"])
+
+    def test_consumer_runs_while_producer_is_still_publishing(self):
+        stream = CaptureStream()
+        consumed = threading.Event()
+        received = []
+
+        def _consume():
+            for capture in stream:
+                received.append(capture.image_data)
+                consumed.set()
+
+        consumer = threading.Thread(target=_consume)
+        consumer.start()
+
+        stream.publish(Capture(image_data=b"first"))
+        # the first capture is analysed before the mission publishes the next one
+        self.assertTrue(consumed.wait(timeout=5))
+        stream.publish(Capture(image_data=b"second"))
+        stream.close()
+        consumer.join(timeout=5)
+
+        self.assertEqual(received, [b"first", b"second"])
+
+    def test_publish_after_close_raises(self):
+        stream = CaptureStream()
+        stream.close()
+
+        with self.assertRaises(RuntimeError):
+            stream.publish(Capture(image_data=b"x"))
+        self.assertTrue(stream.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import threading
+import unittest
+
+from common.tracing.InspectionTrace import InspectionTrace, trace_span
+
+
+class TestInspectionTrace(unittest.TestCase):
+
+    def test_trace_span_is_noop_without_open_trace(self):
+        with trace_span("aruco"):
+            pass
+
+        self.assertIsNone(InspectionTrace.current())
+
+    def test_spans_record_name_parent_and_times(self):
+        with InspectionTrace(raw_image_id=3) as trace:
+            with trace.span("inspection"):
+                with trace_span("aruco"):
+                    sum(range(1000))
+
+        self.assertIsNone(InspectionTrace.current())
+        by_name = {span.name: span for span in trace.spans}
+        self.assertEqual(set(by_name), {"inspection", "aruco"})
+        self.assertEqual(by_name["aruco"].parent, "inspection")
+        self.assertIsNone(by_name["inspection"].parent)
+        self.assertGreaterEqual(by_name["inspection"].wall_s, by_name["aruco"].wall_s)
+        self.assertGreaterEqual(by_name["aruco"].cpu_s, 0.0)
+
+    def test_explicit_trace_is_recorded_from_other_thread(self):
+        with InspectionTrace() as trace:
+
+            def _upload():
+                with trace_span("minio_upload", trace=trace):
+                    pass
+
+            worker = threading.Thread(target=_upload, name="minio-upload")
+            worker.start()
+            worker.join()
+
+        self.assertEqual(len(trace.spans), 1)
+        self.assertEqual(trace.spans[0].thread, "minio-upload")
+
+
+if __name__ == "__main__":
+    unittest.main()
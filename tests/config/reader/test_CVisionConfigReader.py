@@ -0,0 +1,222 @@
+import unittest
+from unittest.mock import patch
+
+from credentials.configs.enum.ConfigEnum import CVISION_KEYS
+from credentials.configs.reader.CVisionConfigReader import CVisionConfigReader
+
+
+class TestCVisionConfigReaderDebugArtifacts(unittest.TestCase):
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_values_from_config(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.DEBUG_ARTIFACTS: {
+                    CVISION_KEYS.LEVEL: "full",
+                    CVISION_KEYS.FORMAT: ".JPG",
+                    CVISION_KEYS.QUALITY: 70,
+                }
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getDebugArtifactLevel(), "full")
+        self.assertEqual(reader.getDebugArtifactFormat(), ".jpg")
+        self.assertEqual(reader.getDebugArtifactQuality(), 70)
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_defaults_for_missing_section(self, mock_load_config):
+        mock_load_config.return_value = {}
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getDebugArtifactLevel(), "final_only")
+        self.assertEqual(reader.getDebugArtifactFormat(), ".png")
+        self.assertIsNone(reader.getDebugArtifactQuality())
+
+    @patch("credentials.configs.reader.CVisionConfigReader.LogHandler")
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_invalid_values_fall_back(self, mock_load_config, log_handler):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.DEBUG_ARTIFACTS: {
+                    CVISION_KEYS.LEVEL: "verbose",
+                    CVISION_KEYS.FORMAT: ".gif",
+                    CVISION_KEYS.QUALITY: 250,
+                }
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getDebugArtifactLevel(), "final_only")
+        self.assertEqual(reader.getDebugArtifactFormat(), ".png")
+        self.assertEqual(reader.getDebugArtifactQuality(), 100)
+        warnings = [call.args[0] for call in log_handler.log_warning.call_args_list]
+        self.assertEqual(len(warnings), 3)
+        self.assertIn("debug_artifacts.level: 'verbose'", warnings[0])
+        self.assertIn("using 100", warnings[2])
+
+    @patch("credentials.configs.reader.CVisionConfigReader.LogHandler")
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_rejected_value_is_warned_once(self, mock_load_config, log_handler):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.DEBUG_ARTIFACTS: {CVISION_KEYS.LEVEL: "verbose"}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        reader.getDebugArtifactLevel()
+        reader.getDebugArtifactLevel()
+
+        log_handler.log_warning.assert_called_once()
+
+    @patch("credentials.configs.reader.CVisionConfigReader.LogHandler")
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_missing_values_are_not_warned_about(self, mock_load_config, log_handler):
+        mock_load_config.return_value = {}
+        reader = CVisionConfigReader()
+
+        reader.getDebugArtifactLevel()
+        reader.getDebugArtifactQuality()
+        reader.getKeyPointInputSize()
+
+        log_handler.log_warning.assert_not_called()
+
+
+class TestCVisionConfigReaderResultCache(unittest.TestCase):
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_enabled_by_default(self, mock_load_config):
+        mock_load_config.return_value = {}
+        reader = CVisionConfigReader()
+
+        self.assertTrue(reader.getResultCacheEnabled())
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_can_be_disabled(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.RESULT_CACHE: {CVISION_KEYS.ENABLED: False}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertFalse(reader.getResultCacheEnabled())
+
+
+class TestCVisionConfigReaderKeyPoints(unittest.TestCase):
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_extraction_mode(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {CVISION_KEYS.EXTRACTION: "cluster"}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointExtractionMode(), "cluster")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_unknown_extraction_mode_falls_back_to_fast(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {CVISION_KEYS.EXTRACTION: "dbscan"}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointExtractionMode(), "fast")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_runtime(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {CVISION_KEYS.RUNTIME: "torchscript"}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointRuntime(), "torchscript")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_unknown_runtime_falls_back_to_eager(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {CVISION_KEYS.RUNTIME: "tensorrt"}
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointRuntime(), "eager")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_input_size_and_decode(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {
+                    CVISION_KEYS.INPUT_SIZE: 224,
+                    CVISION_KEYS.DECODE: "patch",
+                }
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointInputSize(), 224)
+        self.assertEqual(reader.getKeyPointDecode(), "patch")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_input_size_must_fit_the_patch_grid(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.KEYPOINTS: {
+                    CVISION_KEYS.INPUT_SIZE: 300,
+                    CVISION_KEYS.DECODE: "bicubic",
+                }
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getKeyPointInputSize(), 448)
+        self.assertEqual(reader.getKeyPointDecode(), "full")
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_keypoint_input_follows_the_gauge_canvas(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {CVISION_KEYS.GAUGE_CANVAS: {CVISION_KEYS.SIZE: 336}}
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getGaugeCanvasSize(), 336)
+        self.assertEqual(reader.getKeyPointInputSize(), 336)
+
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.GAUGE_CANVAS: {CVISION_KEYS.SIZE: 500},
+                CVISION_KEYS.KEYPOINTS: {CVISION_KEYS.INPUT_SIZE: 224},
+            }
+        }
+        reader = CVisionConfigReader()
+
+        self.assertEqual(reader.getGaugeCanvasSize(), 448)
+        self.assertEqual(reader.getKeyPointInputSize(), 224)
+
+    @patch.object(CVisionConfigReader, "load_config")
+    def test_calibration_center_method(self, mock_load_config):
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.CALIBRATION: {CVISION_KEYS.CENTER_METHOD: "contour"}
+            }
+        }
+        self.assertEqual(CVisionConfigReader().getCalibrationCenterMethod(), "contour")
+
+        mock_load_config.return_value = {
+            CVISION_KEYS.CVISION: {
+                CVISION_KEYS.CALIBRATION: {CVISION_KEYS.CENTER_METHOD: "hough"}
+            }
+        }
+        self.assertEqual(CVisionConfigReader().getCalibrationCenterMethod(), "ticks")
+
+
+if __name__ == "__main__":
+    unittest.main()
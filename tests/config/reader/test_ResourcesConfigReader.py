@@ -0,0 +1,92 @@
+import unittest
+from unittest.mock import patch
+
+from credentials.configs.enum.ConfigEnum import RESOURCES_KEYS
+from credentials.configs.reader.ResourcesConfigReader import ResourcesConfigReader
+
+
+class TestResourcesConfigReader(unittest.TestCase):
+
+    @patch.object(ResourcesConfigReader, "load_config")
+    def test_values_from_config(self, mock_load_config):
+        mock_load_config.return_value = {
+            RESOURCES_KEYS.RESOURCES: {
+                RESOURCES_KEYS.MAIN: {RESOURCES_KEYS.THREADS: 4},
+                RESOURCES_KEYS.WORKER: {
+                    RESOURCES_KEYS.THREADS: 2,
+                    RESOURCES_KEYS.CPU_AFFINITY: True,
+                },
+                RESOURCES_KEYS.POOLS: {
+                    RESOURCES_KEYS.CV_EXECUTOR: 3,
+                    RESOURCES_KEYS.BATCH: 6,
+                    RESOURCES_KEYS.UPLOAD: 8,
+                },
+                RESOURCES_KEYS.SKLEARN_JOBS: 2,
+            }
+        }
+        reader = ResourcesConfigReader()
+
+        self.assertEqual(reader.getThreads(RESOURCES_KEYS.MAIN), 4)
+        self.assertEqual(reader.getThreads(RESOURCES_KEYS.WORKER), 2)
+        self.assertTrue(reader.getCpuAffinity())
+        self.assertEqual(reader.getPoolSize(RESOURCES_KEYS.CV_EXECUTOR), 3)
+        self.assertEqual(reader.getPoolSize(RESOURCES_KEYS.BATCH), 6)
+        self.assertEqual(reader.getPoolSize(RESOURCES_KEYS.UPLOAD), 8)
+        self.assertEqual(reader.getSklearnJobs(), 2)
+
+    @patch("credentials.configs.reader.ResourcesConfigReader.LogHandler")
+    @patch.object(ResourcesConfigReader, "load_config")
+    def test_defaults_for_missing_or_invalid_values(
+        self, mock_load_config, log_handler
+    ):
+        mock_load_config.return_value = {
+            RESOURCES_KEYS.RESOURCES: {
+                RESOURCES_KEYS.MAIN: {RESOURCES_KEYS.THREADS: 0},
+                RESOURCES_KEYS.WORKER: {RESOURCES_KEYS.THREADS: True},
+                RESOURCES_KEYS.SKLEARN_JOBS: -1,
+            }
+        }
+        reader = ResourcesConfigReader()
+
+        self.assertEqual(reader.getThreads(RESOURCES_KEYS.MAIN), 2)
+        self.assertEqual(reader.getThreads(RESOURCES_KEYS.WORKER), 1)
+        self.assertFalse(reader.getCpuAffinity())
+        self.assertEqual(reader.getPoolSize(RESOURCES_KEYS.UPLOAD), 4)
+        self.assertEqual(reader.getSklearnJobs(), 1)
+        # the invalid values, not the missing ones
+        warnings = [call.args[0] for call in log_handler.log_warning.call_args_list]
+        self.assertEqual(len(warnings), 3)
+        self.assertIn("main.threads: 0, using 2", warnings[0])
+        self.assertIn("sklearn_jobs: -1, using 1", warnings[2])
+
+    @patch("credentials.configs.reader.ResourcesConfigReader.LogHandler")
+    @patch.object(ResourcesConfigReader, "load_config")
+    def test_rejected_value_is_warned_once(self, mock_load_config, log_handler):
+        mock_load_config.return_value = {
+            RESOURCES_KEYS.RESOURCES: {
+                RESOURCES_KEYS.POOLS: {RESOURCES_KEYS.UPLOAD: "many"},
+                RESOURCES_KEYS.WORKER: {RESOURCES_KEYS.CPU_AFFINITY: "yes"},
+            }
+        }
+        reader = ResourcesConfigReader()
+
+        reader.getPoolSize(RESOURCES_KEYS.UPLOAD)
+        reader.getPoolSize(RESOURCES_KEYS.UPLOAD)
+        self.assertFalse(reader.getCpuAffinity())
+
+        warnings = [call.args[0] for call in log_handler.log_warning.call_args_list]
+        self.assertEqual(len(warnings), 2)
+        self.assertIn("pools.upload: 'many', using 4", warnings[0])
+        self.assertIn("worker.cpu_affinity: 'yes', using False", warnings[1])
+
+    @patch.object(ResourcesConfigReader, "load_config")
+    def test_unknown_pool_is_rejected(self, mock_load_config):
+        mock_load_config.return_value = {}
+        reader = ResourcesConfigReader()
+
+        with self.assertRaises(ValueError):
+            reader.getPoolSize("gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+from credentials.configs.enum.ConfigEnum import SENSOR_KEYS
+from credentials.configs.reader.SensorConfigReader import SensorConfigReader
+
+
+def _config() -> dict:
+    return {
+        SENSOR_KEYS.NODES: {
+            "analog_gauge": {
+                SENSOR_KEYS.ARUCO_ID: None,
+                SENSOR_KEYS.CATEGORIES: [
+                    {SENSOR_KEYS.NAME: "pressure", SENSOR_KEYS.SENSOR_TYPE: "analog"}
+                ],
+            },
+            "panel": {
+                SENSOR_KEYS.ARUCO_ID: 12,
+                SENSOR_KEYS.CATEGORIES: [
+                    {
+                        SENSOR_KEYS.NAME: "inlet",
+                        SENSOR_KEYS.SENSOR_TYPE: "analog",
+                        SENSOR_KEYS.NEEDLE_DETECTOR: "polar",
+                    },
+                    {SENSOR_KEYS.NAME: "tempdisplay"},
+                    {
+                        SENSOR_KEYS.NAME: "outlet",
+                        SENSOR_KEYS.SENSOR_TYPE: "analog",
+                        SENSOR_KEYS.NEEDLE_DETECTOR: "sobel",
+                    },
+                ],
+            },
+        }
+    }
+
+
+class TestSensorConfigReaderAnalogCategories(unittest.TestCase):
+
+    @patch.object(SensorConfigReader, "load_config")
+    def test_only_analog_categories_in_config_order(self, mock_load_config):
+        mock_load_config.return_value = _config()
+        reader = SensorConfigReader()
+
+        self.assertEqual(reader.getAnalogCategoriesByNodeID(12), ["inlet", "outlet"])
+        self.assertEqual(reader.getAnalogCategoriesByNodeID(None), ["pressure"])
+
+    @patch.object(SensorConfigReader, "load_config")
+    def test_unknown_node_has_no_analog_categories(self, mock_load_config):
+        mock_load_config.return_value = _config()
+        reader = SensorConfigReader()
+
+        self.assertEqual(reader.getAnalogCategoriesByNodeID(99), [])
+
+
+class TestSensorConfigReaderNeedleDetector(unittest.TestCase):
+
+    @patch.object(SensorConfigReader, "load_config")
+    def test_per_gauge_detector_defaults_to_hough(self, mock_load_config):
+        mock_load_config.return_value = _config()
+        reader = SensorConfigReader()
+
+        self.assertEqual(reader.getNeedleDetector("inlet", aruco_id=12), "polar")
+        self.assertEqual(reader.getNeedleDetector("outlet", aruco_id=12), "hough")
+        self.assertEqual(reader.getNeedleDetector("pressure"), "hough")
+
+
+if __name__ == "__main__":
+    unittest.main()
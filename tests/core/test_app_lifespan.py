@@ -0,0 +1,159 @@
+import importlib
+import sys
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from core import cv_executor
+from cvision.analog.AnalogGaugeReader import AnalogGaugeFailure, AnalogGaugeReading
+from cvision.analog.exceptions.GaugeReadingFailed import GaugeReadingFailed
+from cvision.analog.GaugeSensorMapper import GaugeAssignment
+from cvision.frame.Frame import Frame
+
+# constructed by the module-level Initializer, they need configs and models
+_SERVICES = (
+    "credentials.manager.SettingsManager.SettingsManager",
+    "cvision.registry.ModelRegistry.ModelRegistry",
+    "cvision.digital.DigitalCropper.YoloDisplayCropper",
+    "cvision.digital.DigitalValueReader.EasyOcrDisplayValueReader",
+    "anomaly.AnomalyChecker.AnomalyChecker",
+    "cvision.analog.AnalogGaugeCropper.AnalogGaugeCropper",
+    "cvision.aruco.ArUcoIDExtractor.ArUcoIDExtraktor",
+    "cvision.analog.GaugeSensorMapper.GaugeSensorMapper",
+    "cvision.analog.GaugeCalibrationStore.GaugeCalibrationStore",
+)
+
+
+def _import_app_lifespan():
+    # app_lifespan imports it the way src/core/app.py runs it
+    sys.modules.setdefault("cv_executor", cv_executor)
+    patches = []
+    for target in _SERVICES:
+        importlib.import_module(target.rsplit(".", 1)[0])
+        patches.append(patch(target))
+    for p in patches:
+        p.start()
+    try:
+        return importlib.import_module("core.app_lifespan")
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+
+app_lifespan = _import_app_lifespan()
+
+
+class TestPersistAnalogReading(unittest.TestCase):
+
+    def _persist(self, needle_detector, value):
+        services = MagicMock()
+        services.settings_manager.getNeedleDetector.return_value = needle_detector
+        services.settings_manager.getValueTolerance.return_value = 0.1
+        services.settings_manager.getUnit.return_value = "bar"
+        analyzed = Future()
+        analyzed.set_result(7)
+        reading = AnalogGaugeReading(
+            center_x=0, center_y=0, radius=1, value=value, debug_images=[]
+        )
+
+        with patch.object(app_lifespan, "services", services), patch.object(
+            app_lifespan, "safe_analyzed_image", return_value=analyzed
+        ) as safe_analyzed_image:
+            result = app_lifespan.persist_analog_reading(
+                dal=MagicMock(),
+                cropped_analog_gauge_image=Frame.from_array(
+                    np.zeros((4, 4, 3), dtype=np.uint8)
+                ),
+                reading=reading,
+                raw_image_id=1,
+                opcua_node_id="ns=2;i=1",
+            )
+        stored = safe_analyzed_image.call_args.kwargs["detected_value"]
+        return result, stored
+
+    def test_polar_reading_outside_tolerance_is_stored_as_measured(self):
+        result, stored = self._persist("polar", 4.2)
+
+        self.assertEqual(stored, 4.2)
+        self.assertEqual(result, (7, 4.2))
+
+    def test_keypoint_reading_outside_tolerance_is_stored_as_measured(self):
+        _, stored = self._persist("keypoints", 0.5)
+
+        self.assertEqual(stored, 0.5)
+
+    def test_hough_reading_outside_tolerance_keeps_the_fallback(self):
+        _, stored = self._persist("hough", 4.2)
+
+        self.assertEqual(stored, 0.13)
+
+
+class TestInspectAnalogFailures(unittest.TestCase):
+
+    def _inspect(self, readings):
+        services = MagicMock()
+        services.aruco_extractor.get_markers.return_value = [(7, (0.0, 0.0))]
+        dal = MagicMock()
+        raw_image = Future()
+        raw_image.set_result(1)
+        dal.insert_raw_image_async.return_value = raw_image
+        frame = Frame.from_array(np.zeros((4, 4, 3), dtype=np.uint8))
+        gauges = [
+            (GaugeAssignment(i, np.zeros(4, int), category, None, 7), frame)
+            for i, category in enumerate(("pressure", "flow"))
+        ]
+        readings_future = Future()
+        readings_future.set_result(readings)
+
+        with patch.object(app_lifespan, "services", services), patch.object(
+            app_lifespan,
+            "start_analog_readings",
+            return_value=(gauges, readings_future),
+        ), patch.object(
+            app_lifespan, "process_digital_image", return_value=[]
+        ), patch.object(
+            app_lifespan, "persist_analog_reading", return_value=(3, 1.5)
+        ) as persist, patch.object(
+            app_lifespan, "check_anomaly", return_value=False
+        ), patch.object(
+            app_lifespan, "handle_anomaly"
+        ):
+            try:
+                return app_lifespan._inspect(dal=dal, frame=frame, trace=MagicMock())
+            finally:
+                self.persisted = [
+                    call.kwargs["category_name"] for call in persist.call_args_list
+                ]
+
+    def _reading(self):
+        return AnalogGaugeReading(
+            center_x=0, center_y=0, radius=1, value=1.5, debug_images=[]
+        )
+
+    def test_failed_gauge_fails_the_inspection_after_the_others_are_persisted(self):
+        readings = [
+            AnalogGaugeFailure(category="pressure", error="Error: '1', no needle"),
+            self._reading(),
+        ]
+
+        with self.assertRaises(GaugeReadingFailed) as raised:
+            self._inspect(readings)
+
+        self.assertEqual(self.persisted, ["flow"])
+        self.assertEqual(len(raised.exception.failures), 1)
+        self.assertIn("pressure", raised.exception.failures[0])
+        self.assertIn("no needle", raised.exception.failures[0])
+
+    def test_readable_gauges_are_all_reported(self):
+        result = self._inspect([self._reading(), self._reading()])
+
+        self.assertEqual(self.persisted, ["pressure", "flow"])
+        self.assertEqual(
+            [reading.category for reading in result.readings], ["pressure", "flow"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
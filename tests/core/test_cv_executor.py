@@ -0,0 +1,109 @@
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import patch
+
+import numpy as np
+
+from common.tracing.InspectionTrace import InspectionTrace, trace_span
+from core import cv_executor
+from core.cv_executor import CVExecutor, _attach, share_frame
+from cvision.frame.Frame import Frame
+
+
+def _mean_and_shape(frame: Frame, offset: float = 0.0):
+    # module-level so the spawned workers can unpickle it
+    return float(frame.bgr.mean()) + offset, frame.bgr.shape, frame.source_name
+
+
+def _traced_stage(frame: Frame, fail: bool = False):
+    with trace_span("keypoint_inference"):
+        with trace_span("hough"):
+            if fail:
+                raise ValueError("no needle")
+    return frame.bgr.shape
+
+
+class TestSharedFrame(unittest.TestCase):
+
+    def test_attach_returns_the_same_pixels_read_only(self):
+        image = np.arange(4 * 5 * 3, dtype=np.uint8).reshape(4, 5, 3)
+        shm, handle = share_frame(Frame.from_array(image, source_name="wp-1"))
+        try:
+            attached_shm, frame = _attach(handle)
+
+            np.testing.assert_array_equal(frame.bgr, image)
+            self.assertEqual(frame.source_name, "wp-1")
+            self.assertFalse(frame.bgr.flags.writeable)
+
+            del frame
+            attached_shm.close()
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+class TestCVExecutor(unittest.TestCase):
+
+    def test_submit_runs_stage_in_worker_and_releases_shared_memory(self):
+        image = np.full((8, 8, 3), 10, dtype=np.uint8)
+        frame = Frame.from_array(image, source_name="wp-2")
+
+        handles = []
+
+        def _share(shared_frame):
+            shm, handle = share_frame(shared_frame)
+            handles.append(handle)
+            return shm, handle
+
+        with patch.object(cv_executor, "share_frame", side_effect=_share), CVExecutor(
+            workers=2, warm_models=False
+        ) as executor:
+            future = executor.submit(_mean_and_shape, frame, offset=1.0)
+            value, shape, source_name = future.result(timeout=60)
+
+        self.assertEqual(value, 11.0)
+        self.assertEqual(shape, (8, 8, 3))
+        self.assertEqual(source_name, "wp-2")
+        self.assertEqual(len(handles), 1)
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name=handles[0].shm_name)
+
+    def test_map_keeps_input_order(self):
+        frames = [
+            Frame.from_array(np.full((4, 4, 3), value, dtype=np.uint8))
+            for value in (1, 2, 3)
+        ]
+
+        with CVExecutor(workers=2, warm_models=False) as executor:
+            results = executor.map(_mean_and_shape, frames)
+
+        self.assertEqual([value for value, _, _ in results], [1.0, 2.0, 3.0])
+
+    def test_stage_spans_are_merged_into_the_callers_trace(self):
+        frame = Frame.from_array(np.zeros((4, 4, 3), dtype=np.uint8))
+
+        with CVExecutor(workers=1, warm_models=False) as executor:
+            with InspectionTrace() as trace, trace.span("analog_reading"):
+                shape = executor.submit(_traced_stage, frame).result(timeout=60)
+
+        self.assertEqual(shape, (4, 4, 3))
+        spans = {span.name: span for span in trace.spans}
+        self.assertEqual(spans["keypoint_inference"].parent, "analog_reading")
+        self.assertEqual(spans["hough"].parent, "keypoint_inference")
+        self.assertGreaterEqual(spans["keypoint_inference"].start_offset_s, 0.0)
+        self.assertNotEqual(spans["hough"].thread, "MainThread")
+
+    def test_spans_of_a_failing_stage_are_kept(self):
+        frame = Frame.from_array(np.zeros((4, 4, 3), dtype=np.uint8))
+
+        with CVExecutor(workers=1, warm_models=False) as executor:
+            with InspectionTrace() as trace:
+                future = executor.submit(_traced_stage, frame, fail=True)
+                with self.assertRaises(ValueError):
+                    future.result(timeout=60)
+
+        self.assertIn("hough", [span.name for span in trace.spans])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+from PIL import Image
+
+from cvision.analog.key_point_detection.dataset_cache import (
+    CachedKeypointDataSet,
+    augment_batch,
+    build_dataset_cache,
+    open_dataset_cache,
+)
+from cvision.analog.key_point_detection.key_point_dataset import KeypointImageDataSet
+from cvision.analog.key_point_detection.model import N_HEATMAPS
+
+
+def _dataset(directory, n=3):
+    os.makedirs(os.path.join(directory, "images"))
+    os.makedirs(os.path.join(directory, "labels"))
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        pixels = rng.integers(0, 255, size=(300, 300, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(os.path.join(directory, "images", f"{i}.png"))
+        labels = np.zeros((3, 300, 300), dtype=np.float32)
+        labels[0, 50 + i * 10, 60] = 1.0
+        labels[2, 200, 100 + i * 10] = 1.0
+        np.save(os.path.join(directory, "labels", f"{i}.npy"), labels)
+    return KeypointImageDataSet(
+        os.path.join(directory, "images"), os.path.join(directory, "labels")
+    )
+
+
+class TestDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dataset = _dataset(os.path.join(self.directory, "data"))
+        self.cache = os.path.join(self.directory, "cache")
+        build_dataset_cache(self.dataset, self.cache)
+
+    def test_cached_samples_match_the_decoded_ones(self):
+        cached = CachedKeypointDataSet(self.cache)
+
+        self.assertEqual(len(cached), 3)
+        self.assertEqual(cached.images.shape, (3, 448, 448, 3))
+        self.assertEqual(cached.heatmaps.shape, (3, N_HEATMAPS, 448, 448))
+        self.assertEqual(cached.get_name(2), self.dataset.get_name(2))
+        for index in range(3):
+            image, heatmaps = cached[index]
+            expected_image, expected_heatmaps = self.dataset[index]
+            torch.testing.assert_close(image, expected_image, atol=1 / 255, rtol=0)
+            torch.testing.assert_close(
+                heatmaps, expected_heatmaps.clamp(0, 1), atol=1 / 255, rtol=0
+            )
+
+    def test_batch_keeps_the_requested_order(self):
+        cached = CachedKeypointDataSet(self.cache)
+
+        images, heatmaps = cached.batch([2, 0, 1])
+
+        self.assertEqual(images.shape, (3, 3, 448, 448))
+        torch.testing.assert_close(images[0], cached[2][0])
+        torch.testing.assert_close(heatmaps[1], cached[0][1])
+
+    def test_sample_is_reproducible(self):
+        cached = CachedKeypointDataSet(self.cache, train=True)
+
+        first = cached.sample(1, augment=True, seed=7)
+        second = cached.sample(1, augment=True, seed=7)
+
+        torch.testing.assert_close(first[0], second[0])
+        torch.testing.assert_close(first[1], second[1])
+
+    def test_unchanged_files_reuse_the_cache(self):
+        cached = open_dataset_cache(self.cache, self.dataset, train=True)
+
+        self.assertIsInstance(cached, CachedKeypointDataSet)
+        self.assertTrue(cached.train)
+
+    def test_relabelled_image_makes_the_cache_stale(self):
+        label = self.dataset.source_files()[-1]
+        stat = os.stat(label)
+        os.utime(label, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNone(open_dataset_cache(self.cache, self.dataset))
+
+    def test_missing_cache_is_none(self):
+        missing = os.path.join(self.directory, "missing")
+
+        self.assertIsNone(open_dataset_cache(missing, self.dataset))
+
+
+class TestAugmentBatch(unittest.TestCase):
+
+    def test_heatmaps_follow_the_image(self):
+        # a bright blob in the image on top of the start heatmap peak
+        images = torch.zeros(8, 3, 64, 64)
+        heatmaps = torch.zeros(8, N_HEATMAPS, 64, 64)
+        images[:, :, 20:26, 40:46] = 1.0
+        heatmaps[:, 0, 20:26, 40:46] = 1.0
+        generator = torch.Generator().manual_seed(3)
+
+        augmented_images, augmented_heatmaps = augment_batch(
+            images, heatmaps, generator
+        )
+
+        self.assertEqual(augmented_images.shape, images.shape)
+        self.assertTrue(augmented_images.min() >= 0 and augmented_images.max() <= 1)
+        self.assertFalse(torch.equal(augmented_heatmaps, heatmaps))
+        for image, heatmap in zip(augmented_images, augmented_heatmaps):
+            if heatmap[0].max() < 0.5:
+                continue  # blob cropped away
+            blob = image.mean(dim=0) > image.mean(dim=0).max() / 2
+            peak = heatmap[0] > 0.5
+            self.assertGreater((blob & peak).sum() / peak.sum(), 0.8)
+
+
+if __name__ == "__main__":
+    unittest.main()
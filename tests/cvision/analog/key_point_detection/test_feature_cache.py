@@ -0,0 +1,183 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+from PIL import Image
+from torch import nn
+
+from cvision.analog.key_point_detection.dataset_cache import (
+    CachedKeypointDataSet,
+    build_dataset_cache,
+)
+from cvision.analog.key_point_detection.feature_cache import (
+    CachedFeatureDataset,
+    FeatureStore,
+    build_feature_store,
+    open_feature_store,
+    source_digest,
+)
+from cvision.analog.key_point_detection.key_point_dataset import KeypointImageDataSet
+from cvision.analog.key_point_detection.model import INPUT_SIZE, N_HEATMAPS, Decoder
+from cvision.analog.key_point_detection.train_decoder import train_decoder
+
+
+class _CountingEncoder(nn.Module):
+    """Patch-grid features like the DINOv2 encoder, counts the images."""
+
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.pool = nn.AvgPool2d(14)
+        self.project = nn.Conv2d(3, 8, 1)
+        self.images = 0
+
+    def forward(self, x):
+        self.images += len(x)
+        return self.project(self.pool(x))
+
+
+def _dataset(directory, n=3):
+    os.makedirs(os.path.join(directory, "images"))
+    os.makedirs(os.path.join(directory, "labels"))
+    rng = np.random.default_rng(0)
+    for i in range(n):
+        pixels = rng.integers(0, 255, size=(300, 300, 3), dtype=np.uint8)
+        Image.fromarray(pixels).save(os.path.join(directory, "images", f"{i}.png"))
+        labels = np.zeros((3, 300, 300), dtype=np.float32)
+        labels[0, 50 + i * 10, 60] = 1.0
+        labels[2, 200, 100 + i * 10] = 1.0
+        np.save(os.path.join(directory, "labels", f"{i}.npy"), labels)
+    return KeypointImageDataSet(
+        os.path.join(directory, "images"), os.path.join(directory, "labels")
+    )
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dataset = _dataset(os.path.join(self.directory, "data"))
+        self.encoder = _CountingEncoder()
+        self.store = build_feature_store(
+            self.dataset,
+            self.encoder,
+            os.path.join(self.directory, "cache"),
+            variants=3,
+            batch_size=4,
+        )
+
+    def test_every_variant_is_encoded_once(self):
+        # one probe for the shapes plus 3 images x 3 variants
+        self.assertEqual(self.encoder.images, 1 + 9)
+        self.assertEqual(self.store.features.shape, (9, 8, 32, 32))
+        self.assertEqual(self.store.features.dtype, np.float16)
+        self.assertEqual(self.store.targets.shape, (9, N_HEATMAPS, 448, 448))
+
+        # variant 0 is the plain resized image
+        image, _ = self.dataset.sample(1, augment=False, seed=0)
+        with torch.no_grad():
+            expected = self.encoder(image[None])[0].numpy()
+        np.testing.assert_allclose(self.store.features[3], expected, atol=1e-2)
+
+    def test_store_reopens_read_only(self):
+        reopened = FeatureStore(os.path.join(self.directory, "cache"))
+
+        features, targets = CachedFeatureDataset(reopened)[4]
+
+        self.assertEqual(features.dtype, torch.float32)
+        self.assertTrue(0.0 <= targets.min() and targets.max() <= 1.0)
+        np.testing.assert_array_equal(reopened.features[4], self.store.features[4])
+
+    def test_refresh_re_encodes_only_augmented_entries(self):
+        before = np.array(self.store.features)
+
+        refreshed = self.store.refresh(
+            self.dataset, self.encoder, 0.5, np.random.default_rng(0)
+        )
+
+        self.assertEqual(len(refreshed), 3)
+        self.assertTrue(all(entry % 3 > 0 for entry in refreshed))
+        np.testing.assert_array_equal(self.store.generations[refreshed], 1)
+        untouched = np.setdiff1d(np.arange(9), refreshed)
+        np.testing.assert_array_equal(self.store.features[untouched], before[untouched])
+
+    def test_decoder_trains_from_the_cache_alone(self):
+        decoder = Decoder(8, 4, (448, 448), N_HEATMAPS)
+        encoded = self.encoder.images
+
+        losses = train_decoder(
+            decoder, self.store, epochs=3, learning_rate=1e-2, batch_size=4
+        )
+
+        self.assertEqual(self.encoder.images, encoded)
+        self.assertLess(losses[-1], losses[0])
+
+
+class TestOpenFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dataset = _dataset(os.path.join(self.directory, "data"))
+        self.cache = os.path.join(self.directory, "cache")
+        build_feature_store(
+            self.dataset,
+            _CountingEncoder(),
+            self.cache,
+            variants=2,
+            seed=3,
+            sources=source_digest(self.dataset.source_files()),
+        )
+
+    def _open(self, **overrides):
+        settings = dict(
+            dataset=self.dataset,
+            variants=2,
+            seed=3,
+            input_size=INPUT_SIZE,
+        )
+        settings.update(overrides)
+        if "sources" not in settings:
+            settings["sources"] = source_digest(self.dataset.source_files())
+        return open_feature_store(self.cache, **settings)
+
+    def test_unchanged_data_reuses_the_store(self):
+        self.assertIsNotNone(self._open())
+
+    def test_relabelled_image_makes_the_store_stale(self):
+        label = self.dataset.source_files()[-1]
+        stat = os.stat(label)
+        os.utime(label, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        self.assertIsNone(self._open())
+
+    def test_replaced_image_with_the_same_count_makes_the_store_stale(self):
+        images = os.path.join(self.directory, "data", "images")
+        os.rename(os.path.join(images, "2.png"), os.path.join(images, "3.png"))
+        dataset = KeypointImageDataSet(
+            images, os.path.join(self.directory, "data", "labels")
+        )
+
+        self.assertIsNone(
+            self._open(dataset=dataset, sources=source_digest(dataset.source_files()))
+        )
+
+    def test_other_seed_or_input_size_makes_the_store_stale(self):
+        self.assertIsNone(self._open(seed=4))
+        self.assertIsNone(self._open(input_size=(224, 224)))
+
+    def test_store_of_the_dataset_cache_is_not_reused_for_the_images(self):
+        cache = os.path.join(self.directory, "dataset_cache")
+        build_dataset_cache(self.dataset, cache)
+
+        self.assertIsNone(self._open(dataset=CachedKeypointDataSet(cache)))
+
+    def test_missing_store_is_none(self):
+        self.cache = os.path.join(self.directory, "missing")
+
+        self.assertIsNone(self._open())
+
+
+if __name__ == "__main__":
+    unittest.main()
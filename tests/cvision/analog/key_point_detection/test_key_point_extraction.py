@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from cvision.analog.key_point_detection.key_point_extraction import (
+    extract_start_end_points,
+    fast_key_point_extraction,
+    needle_key_points,
+    tick_key_points,
+)
+
+
+def _blob(x: float, y: float, size: int = 112, sigma: float = 2.0) -> np.ndarray:
+    yy, xx = np.mgrid[0:size, 0:size]
+    return np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * sigma**2))
+
+
+class TestFastKeyPointExtraction(unittest.TestCase):
+
+    def test_peaks_are_refined_to_sub_pixel(self):
+        heatmaps = np.stack([_blob(20.3, 80.6), _blob(50, 50), _blob(90.5, 10.25)])
+
+        key_points = fast_key_point_extraction(heatmaps, threshold=0.6)
+
+        np.testing.assert_allclose(key_points[0], [[20.3, 80.6]], atol=0.15)
+        np.testing.assert_allclose(key_points[2], [[90.5, 10.25]], atol=0.15)
+
+    def test_unused_heatmaps_are_skipped(self):
+        heatmaps = np.stack([_blob(20, 80), _blob(50, 50), _blob(90, 10)])
+
+        key_points = fast_key_point_extraction(heatmaps, indices=(0, 2))
+
+        self.assertEqual(len(key_points), 3)
+        self.assertEqual(key_points[1].shape, (0, 2))
+
+    def test_agrees_with_clustering_mode(self):
+        heatmap = _blob(33.4, 61.7)
+
+        fast = fast_key_point_extraction(heatmap[None], threshold=0.6, indices=(0,))
+        cluster = extract_start_end_points(heatmap, threshold=0.6)
+
+        np.testing.assert_allclose(fast[0], cluster, atol=0.5)
+
+    def test_peak_at_the_border(self):
+        key_points = fast_key_point_extraction(_blob(0, 0)[None], indices=(0,))
+
+        # only the visible quarter of the blob is weighted, no wrap-around
+        self.assertTrue(np.all(key_points[0] >= 0.0))
+        np.testing.assert_allclose(key_points[0], [[0.0, 0.0]], atol=1.5)
+
+    def test_empty_heatmap_has_no_key_point(self):
+        heatmaps = np.zeros((3, 16, 16))
+
+        key_points = fast_key_point_extraction(heatmaps)
+
+        self.assertEqual(key_points[0].shape, (0, 2))
+        self.assertEqual(key_points[2].shape, (0, 2))
+
+
+class TestTickKeyPoints(unittest.TestCase):
+
+    def test_pixels_above_the_relative_threshold(self):
+        heatmap = np.zeros((16, 16))
+        heatmap[3, 5] = 1.0
+        heatmap[10, 2] = 0.6
+        heatmap[8, 8] = 0.2
+
+        ticks = tick_key_points(heatmap, threshold=0.5)
+
+        self.assertEqual(sorted(map(tuple, ticks.tolist())), [(2, 10), (5, 3)])
+
+    def test_empty_heatmap_has_no_ticks(self):
+        self.assertEqual(tick_key_points(np.zeros((16, 16))).shape, (0, 2))
+
+    def test_needle_tip_and_axis(self):
+        axis = np.zeros((112, 112))
+        axis[56, 56:90] = 1.0
+
+        tip, points = needle_key_points(_blob(89.4, 56.2), axis)
+
+        np.testing.assert_allclose(tip, [[89.4, 56.2]], atol=0.15)
+        self.assertEqual(len(points), 34)
+        self.assertEqual(needle_key_points(np.zeros((8, 8)), axis)[0].shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
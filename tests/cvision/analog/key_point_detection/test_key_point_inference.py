@@ -0,0 +1,255 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import torch
+from PIL import Image
+
+from cvision.analog.key_point_detection import key_point_inference
+from cvision.analog.key_point_detection.key_point_inference import (
+    DECODE_FULL,
+    DECODE_PATCH,
+    KeyPointInference,
+    detect_key_points,
+)
+from cvision.analog.key_point_detection.model import (
+    INPUT_SIZE,
+    RUNTIME_EAGER,
+    RUNTIME_TORCHSCRIPT,
+    export_model,
+    export_params_path,
+    exported_model_path,
+)
+
+
+class _RecordingModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.inputs = []
+
+    def forward(self, x):
+        self.inputs.append(x.clone())
+        self.last_input_ptr = x.data_ptr()
+        return torch.zeros(x.shape[0], 3, *INPUT_SIZE)
+
+
+class TestKeyPointInference(unittest.TestCase):
+
+    def setUp(self):
+        self.model = _RecordingModel()
+        with patch.object(key_point_inference, "load_model", return_value=self.model):
+            self.inferencer = KeyPointInference("unused.pt")
+
+    def test_ndarray_is_scaled_into_chw_input(self):
+        image = np.zeros((*INPUT_SIZE, 3), dtype=np.uint8)
+        image[..., 0] = 255
+        image[..., 2] = 51
+
+        heatmaps = self.inferencer.predict_heatmaps_from_array(image)
+
+        x = self.model.inputs[0]
+        self.assertEqual(tuple(x.shape), (1, 3, *INPUT_SIZE))
+        self.assertEqual(x.dtype, torch.float32)
+        self.assertTrue(torch.allclose(x[0, 0], torch.ones(INPUT_SIZE)))
+        self.assertTrue(torch.allclose(x[0, 1], torch.zeros(INPUT_SIZE)))
+        self.assertTrue(torch.allclose(x[0, 2], torch.full(INPUT_SIZE, 0.2)))
+        self.assertEqual(heatmaps.shape, (3, *INPUT_SIZE))
+
+    def test_other_sizes_are_resized_once(self):
+        image = np.full((600, 300, 3), 128, dtype=np.uint8)
+
+        self.inferencer.predict_heatmaps_from_array(image)
+
+        x = self.model.inputs[0]
+        self.assertEqual(tuple(x.shape), (1, 3, *INPUT_SIZE))
+        self.assertTrue(torch.allclose(x, torch.full_like(x, 128 / 255.0)))
+
+    def test_tensor_input(self):
+        image_t = torch.rand(3, 100, 120)
+
+        self.inferencer.predict_heatmaps_from_array(image_t)
+
+        x = self.model.inputs[0]
+        self.assertEqual(tuple(x.shape), (1, 3, *INPUT_SIZE))
+        self.assertGreaterEqual(float(x.min()), 0.0)
+        self.assertLessEqual(float(x.max()), 1.0)
+
+    def test_input_buffer_is_reused(self):
+        image = np.zeros((*INPUT_SIZE, 3), dtype=np.uint8)
+
+        self.inferencer.predict_heatmaps_from_array(image)
+        first = self.model.last_input_ptr
+        self.inferencer.predict_heatmaps_from_array(image + 1)
+
+        self.assertEqual(self.model.last_input_ptr, first)
+        self.assertFalse(torch.equal(self.model.inputs[0], self.model.inputs[1]))
+
+    def test_image_bytes_use_the_same_path(self):
+        buf = io.BytesIO()
+        Image.new("RGB", INPUT_SIZE, (255, 0, 0)).save(buf, format="PNG")
+
+        self.inferencer.predict_heatmaps(buf.getvalue())
+
+        x = self.model.inputs[0]
+        self.assertTrue(torch.allclose(x[0, 0], torch.ones(INPUT_SIZE)))
+
+    def test_batch_runs_one_forward_pass(self):
+        images = [np.full((*INPUT_SIZE, 3), v, dtype=np.uint8) for v in (0, 51, 255)]
+
+        heatmaps = self.inferencer.predict_heatmaps_batch(images)
+
+        self.assertEqual(len(self.model.inputs), 1)
+        x = self.model.inputs[0]
+        self.assertEqual(tuple(x.shape), (3, 3, *INPUT_SIZE))
+        self.assertAlmostEqual(float(x[1].mean()), 0.2, places=5)
+        self.assertAlmostEqual(float(x[2].mean()), 1.0, places=5)
+        self.assertEqual(heatmaps.shape, (3, 3, *INPUT_SIZE))
+
+    def test_inference_mode_is_active(self):
+        seen = []
+        self.model.register_forward_hook(
+            lambda *_: seen.append(torch.is_inference_mode_enabled())
+        )
+
+        self.inferencer.predict_heatmaps_from_array(
+            np.zeros((*INPUT_SIZE, 3), dtype=np.uint8)
+        )
+
+        self.assertEqual(seen, [True])
+
+
+class _TinyModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.head = torch.nn.Conv2d(3, 3, 1)
+
+    def forward(self, x):
+        return torch.sigmoid(self.head(x))
+
+
+class TestKeyPointInferenceRuntime(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp.name, "key_point_model.pt")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _export(self, model, decode=DECODE_FULL):
+        export_model(
+            model,
+            exported_model_path(self.model_path, RUNTIME_TORCHSCRIPT),
+            runtime=RUNTIME_TORCHSCRIPT,
+            decode=decode,
+        )
+
+    def test_exported_torchscript_skips_eager_construction(self):
+        model = _TinyModel()
+        self._export(model)
+        images = [np.random.randint(0, 255, (*INPUT_SIZE, 3), dtype=np.uint8)] * 2
+
+        with patch.object(key_point_inference, "load_model") as mock_load_model:
+            inferencer = KeyPointInference(self.model_path, runtime=RUNTIME_TORCHSCRIPT)
+            heatmaps = inferencer.predict_heatmaps_batch(images)
+
+        mock_load_model.assert_not_called()
+        self.assertEqual(inferencer.runtime, RUNTIME_TORCHSCRIPT)
+        with torch.no_grad():
+            expected = model(inferencer.prepare_input(images[0])).numpy()
+        np.testing.assert_allclose(heatmaps[1], expected[0], atol=1e-5)
+
+    def test_missing_export_falls_back_to_eager(self):
+        with patch.object(
+            key_point_inference, "load_model", return_value=_TinyModel()
+        ) as mock_load_model:
+            inferencer = KeyPointInference(self.model_path, runtime=RUNTIME_TORCHSCRIPT)
+
+        mock_load_model.assert_called_once_with(
+            self.model_path, input_size=INPUT_SIZE, upsample=True
+        )
+        self.assertEqual(inferencer.runtime, RUNTIME_EAGER)
+
+    def test_export_with_other_parameters_falls_back_to_eager(self):
+        self._export(_TinyModel(), decode=DECODE_PATCH)
+
+        with patch.object(
+            key_point_inference, "load_model", return_value=_TinyModel()
+        ) as mock_load_model:
+            inferencer = KeyPointInference(self.model_path, runtime=RUNTIME_TORCHSCRIPT)
+
+        mock_load_model.assert_called_once_with(
+            self.model_path, input_size=INPUT_SIZE, upsample=True
+        )
+        self.assertEqual(inferencer.runtime, RUNTIME_EAGER)
+
+    def test_export_without_parameters_falls_back_to_eager(self):
+        self._export(_TinyModel())
+        os.remove(
+            export_params_path(
+                exported_model_path(self.model_path, RUNTIME_TORCHSCRIPT)
+            )
+        )
+
+        with patch.object(key_point_inference, "load_model", return_value=_TinyModel()):
+            inferencer = KeyPointInference(self.model_path, runtime=RUNTIME_TORCHSCRIPT)
+
+        self.assertEqual(inferencer.runtime, RUNTIME_EAGER)
+
+
+class TestKeyPointInferenceInputSize(unittest.TestCase):
+
+    def test_patch_decode_at_smaller_input(self):
+        model = _RecordingModel()
+        with patch.object(
+            key_point_inference, "load_model", return_value=model
+        ) as mock_load_model:
+            inferencer = KeyPointInference(
+                "unused.pt", input_size=(224, 224), decode=DECODE_PATCH
+            )
+        inferencer.predict_heatmaps_from_array(np.zeros((480, 640, 3), np.uint8))
+
+        mock_load_model.assert_called_once_with(
+            "unused.pt", input_size=(224, 224), upsample=False
+        )
+        self.assertEqual(tuple(model.inputs[0].shape), (1, 3, 224, 224))
+
+
+def _grid_blob(x, y, size, sigma=1.0):
+    yy, xx = np.mgrid[0:size, 0:size]
+    return np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * sigma**2))
+
+
+class TestDetectKeyPointsOnPatchGrid(unittest.TestCase):
+
+    def test_grid_peaks_are_mapped_to_input_pixels(self):
+        heatmaps = np.stack(
+            [_grid_blob(10, 20, 32), _grid_blob(16, 16, 32), _grid_blob(3, 5, 32)]
+        )
+
+        key_points = detect_key_points(heatmaps, mode="fast", input_size=(448, 448))
+
+        np.testing.assert_allclose(key_points[0], [[146.5, 286.5]], atol=1e-6)
+        np.testing.assert_allclose(key_points[2], [[48.5, 76.5]], atol=1e-6)
+
+    def test_patch_decode_is_sub_cell_accurate(self):
+        grid = np.stack(
+            [
+                _grid_blob(10.3, 20.6, 32),
+                _grid_blob(16, 16, 32),
+                _grid_blob(25.4, 4.2, 32),
+            ]
+        )
+
+        key_points = detect_key_points(grid, mode="fast", input_size=(448, 448))
+
+        # cell centers: (i + 0.5) * 14 - 0.5, sub-cell error below 0.3 cells
+        np.testing.assert_allclose(key_points[0], [[150.7, 294.9]], atol=4.0)
+        np.testing.assert_allclose(key_points[2], [[362.6, 65.3]], atol=4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
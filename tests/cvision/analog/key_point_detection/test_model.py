@@ -0,0 +1,52 @@
+import unittest
+
+import torch
+
+from cvision.analog.key_point_detection.model import (
+    HEATMAP_NEEDLE_AXIS,
+    N_HEATMAPS,
+    N_NEEDLE_HEATMAPS,
+    Decoder,
+    has_needle_head,
+)
+
+
+class TestDecoderNeedleHead(unittest.TestCase):
+
+    def test_needle_channels_follow_the_key_point_heatmaps(self):
+        torch.manual_seed(0)
+        plain = Decoder(16, 8, (56, 56), N_HEATMAPS)
+        needle = Decoder(16, 8, (56, 56), N_HEATMAPS, N_NEEDLE_HEATMAPS)
+        needle.load_state_dict(plain.state_dict(), strict=False)
+        features = torch.randn(2, 16, 4, 4)
+
+        with torch.no_grad():
+            heatmaps = needle(features)
+            key_points = plain(features)
+
+        self.assertEqual(heatmaps.shape, (2, N_HEATMAPS + N_NEEDLE_HEATMAPS, 56, 56))
+        self.assertEqual(heatmaps.shape[1], HEATMAP_NEEDLE_AXIS + 1)
+        # the key point channels are untouched by the extra head
+        torch.testing.assert_close(heatmaps[:, :N_HEATMAPS], key_points)
+
+    def test_patch_grid_output(self):
+        decoder = Decoder(16, 8, None, N_HEATMAPS, N_NEEDLE_HEATMAPS)
+
+        with torch.no_grad():
+            heatmaps = decoder(torch.randn(1, 16, 4, 4))
+
+        self.assertEqual(heatmaps.shape, (1, 5, 4, 4))
+
+    def test_needle_head_is_detected_in_checkpoints(self):
+        needle = Decoder(16, 8, None, N_HEATMAPS, N_NEEDLE_HEATMAPS)
+        plain = Decoder(16, 8, None, N_HEATMAPS)
+
+        def prefixed(decoder):
+            return {f"decoder.{k}": v for k, v in decoder.state_dict().items()}
+
+        self.assertTrue(has_needle_head(prefixed(needle)))
+        self.assertFalse(has_needle_head(prefixed(plain)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import PropertyMock, patch
+
+import cv2
+import numpy as np
+import torch
+
+from cvision.analog.AnalogGaugeCropper import AnalogGaugeCropper
+from cvision.analog.exceptions.GaugeDetectionFailed import GaugeDetectionFailed
+from cvision.frame.Frame import Frame
+
+
+class _Boxes:
+    def __init__(self, xyxy):
+        self.xyxy = torch.tensor(xyxy, dtype=torch.float32).reshape(-1, 4)
+
+    def __len__(self):
+        return self.xyxy.shape[0]
+
+
+class _Result:
+    def __init__(self, xyxy):
+        self.boxes = _Boxes(xyxy)
+
+
+class _FakeYolo:
+    """Finds the bright gauge squares in whatever image it is given."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def __call__(self, img):
+        self.shapes.append(img.shape[:2])
+        mask = (img[..., 0] > 128).astype(np.uint8)
+        n, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        boxes = [[x, y, x + w, y + h] for x, y, w, h, _ in stats[1:n]]
+        return [_Result(boxes)]
+
+
+def _capture(*boxes, shape=(1080, 1920)):
+    img = np.zeros((*shape, 3), dtype=np.uint8)
+    if boxes and not isinstance(boxes[0], tuple):
+        boxes = (boxes,)
+    for x1, y1, x2, y2 in boxes:
+        img[y1:y2, x1:x2] = 255
+    return Frame.from_array(img, source_name="wp-1")
+
+
+class TestAnalogGaugeCropper(unittest.TestCase):
+
+    def setUp(self):
+        self.yolo = _FakeYolo()
+        patcher = patch.object(AnalogGaugeCropper, "model", new_callable=PropertyMock)
+        patcher.start().return_value = self.yolo
+        self.addCleanup(patcher.stop)
+        settings_patcher = patch("cvision.analog.AnalogGaugeCropper.SettingsManager")
+        settings_patcher.start().return_value.getGaugeCanvasSize.return_value = 448
+        self.addCleanup(settings_patcher.stop)
+        self.cropper = AnalogGaugeCropper()
+
+    def test_first_capture_searches_the_full_frame(self):
+        crop = self.cropper.process(_capture(800, 400, 1000, 600), roi_key=7)
+
+        self.assertEqual(self.yolo.shapes, [(1080, 1920)])
+        # cut once at the gauge canvas size
+        self.assertEqual(crop.bgr.shape, (448, 448, 3))
+        np.testing.assert_array_equal(self.cropper.prior(7), [[800, 400, 1000, 600]])
+
+    def test_known_gauge_is_detected_in_the_expanded_roi(self):
+        self.cropper.process(_capture(800, 400, 1000, 600), roi_key=7)
+
+        crop = self.cropper.process(_capture(810, 405, 1010, 605), roi_key=7)
+
+        # 200 px box expanded by 100 px on every side
+        self.assertEqual(self.yolo.shapes[1], (400, 400))
+        self.assertEqual(len(self.yolo.shapes), 2)
+        np.testing.assert_array_equal(self.cropper.prior(7), [[810, 405, 1010, 605]])
+        self.assertTrue((crop.bgr > 128).all())
+
+    def test_miss_in_roi_falls_back_to_the_full_frame(self):
+        self.cropper.process(_capture(800, 400, 1000, 600), roi_key=7)
+
+        self.cropper.process(_capture(100, 100, 300, 300), roi_key=7)
+
+        self.assertEqual(self.yolo.shapes[1:], [(400, 400), (1080, 1920)])
+        np.testing.assert_array_equal(self.cropper.prior(7), [[100, 100, 300, 300]])
+
+    def test_priors_are_kept_per_key(self):
+        self.cropper.process(_capture(800, 400, 1000, 600), roi_key=7)
+
+        self.cropper.process(_capture(800, 400, 1000, 600), roi_key=8)
+        self.cropper.process(_capture(800, 400, 1000, 600))
+
+        self.assertEqual(self.yolo.shapes[1:], [(1080, 1920), (1080, 1920)])
+        self.cropper.forget(7)
+        self.assertIsNone(self.cropper.prior(7))
+        self.assertIsNotNone(self.cropper.prior(8))
+
+    def test_all_gauges_come_from_one_pass(self):
+        capture = _capture((100, 100, 300, 300), (800, 400, 1000, 600))
+
+        boxes = self.cropper.locate_all(capture.bgr, roi_key=7)
+
+        self.assertEqual(len(self.yolo.shapes), 1)
+        self.assertEqual(
+            sorted(map(tuple, boxes.tolist())),
+            [(100, 100, 300, 300), (800, 400, 1000, 600)],
+        )
+
+    def test_roi_covers_every_prior_box(self):
+        self.cropper.locate_all(
+            _capture((100, 100, 300, 300), (800, 400, 1000, 600)).bgr, roi_key=7
+        )
+
+        boxes = self.cropper.locate_all(
+            _capture((105, 100, 305, 300), (805, 400, 1005, 600)).bgr, roi_key=7
+        )
+
+        # union of both boxes, expanded by 100 px on every side
+        self.assertEqual(self.yolo.shapes[1], (700, 1100))
+        self.assertEqual(len(boxes), 2)
+
+    def test_one_detection_is_not_shared_by_two_priors(self):
+        self.cropper.locate_all(
+            _capture((100, 100, 300, 300), (320, 100, 520, 300)).bgr, roi_key=7
+        )
+
+        # overlaps both priors by more than roi_min_iou
+        boxes = self.cropper.locate_all(_capture(200, 100, 420, 300).bgr, roi_key=7)
+
+        self.assertEqual(self.yolo.shapes[2], (1080, 1920))
+        np.testing.assert_array_equal(boxes, [[200, 100, 420, 300]])
+
+    def test_unmatched_detection_in_roi_falls_back_to_the_full_frame(self):
+        self.cropper.process(_capture(800, 400, 1000, 600), roi_key=7)
+
+        boxes = self.cropper.locate_all(
+            _capture((800, 400, 1000, 600), (1040, 400, 1090, 450)).bgr, roi_key=7
+        )
+
+        self.assertEqual(self.yolo.shapes[1:], [(400, 400), (1080, 1920)])
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual(len(self.cropper.prior(7)), 2)
+
+    def test_no_gauge_raises(self):
+        with self.assertRaises(GaugeDetectionFailed):
+            self.cropper.process(Frame.from_array(np.zeros((100, 100, 3), np.uint8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
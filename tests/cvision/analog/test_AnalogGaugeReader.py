@@ -0,0 +1,504 @@
+import dataclasses
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from cvision.analog.AnalogGaugeReader import (
+    CENTER_METHOD_TICKS,
+    NEEDLE_DETECTOR_HOUGH,
+    NEEDLE_DETECTOR_KEYPOINTS,
+    NEEDLE_DETECTOR_POLAR,
+    AnalogGaugeFailure,
+    AnalogGaugeReader,
+    AnalogGaugeReading,
+    DebugLevel,
+    GaugeCalibration,
+    GaugePreprocessing,
+    read_analog_gauge,
+    read_analog_gauges,
+    read_analog_gauges_in_boxes,
+)
+from cvision.analog.exceptions.NeedleNotFound import NeedleNotFound
+from cvision.analog.KeyPointDetector import GaugeKeyPoints
+from cvision.analog.PolarNeedleEstimator import PolarNeedleEstimator
+from cvision.frame.Frame import Frame
+
+
+def _synthetic_gauge() -> Frame:
+    img = np.full((512, 512, 3), 255, dtype=np.uint8)
+    cv2.circle(img, (256, 256), 200, (0, 0, 0), 6)
+    # needle pointing to the right
+    cv2.line(img, (276, 256), (420, 256), (0, 0, 0), 6)
+    return Frame.from_array(img)
+
+
+def _ticks(cx=224.0, cy=224.0, r=157.5) -> np.ndarray:
+    # 270° scale arc through the bottom gap, in 448x448 keypoint space
+    angles = np.deg2rad(np.linspace(135, 405, 60))
+    return np.column_stack([cx + r * np.cos(angles), cy + r * np.sin(angles)])
+
+
+def _kp_detector(ticks=None) -> MagicMock:
+    detector = MagicMock()
+    # start bottom-left, end bottom-right of the dial (448x448 keypoint space)
+    detector.detect_key_points.return_value = GaugeKeyPoints(
+        start=np.array([[100.0, 350.0]]),
+        end=np.array([[350.0, 350.0]]),
+        resolution=(448, 448),
+        ticks=np.empty((0, 2)) if ticks is None else ticks,
+    )
+    return detector
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderDebugLevel(unittest.TestCase):
+
+    def _read(self, level: str) -> AnalogGaugeReader:
+        with AnalogGaugeReader(
+            img=_synthetic_gauge(), kp_detector=_kp_detector(), debug_level=level
+        ) as reader:
+            x, y, r = reader.calibrate()
+            reader.get_current_value(x=x, y=y, r=r)
+            return list(reader.get_images_log())
+
+    def _configure(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+
+    def test_off_draws_nothing(self, settings_cls):
+        self._configure(settings_cls)
+        self.assertEqual(self._read(DebugLevel.OFF), [])
+
+    def test_final_only_keeps_only_the_final_image(self, settings_cls):
+        self._configure(settings_cls)
+        images = self._read(DebugLevel.FINAL_ONLY)
+        self.assertEqual(len(images), 1)
+
+    def test_final_only_logs_clamped_readings(self, settings_cls):
+        self._configure(settings_cls)
+        with AnalogGaugeReader(
+            img=_synthetic_gauge(),
+            kp_detector=_kp_detector(),
+            debug_level=DebugLevel.FINAL_ONLY,
+        ) as reader:
+            x, y, r = reader.calibrate()
+            # the needle (270°) lies below the scale
+            reader._calibration = dataclasses.replace(
+                reader._calibration, min_angle=300.0, max_angle=350.0
+            )
+            value = reader.get_current_value(x=x, y=y, r=r)
+            images = list(reader.get_images_log())
+
+        self.assertEqual(value, reader.min_value)
+        self.assertEqual(len(images), 1)
+
+    def test_full_keeps_intermediates_as_unencoded_frames(self, settings_cls):
+        self._configure(settings_cls)
+        images = self._read(DebugLevel.FULL)
+
+        self.assertGreater(len(images), 1)
+        self.assertTrue(all(isinstance(image, Frame) for image in images))
+        self.assertTrue(all(image.is_decoded for image in images))
+        # encoding only happens on request, with the configured codec
+        self.assertEqual(images[0].encode(ext=".webp", quality=80)[8:12], b"WEBP")
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderStoredCalibration(unittest.TestCase):
+
+    def _calibration(self, **overrides) -> GaugeCalibration:
+        values = dict(
+            center_x=256,
+            center_y=256,
+            radius=200,
+            min_angle=40.0,
+            max_angle=320.0,
+            min_value=0.0,
+            max_value=0.0,
+            image_width=512,
+            image_height=512,
+        )
+        values.update(overrides)
+        return GaugeCalibration(**values)
+
+    def _read(self, calibration, detector):
+        with patch("cvision.analog.AnalogGaugeReader.ModelRegistry") as registry_cls:
+            registry_cls.return_value.get_key_point_detector.return_value = detector
+            return read_analog_gauge(
+                _synthetic_gauge(), debug_level=DebugLevel.OFF, calibration=calibration
+            )
+
+    def test_valid_calibration_skips_keypoints_and_contours(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = _kp_detector()
+
+        reading = self._read(self._calibration(), detector)
+
+        detector.detect_key_points.assert_not_called()
+        self.assertFalse(reading.recalibrated)
+        self.assertEqual((reading.center_x, reading.radius), (256, 200))
+        # min / max value come from the settings, not from the stored entry
+        self.assertEqual(reading.calibration.max_value, 10.0)
+        # needle to the right is 270° in gauge angles
+        self.assertAlmostEqual(reading.value, (270 - 40) / 280 * 10, delta=0.1)
+
+    def test_calibration_of_other_crop_size_is_scaled(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = _kp_detector()
+
+        reading = self._read(
+            self._calibration(
+                center_x=128,
+                center_y=128,
+                radius=100,
+                image_width=256,
+                image_height=256,
+            ),
+            detector,
+        )
+
+        detector.detect_key_points.assert_not_called()
+        self.assertEqual(
+            (reading.center_x, reading.center_y, reading.radius), (256, 256, 200)
+        )
+
+    def test_drifted_calibration_triggers_recalibration(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = _kp_detector()
+
+        reading = self._read(
+            self._calibration(center_x=150, center_y=300, radius=90), detector
+        )
+
+        detector.detect_key_points.assert_called_once()
+        self.assertTrue(reading.recalibrated)
+        self.assertAlmostEqual(reading.center_x, 256, delta=3)
+        self.assertEqual(reading.calibration.image_width, 512)
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderPreprocessing(unittest.TestCase):
+
+    def test_each_opencv_product_is_computed_once_per_reading(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+
+        with patch(
+            "cvision.analog.AnalogGaugeReader.cv2.Canny", wraps=cv2.Canny
+        ) as canny, patch(
+            "cvision.analog.AnalogGaugeReader.cv2.GaussianBlur", wraps=cv2.GaussianBlur
+        ) as gaussian, patch(
+            "cvision.analog.AnalogGaugeReader.cv2.medianBlur", wraps=cv2.medianBlur
+        ) as median:
+            with AnalogGaugeReader(
+                img=_synthetic_gauge(),
+                kp_detector=_kp_detector(),
+                debug_level=DebugLevel.FULL,
+            ) as reader:
+                x, y, r = reader.calibrate()
+                reader.get_current_value(x=x, y=y, r=r)
+
+        self.assertEqual(canny.call_count, 1)
+        self.assertEqual(gaussian.call_count, 1)
+        self.assertEqual(median.call_count, 1)
+
+    def test_products_are_lazy(self, settings_cls):
+        preprocessing = GaugePreprocessing(_synthetic_gauge())
+
+        self.assertIsNotNone(preprocessing.edges)
+
+        self.assertEqual(preprocessing.computed, [("gaussian",), ("edges",)])
+        self.assertIs(preprocessing.contours(), preprocessing.contours())
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderTickCenter(unittest.TestCase):
+
+    def _calibrate(self, detector):
+        with patch.object(
+            AnalogGaugeReader,
+            "find_gauge_center_combined",
+            wraps=lambda img: (256, 256, 200),
+        ) as contour:
+            with AnalogGaugeReader(
+                img=_synthetic_gauge(),
+                kp_detector=detector,
+                debug_level=DebugLevel.OFF,
+                center_method=CENTER_METHOD_TICKS,
+            ) as reader:
+                return reader.calibrate(), contour
+
+    def test_tick_circle_replaces_the_contour_fit(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = _kp_detector(ticks=_ticks())
+
+        (x, y, r), contour = self._calibrate(detector)
+
+        contour.assert_not_called()
+        detector.detect_key_points.assert_called_once()
+        self.assertAlmostEqual(x, 256, delta=2)
+        self.assertAlmostEqual(y, 256, delta=2)
+        # the rim (drawn at r=200) encloses the tick circle (r=180)
+        self.assertAlmostEqual(r, 200, delta=5)
+
+    def test_without_ticks_the_contour_fit_is_used(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+
+        (x, y, r), contour = self._calibrate(_kp_detector())
+
+        contour.assert_called_once()
+        self.assertEqual((x, y, r), (256, 256, 200))
+
+    def test_short_tick_arc_falls_back_to_contours(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        # 40° of ticks do not pin down the center
+        ticks = _ticks()[:9]
+
+        _, contour = self._calibrate(_kp_detector(ticks=ticks))
+
+        contour.assert_called_once()
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderPolarNeedle(unittest.TestCase):
+
+    def _reader(self, **kwargs) -> AnalogGaugeReader:
+        return AnalogGaugeReader(
+            img=_synthetic_gauge(),
+            kp_detector=_kp_detector(),
+            debug_level=DebugLevel.OFF,
+            calibration=GaugeCalibration(256, 256, 200, 40.0, 320.0, 0.0, 0.0),
+            **kwargs,
+        )
+
+    def test_polar_reading_skips_hough(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+
+        with patch(
+            "cvision.analog.AnalogGaugeReader.cv2.HoughLinesP"
+        ) as hough, self._reader(needle_detector=NEEDLE_DETECTOR_POLAR) as reader:
+            x, y, r = reader.calibrate()
+            value = reader.get_current_value(x=x, y=y, r=r)
+
+        hough.assert_not_called()
+        # needle to the right is 270° in gauge angles
+        self.assertAlmostEqual(value, (270 - 40) / 280 * 10, delta=0.05)
+        self.assertGreater(reader.needle.confidence, 0.5)
+
+    def test_detector_comes_from_the_sensor_config(self, settings_cls):
+        settings = settings_cls.return_value
+        settings.getMinMaxValue.return_value = (0.0, 10.0)
+        settings.getNeedleDetector.return_value = NEEDLE_DETECTOR_POLAR
+
+        with patch.object(
+            PolarNeedleEstimator, "estimate", return_value=None
+        ), self._reader(category="inlet", aruco_id=12) as reader:
+            x, y, r = reader.calibrate()
+            # no -1 sentinel that could be swapped for a fallback value
+            with self.assertRaises(NeedleNotFound):
+                reader.get_current_value(x=x, y=y, r=r)
+
+        settings.getNeedleDetector.assert_called_once_with(
+            category_name="inlet", aruco_id=12
+        )
+
+
+def _gauge_on_canvas(size: int, gauge_angle: float) -> Frame:
+    # _synthetic_gauge drawn at another canvas size, needle at `gauge_angle`
+    scale = size / 512
+    img = np.full((size, size, 3), 255, dtype=np.uint8)
+    c = size // 2
+    cv2.circle(img, (c, c), round(200 * scale), (0, 0, 0), max(1, round(6 * scale)))
+    direction = np.deg2rad(gauge_angle + 90)
+    tail, tip = (
+        (
+            round(c + length * scale * np.cos(direction)),
+            round(c + length * scale * np.sin(direction)),
+        )
+        for length in (20, 140)
+    )
+    cv2.line(img, tail, tip, (0, 0, 0), max(1, round(4 * scale)))
+    return Frame.from_array(img)
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderHoughCanvas(unittest.TestCase):
+
+    def _read(self, size: int, gauge_angle: float) -> float:
+        c = size // 2
+        calibration = GaugeCalibration(
+            c, c, round(200 * size / 512), 40.0, 320.0, 0.0, 0.0, size, size
+        )
+        with AnalogGaugeReader(
+            img=_gauge_on_canvas(size, gauge_angle),
+            kp_detector=_kp_detector(),
+            debug_level=DebugLevel.OFF,
+            calibration=calibration,
+        ) as reader:
+            x, y, r = reader.calibrate()
+            return reader.get_current_value(x=x, y=y, r=r)
+
+    def test_known_angle_on_the_default_canvas(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        settings_cls.return_value.getNeedleDetector.return_value = NEEDLE_DETECTOR_HOUGH
+
+        for gauge_angle in (120.0, 200.0, 300.0):
+            with self.subTest(gauge_angle=gauge_angle):
+                value = self._read(448, gauge_angle)
+                self.assertAlmostEqual(value, (gauge_angle - 40) / 280 * 10, delta=0.05)
+
+    def test_hough_thresholds_follow_the_canvas(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        settings_cls.return_value.getNeedleDetector.return_value = NEEDLE_DETECTOR_HOUGH
+
+        # the needle is shorter than the unscaled vote threshold at 224 px
+        value = self._read(224, 200.0)
+
+        self.assertAlmostEqual(value, 160 / 280 * 10, delta=0.05)
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestAnalogGaugeReaderSinglePass(unittest.TestCase):
+
+    def _detector(self, needle=True):
+        detector = _kp_detector(ticks=_ticks())
+        if needle:
+            # needle to the right, tip at r=140 of the 512 px crop
+            axis = np.column_stack([np.linspace(224, 346.5, 40), np.full(40, 224.0)])
+            detector.detect_key_points.return_value.needle_axis = axis
+            detector.detect_key_points.return_value.needle_tip = axis[-1:]
+        return detector
+
+    def _read(self, detector, calibration=None):
+        with AnalogGaugeReader(
+            img=_synthetic_gauge(),
+            kp_detector=detector,
+            debug_level=DebugLevel.OFF,
+            calibration=calibration,
+            needle_detector=NEEDLE_DETECTOR_KEYPOINTS,
+        ) as reader:
+            x, y, r = reader.calibrate()
+            return (x, y, r), reader.get_current_value(x=x, y=y, r=r), reader
+
+    def test_one_forward_pass_and_no_opencv_chain(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = self._detector()
+
+        with patch(
+            "cvision.analog.AnalogGaugeReader.cv2.Canny", wraps=cv2.Canny
+        ) as canny, patch("cvision.analog.AnalogGaugeReader.cv2.HoughLinesP") as hough:
+            (x, _, r), value, reader = self._read(detector)
+
+        detector.detect_key_points.assert_called_once()
+        canny.assert_not_called()
+        hough.assert_not_called()
+        self.assertAlmostEqual(x, 256, delta=2)
+        # tick circle radius, no rim search
+        self.assertAlmostEqual(r, 180, delta=2)
+        # start / end at 42.5° / 317.5°, needle at 270°
+        span = reader.calibration.max_angle - reader.calibration.min_angle
+        expected = (270 - reader.calibration.min_angle) / span * 10
+        self.assertAlmostEqual(value, expected, delta=0.05)
+
+    def test_stored_calibration_is_not_reused(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        calibration = GaugeCalibration(256, 256, 200, 40.0, 320.0, 0.0, 0.0, 512, 512)
+
+        _, _, reader = self._read(self._detector(), calibration=calibration)
+
+        self.assertTrue(reader.recalibrated)
+
+    def test_model_without_needle_head_fails_loudly(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+
+        with self.assertRaises(NeedleNotFound):
+            self._read(self._detector(needle=False))
+
+
+@patch("cvision.analog.AnalogGaugeReader.SettingsManager")
+class TestReadAnalogGauges(unittest.TestCase):
+
+    def _detector(self):
+        detector = _kp_detector()
+        detector.detect_key_points_batch.side_effect = lambda frames: [
+            detector.detect_key_points.return_value for _ in frames
+        ]
+        return detector
+
+    def _read(self, detector, *args, reader=read_analog_gauges, **kwargs):
+        with patch("cvision.analog.AnalogGaugeReader.ModelRegistry") as registry_cls:
+            registry_cls.return_value.get_key_point_detector.return_value = detector
+            return reader(*args, debug_level=DebugLevel.OFF, **kwargs)
+
+    def test_key_points_of_all_gauges_come_from_one_batch(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = self._detector()
+
+        readings = self._read(
+            detector,
+            [_synthetic_gauge(), _synthetic_gauge()],
+            ["pressure", "flow"],
+            aruco_ids=[7, 8],
+        )
+
+        detector.detect_key_points_batch.assert_called_once()
+        self.assertEqual(len(detector.detect_key_points_batch.call_args[0][0]), 2)
+        detector.detect_key_points.assert_not_called()
+        self.assertEqual(len(readings), 2)
+        self.assertTrue(all(reading.recalibrated for reading in readings))
+        settings_cls.return_value.getMinMaxValue.assert_any_call(
+            category_name="flow", aruco_id=8
+        )
+
+    def test_gauges_with_a_valid_calibration_are_not_batched(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        detector = self._detector()
+        calibration = GaugeCalibration(256, 256, 200, 40.0, 320.0, 0.0, 0.0, 512, 512)
+
+        readings = self._read(
+            detector,
+            [_synthetic_gauge(), _synthetic_gauge()],
+            ["pressure", "pressure"],
+            calibrations=[calibration, None],
+        )
+
+        self.assertEqual(len(detector.detect_key_points_batch.call_args[0][0]), 1)
+        self.assertFalse(readings[0].recalibrated)
+        self.assertTrue(readings[1].recalibrated)
+
+    def test_unreadable_gauge_yields_its_failure(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        blank = Frame.from_array(np.full((512, 512, 3), 255, dtype=np.uint8))
+
+        readings = self._read(
+            self._detector(), [blank, _synthetic_gauge()], ["flow", "pressure"]
+        )
+
+        self.assertIsInstance(readings[0], AnalogGaugeFailure)
+        self.assertEqual(readings[0].category, "flow")
+        self.assertEqual(readings[0].error_code, 1765392500)
+        self.assertIn("1765392500", readings[0].error)
+        self.assertIsInstance(readings[1], AnalogGaugeReading)
+
+    def test_boxes_are_cropped_from_the_capture(self, settings_cls):
+        settings_cls.return_value.getMinMaxValue.return_value = (0.0, 10.0)
+        settings_cls.return_value.getGaugeCanvasSize.return_value = 512
+        capture = np.zeros((600, 1200, 3), dtype=np.uint8)
+        capture[50:562, 20:532] = _synthetic_gauge().bgr
+        capture[50:562, 640:1152] = _synthetic_gauge().bgr
+
+        readings = self._read(
+            self._detector(),
+            Frame.from_array(capture),
+            [np.array([20, 50, 532, 562]), np.array([640, 50, 1152, 562])],
+            ["pressure", "pressure"],
+            reader=read_analog_gauges_in_boxes,
+        )
+
+        self.assertEqual(len(readings), 2)
+        for reading in readings:
+            self.assertAlmostEqual(reading.center_x, 256, delta=6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+
+from cvision.analog.AnalogGaugeReader import GaugeCalibration
+from cvision.analog.GaugeCalibrationStore import GaugeCalibrationStore
+from db.dal.exceptions.DataAccessLayerError import DataAccessLayerError
+from db.mapping.input.GaugeCalibrationMapper import GaugeCalibrationMapper
+
+
+def _calibration() -> GaugeCalibration:
+    return GaugeCalibration(
+        center_x=100,
+        center_y=110,
+        radius=80,
+        min_angle=45.0,
+        max_angle=315.0,
+        min_value=0.0,
+        max_value=10.0,
+        image_width=220,
+        image_height=230,
+    )
+
+
+class TestGaugeCalibrationStore(unittest.TestCase):
+
+    def test_get_loads_from_dal_once_then_from_memory(self):
+        dal = MagicMock()
+        dal.get_gauge_calibration.return_value = GaugeCalibrationMapper.map_row(
+            (7, "pressure", 100, 110, 80, 45.0, 315.0, 220, 230)
+        )
+        store = GaugeCalibrationStore()
+
+        first = store.get(dal=dal, aruco_id=7, category="pressure")
+        second = store.get(dal=dal, aruco_id=7, category="pressure")
+
+        self.assertIs(first, second)
+        self.assertEqual((first.center_x, first.radius), (100, 80))
+        self.assertEqual(first.image_height, 230)
+        dal.get_gauge_calibration.assert_called_once_with(
+            aruco_id=7, category="pressure"
+        )
+
+    def test_unknown_gauge_is_never_looked_up(self):
+        dal = MagicMock()
+        store = GaugeCalibrationStore()
+
+        self.assertIsNone(store.get(dal=dal, aruco_id=None, category="pressure"))
+        dal.get_gauge_calibration.assert_not_called()
+
+    def test_put_caches_and_persists(self):
+        dal = MagicMock()
+        store = GaugeCalibrationStore()
+
+        store.put(dal=dal, aruco_id=7, category="pressure", calibration=_calibration())
+
+        dto = dal.upsert_gauge_calibration.call_args.kwargs["calibration_with_metadata"]
+        self.assertEqual((dto.aruco_id, dto.center_y, dto.image_width), (7, 110, 220))
+        self.assertEqual(
+            store.get(dal=dal, aruco_id=7, category="pressure"), _calibration()
+        )
+        dal.get_gauge_calibration.assert_not_called()
+
+    def test_storage_errors_do_not_fail_the_reading(self):
+        dal = MagicMock()
+        error = DataAccessLayerError(exception=Exception("locked"), error_code=1)
+        dal.get_gauge_calibration.side_effect = error
+        dal.upsert_gauge_calibration.side_effect = error
+        store = GaugeCalibrationStore()
+
+        self.assertIsNone(store.get(dal=dal, aruco_id=7, category="pressure"))
+        store.put(dal=dal, aruco_id=7, category="pressure", calibration=_calibration())
+
+    def test_invalidate_drops_matching_entries(self):
+        dal = MagicMock()
+        dal.get_gauge_calibration.return_value = None
+        store = GaugeCalibrationStore()
+        store.put(dal=dal, aruco_id=7, category="pressure", calibration=_calibration())
+        store.put(dal=dal, aruco_id=8, category="pressure", calibration=_calibration())
+
+        store.invalidate(aruco_id=7)
+
+        self.assertIsNone(store.get(dal=dal, aruco_id=7, category="pressure"))
+        self.assertIsNotNone(store.get(dal=dal, aruco_id=8, category="pressure"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from cvision.analog.GaugeSensorMapper import GaugeSensorMapper
+
+
+def _mapper(categories: dict) -> GaugeSensorMapper:
+    settings = MagicMock()
+    settings.getAnalogCategoriesByNodeID.side_effect = lambda aruco_id: categories.get(
+        aruco_id, []
+    )
+    return GaugeSensorMapper(settings_manager=settings)
+
+
+class TestGaugeSensorMapper(unittest.TestCase):
+
+    def test_gauges_take_the_category_of_the_nearest_marker(self):
+        mapper = _mapper({7: ["pressure"], 8: ["flow"]})
+        boxes = [np.array([800, 100, 1000, 300]), np.array([100, 100, 300, 300])]
+        markers = [(8, (900.0, 350.0)), (7, (200.0, 350.0))]
+
+        assignments = mapper.assign(boxes, markers)
+
+        by_index = {a.index: a for a in assignments}
+        self.assertEqual((by_index[0].category, by_index[0].aruco_id), ("flow", 8))
+        self.assertEqual((by_index[1].category, by_index[1].aruco_id), ("pressure", 7))
+        self.assertEqual(by_index[0].marker_id, 8)
+
+    def test_categories_of_one_marker_are_handed_out_left_to_right(self):
+        mapper = _mapper({7: ["inlet", "outlet"]})
+        boxes = [np.array([400, 100, 600, 300]), np.array([100, 100, 300, 300])]
+
+        assignments = mapper.assign(boxes, [(7, (350.0, 350.0))])
+
+        self.assertEqual(
+            [(a.index, a.category) for a in assignments], [(1, "inlet"), (0, "outlet")]
+        )
+
+    def test_unclaimed_gauge_falls_back_to_the_node_without_marker(self):
+        mapper = _mapper({None: ["pressure"], 46: []})
+        boxes = [np.array([100, 100, 300, 300]), np.array([800, 100, 1000, 300])]
+
+        assignments = mapper.assign(
+            boxes, [(46, (200.0, 350.0))], fallback_marker_id=46
+        )
+
+        # the second gauge cannot be attributed to any sensor
+        self.assertEqual(len(assignments), 1)
+        self.assertEqual(assignments[0].category, "pressure")
+        self.assertIsNone(assignments[0].aruco_id)
+        self.assertEqual(assignments[0].marker_id, 46)
+
+    def test_far_markers_are_ignored(self):
+        mapper = _mapper({7: ["pressure"], None: ["fallback"]})
+
+        assignments = mapper.assign(
+            [np.array([100, 100, 200, 200])], [(7, (1500.0, 900.0))]
+        )
+
+        self.assertEqual(assignments[0].category, "fallback")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from cvision.analog.HeatmapNeedleEstimator import HeatmapNeedleEstimator
+
+
+def _axis(image_deg: float, cx=256.0, cy=256.0, length=160.0) -> np.ndarray:
+    rad = np.deg2rad(image_deg)
+    distance = np.linspace(-20, length, 90)
+    return np.column_stack([cx + distance * np.cos(rad), cy + distance * np.sin(rad)])
+
+
+class TestHeatmapNeedleEstimator(unittest.TestCase):
+
+    def test_tip_and_axis_agree(self):
+        axis = _axis(30.0)
+
+        needle = HeatmapNeedleEstimator().estimate(axis[-1:], axis, 256, 256, 200)
+
+        self.assertAlmostEqual(needle.angle, (30.0 - 90) % 360, delta=0.1)
+        self.assertEqual((needle.tip_x, needle.tip_y), tuple(np.rint(axis[-1])))
+        self.assertAlmostEqual(needle.confidence, 1.0)
+
+    def test_axis_alone_gives_the_angle(self):
+        rng = np.random.default_rng(0)
+        # a few stray pixels elsewhere on the face
+        axis = np.vstack([_axis(200.0), rng.uniform(100, 400, size=(10, 2))])
+
+        needle = HeatmapNeedleEstimator().estimate(
+            np.empty((0, 2)), axis, 256, 256, 200
+        )
+
+        self.assertAlmostEqual(needle.angle, (200.0 - 90) % 360, delta=1.0)
+        self.assertGreater(needle.confidence, 0.8)
+
+    def test_tip_and_axis_vote_equally(self):
+        axis = _axis(95.0)
+        tip = _axis(97.0)[-1:]
+
+        needle = HeatmapNeedleEstimator().estimate(tip, axis, 256, 256, 200)
+
+        # halfway between the axis (5°) and the tip (7°) in gauge angles
+        self.assertAlmostEqual(needle.angle, 6.0, delta=0.3)
+
+    def test_empty_heatmaps_have_no_needle(self):
+        empty = np.empty((0, 2))
+
+        self.assertIsNone(HeatmapNeedleEstimator().estimate(empty, empty, 0, 0, 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
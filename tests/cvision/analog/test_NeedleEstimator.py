@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from cvision.analog.NeedleEstimator import NeedleEstimator
+
+CENTER = (200.0, 200.0)
+RADIUS = 150.0
+
+
+def _needle_segments(image_angle_deg: float, width: float = 3.0) -> np.ndarray:
+    """Both edge lines of a thick needle pointing at image_angle_deg."""
+    theta = np.deg2rad(image_angle_deg)
+    direction = np.array([np.cos(theta), np.sin(theta)])
+    normal = np.array([-direction[1], direction[0]])
+    center = np.array(CENTER)
+
+    segments = []
+    for side in (-1, 1):
+        start = center + 0.1 * RADIUS * direction + side * width * normal
+        end = center + 0.9 * RADIUS * direction + side * width * normal
+        segments.append([*start, *end])
+    return np.array(segments)
+
+
+class TestNeedleEstimator(unittest.TestCase):
+
+    def setUp(self):
+        self.estimator = NeedleEstimator()
+
+    def test_consensus_of_both_needle_edges(self):
+        estimate = self.estimator.estimate(_needle_segments(37.3), *CENTER, RADIUS)
+
+        # image angle 37.3° -> gauge angle (37.3 - 90) % 360
+        self.assertAlmostEqual(estimate.angle, 307.3, delta=0.5)
+        self.assertEqual(estimate.support, 2)
+        self.assertAlmostEqual(estimate.confidence, 1.0)
+
+    def test_clutter_does_not_move_the_needle(self):
+        rng = np.random.default_rng(0)
+        # thousands of short segments that do not point through the center
+        starts = rng.uniform(0, 400, size=(5000, 2))
+        angles = rng.uniform(0, 2 * np.pi, size=5000)
+        ends = starts + 15 * np.column_stack((np.cos(angles), np.sin(angles)))
+        clutter = np.hstack((starts, ends))
+        segments = np.vstack((clutter, _needle_segments(120.0)))
+
+        estimate = self.estimator.estimate(segments, *CENTER, RADIUS)
+
+        self.assertAlmostEqual(estimate.angle, 30.0, delta=1.0)
+        self.assertGreater(estimate.confidence, 0.5)
+
+    def test_tip_lies_at_the_far_end(self):
+        estimate = self.estimator.estimate(_needle_segments(0.0), *CENTER, RADIUS)
+
+        self.assertAlmostEqual(estimate.tip_x, CENTER[0] + 0.9 * RADIUS, delta=2)
+        self.assertAlmostEqual(estimate.tip_y, CENTER[1], delta=2)
+
+    def test_accepts_hough_output_shape(self):
+        lines = _needle_segments(200.0).astype(np.int32).reshape(-1, 1, 4)
+
+        estimate = self.estimator.estimate(lines, *CENTER, RADIUS)
+
+        self.assertAlmostEqual(estimate.angle, 110.0, delta=1.0)
+
+    def test_no_segment_in_radius_band(self):
+        far_away = np.array([[0.0, 0.0, 10.0, 10.0]])
+
+        self.assertIsNone(self.estimator.estimate(None, *CENTER, RADIUS))
+        self.assertIsNone(self.estimator.estimate(far_away, *CENTER, RADIUS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+import cv2
+import numpy as np
+
+from cvision.analog.PolarNeedleEstimator import PolarNeedleEstimator
+
+
+def _face(needle_deg: float, width: int = 6, second_deg=None) -> np.ndarray:
+    """Gray dial with rim, ticks and a needle at an image angle in degrees."""
+    img = np.full((512, 512), 230, dtype=np.uint8)
+    cv2.circle(img, (256, 256), 200, 0, 6)
+    for tick in np.deg2rad(np.arange(135, 406, 27)):
+        p1 = (int(256 + 170 * np.cos(tick)), int(256 + 170 * np.sin(tick)))
+        p2 = (int(256 + 190 * np.cos(tick)), int(256 + 190 * np.sin(tick)))
+        cv2.line(img, p1, p2, 0, 3)
+    cv2.circle(img, (256, 256), 15, 20, -1)
+    for angle in [needle_deg] + ([second_deg] if second_deg is not None else []):
+        rad = np.deg2rad(angle)
+        tip = (round(256 + 160 * np.cos(rad)), round(256 + 160 * np.sin(rad)))
+        cv2.line(img, (256, 256), tip, 10, width, cv2.LINE_AA)
+    return img
+
+
+class TestPolarNeedleEstimator(unittest.TestCase):
+
+    def test_needle_angle_is_sub_degree(self):
+        estimator = PolarNeedleEstimator()
+
+        for image_deg in (0.0, 33.3, 181.7, 300.25):
+            needle = estimator.estimate(_face(image_deg), 256, 256, 200)
+
+            expected = (image_deg - 90) % 360
+            delta = (needle.angle - expected + 180) % 360 - 180
+            self.assertLess(abs(delta), 0.5, image_deg)
+
+    def test_tip_and_confidence(self):
+        needle = PolarNeedleEstimator().estimate(_face(0.0), 256, 256, 200)
+
+        self.assertAlmostEqual(needle.tip_x, 256 + 160, delta=6)
+        self.assertAlmostEqual(needle.tip_y, 256, delta=2)
+        self.assertGreater(needle.confidence, 0.8)
+
+    def test_two_equal_needles_have_no_confidence(self):
+        needle = PolarNeedleEstimator().estimate(
+            _face(0.0, second_deg=120.0), 256, 256, 200
+        )
+
+        self.assertLess(needle.confidence, 0.1)
+
+    def test_blank_face_has_no_needle(self):
+        face = np.full((512, 512), 230, dtype=np.uint8)
+        cv2.circle(face, (256, 256), 200, 0, 6)
+
+        self.assertIsNone(PolarNeedleEstimator().estimate(face, 256, 256, 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from cvision.analog.TickCircleEstimator import TickCircleEstimator
+
+
+def _arc(cx, cy, r, start, stop, n=80, noise=0.0, seed=1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    angles = np.deg2rad(np.linspace(start, stop, n))
+    radii = r + rng.normal(0, noise, n)
+    return np.column_stack([cx + radii * np.cos(angles), cy + radii * np.sin(angles)])
+
+
+class TestTickCircleEstimator(unittest.TestCase):
+
+    def test_noisy_arc_with_outliers(self):
+        rng = np.random.default_rng(2)
+        points = np.vstack(
+            [
+                _arc(250, 240, 180, 135, 405, noise=1.5),
+                # needle and label pixels inside the dial
+                rng.uniform(150, 350, size=(30, 2)),
+            ]
+        )
+
+        estimate = TickCircleEstimator().fit(points)
+
+        self.assertAlmostEqual(estimate.center_x, 250, delta=1.5)
+        self.assertAlmostEqual(estimate.center_y, 240, delta=1.5)
+        self.assertAlmostEqual(estimate.radius, 180, delta=1.5)
+        self.assertGreater(estimate.arc, 260)
+        self.assertLess(estimate.inlier_ratio, 0.9)
+
+    def test_least_squares_is_exact_on_a_clean_circle(self):
+        cx, cy, r = TickCircleEstimator.least_squares(_arc(10, -5, 42, 0, 300))
+
+        np.testing.assert_allclose([cx, cy, r], [10, -5, 42], atol=1e-6)
+
+    def test_short_arc_is_rejected(self):
+        points = _arc(250, 240, 180, 80, 140)
+
+        self.assertIsNone(TickCircleEstimator(min_arc=90).fit(points))
+
+    def test_too_few_points(self):
+        self.assertIsNone(TickCircleEstimator().fit(_arc(0, 0, 10, 0, 270, n=5)))
+
+    def test_large_point_sets_are_subsampled(self):
+        points = _arc(100, 100, 60, 0, 270, n=20000, noise=0.5)
+
+        estimate = TickCircleEstimator(max_points=500).fit(points)
+
+        self.assertAlmostEqual(estimate.radius, 60, delta=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+
+import cv2
+import numpy as np
+
+from cvision.frame.exceptions.FrameDecodingFailed import FrameDecodingFailed
+from cvision.frame.Frame import Frame
+
+
+def _png_bytes(img: np.ndarray) -> bytes:
+    success, encoded = cv2.imencode(".png", img)
+    assert success
+    return encoded.tobytes()
+
+
+class TestFrame(unittest.TestCase):
+
+    def setUp(self):
+        self.img = np.zeros((40, 60, 3), dtype=np.uint8)
+        self.img[:, :, 2] = 255  # red in BGR
+        self.img_bytes = _png_bytes(self.img)
+
+    def test_requires_image_or_bytes(self):
+        with self.assertRaises(ValueError):
+            Frame()
+
+    def test_bytes_are_decoded_lazily_and_once(self):
+        frame = Frame.from_bytes(self.img_bytes)
+        self.assertFalse(frame.is_decoded)
+
+        with patch("cvision.frame.Frame.cv2.imdecode", wraps=cv2.imdecode) as dec:
+            _ = frame.bgr
+            _ = frame.gray
+            _ = frame.rgb
+            _ = frame.bgr
+
+        dec.assert_called_once()
+        self.assertTrue(frame.is_decoded)
+        np.testing.assert_array_equal(frame.bgr, self.img)
+
+    def test_invalid_bytes_raise(self):
+        frame = Frame.from_bytes(b"not-an-image")
+        with self.assertRaises(FrameDecodingFailed):
+            _ = frame.bgr
+
+    def test_derived_views_are_memoized(self):
+        frame = Frame.from_array(self.img)
+        self.assertIs(frame.gray, frame.gray)
+        self.assertIs(frame.resized((30, 20)), frame.resized((30, 20)))
+        self.assertEqual(frame.resized((30, 20)).shape, (20, 30, 3))
+
+    def test_resized_rgb_swaps_channels(self):
+        frame = Frame.from_array(self.img)
+        rgb = frame.resized((60, 40), rgb=True)
+        self.assertEqual(rgb[0, 0, 0], 255)
+        self.assertEqual(rgb[0, 0, 2], 0)
+
+    def test_encode_without_ext_returns_original_bytes(self):
+        frame = Frame.from_bytes(self.img_bytes)
+        self.assertIs(frame.encode(), self.img_bytes)
+        self.assertFalse(frame.is_decoded)
+
+    def test_encode_is_memoized_per_codec(self):
+        frame = Frame.from_array(self.img)
+        jpg = frame.encode(".jpg", quality=80)
+        self.assertIs(frame.encode(".jpg", quality=80), jpg)
+        self.assertTrue(jpg.startswith(b"\xff\xd8"))
+        self.assertTrue(frame.encode().startswith(b"\x89PNG"))
+
+    def test_crop_returns_new_frame(self):
+        frame = Frame.from_array(self.img, source_name="cam")
+        cropped = frame.crop(10, 5, 30, 25)
+        self.assertEqual(cropped.shape, (20, 20, 3))
+        self.assertEqual(cropped.source_name, "cam")
+
+    def test_drawing_on_crop_leaves_frame_untouched(self):
+        frame = Frame.from_array(self.img.copy())
+        before = frame.bgr.copy()
+
+        cropped = frame.crop(10, 5, 30, 25)
+        cropped.bgr[:] = 255
+
+        np.testing.assert_array_equal(frame.bgr, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from cvision.registry.exceptions.ModelLoadError import ModelLoadError
+from cvision.registry.ModelRegistry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = ModelRegistry()
+        self.registry.clear()
+
+    def tearDown(self):
+        self.registry.clear()
+
+    def test_registry_is_singleton(self):
+        self.assertIs(ModelRegistry(), self.registry)
+
+    def test_concurrent_construction_builds_one_registry(self):
+        barrier = threading.Barrier(8)
+        registries = []
+
+        def construct():
+            barrier.wait()
+            registries.append(ModelRegistry())
+
+        with patch.object(ModelRegistry, "_instance", None):
+            threads = [threading.Thread(target=construct) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len({id(registry) for registry in registries}), 1)
+
+    def test_yolo_model_is_loaded_once_per_path(self):
+        fake_ultralytics = MagicMock()
+        with patch.dict(sys.modules, {"ultralytics": fake_ultralytics}):
+            first = self.registry.get_yolo_model("model.pt")
+            second = self.registry.get_yolo_model("model.pt")
+
+        self.assertIs(first, second)
+        fake_ultralytics.YOLO.assert_called_once_with("model.pt")
+        self.assertTrue(self.registry.is_loaded(("yolo", "model.pt")))
+
+    def test_different_paths_are_different_models(self):
+        fake_ultralytics = MagicMock()
+        fake_ultralytics.YOLO.side_effect = lambda path: object()
+        with patch.dict(sys.modules, {"ultralytics": fake_ultralytics}):
+            first = self.registry.get_yolo_model("a.pt")
+            second = self.registry.get_yolo_model("b.pt")
+
+        self.assertIsNot(first, second)
+        self.assertEqual(fake_ultralytics.YOLO.call_count, 2)
+
+    def test_ocr_reader_is_keyed_by_languages_and_gpu(self):
+        fake_easyocr = MagicMock()
+        with patch.dict(sys.modules, {"easyocr": fake_easyocr}):
+            self.registry.get_ocr_reader(["en", "de"], gpu=False)
+            self.registry.get_ocr_reader(["en", "de"], gpu=False)
+            self.registry.get_ocr_reader(["en"], gpu=False)
+
+        self.assertEqual(fake_easyocr.Reader.call_count, 2)
+
+    def test_load_failure_raises_model_load_error(self):
+        fake_ultralytics = MagicMock()
+        fake_ultralytics.YOLO.side_effect = FileNotFoundError("missing")
+        with patch.dict(sys.modules, {"ultralytics": fake_ultralytics}):
+            with self.assertRaises(ModelLoadError):
+                self.registry.get_yolo_model("missing.pt")
+
+        self.assertFalse(self.registry.is_loaded(("yolo", "missing.pt")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cvision.registry.PipelineFingerprint import (
+    content_hash,
+    file_digest,
+    key_point_model_paths,
+    pipeline_fingerprint,
+)
+
+
+class TestPipelineFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = os.path.join(self.tmp.name, "model.pt")
+        self.config = os.path.join(self.tmp.name, "sensors.yaml")
+        with open(self.model, "wb") as f:
+            f.write(b"weights-v1")
+        with open(self.config, "w") as f:
+            f.write("score_function: linear\n")
+        self.key_points = {
+            "runtime": "eager",
+            "input_size": 448,
+            "decode": "full",
+            "extraction": "fast",
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _fingerprint(self) -> str:
+        return pipeline_fingerprint(
+            model_paths=[self.model],
+            config_paths=[self.config],
+            key_points=self.key_points,
+        )
+
+    def test_fingerprint_is_stable_without_changes(self):
+        self.assertEqual(self._fingerprint(), self._fingerprint())
+
+    def test_changed_model_file_changes_fingerprint(self):
+        before = self._fingerprint()
+        with open(self.model, "wb") as f:
+            f.write(b"weights-v2-retrained")
+
+        self.assertNotEqual(self._fingerprint(), before)
+
+    def test_changed_score_function_changes_fingerprint(self):
+        before = self._fingerprint()
+        with open(self.config, "w") as f:
+            f.write("score_function: gaussian\n")
+
+        self.assertNotEqual(self._fingerprint(), before)
+
+    def test_changed_key_point_settings_change_fingerprint(self):
+        before = self._fingerprint()
+        self.key_points["decode"] = "patch"
+
+        self.assertNotEqual(self._fingerprint(), before)
+
+    def test_re_exported_graph_changes_fingerprint(self):
+        checkpoint = os.path.join(self.tmp.name, "key_point_model.pt")
+        graph = os.path.join(self.tmp.name, "key_point_model.onnx")
+        with open(graph, "wb") as f:
+            f.write(b"graph-448")
+        self.key_points["runtime"] = "onnx"
+
+        def fingerprint():
+            return pipeline_fingerprint(
+                config_paths=[self.config], key_points=self.key_points
+            )
+
+        with patch(
+            "cvision.registry.PipelineFingerprint.KEY_POINT_MODEL_PATH", checkpoint
+        ):
+            self.assertEqual(key_point_model_paths("onnx"), [checkpoint, graph])
+            self.assertEqual(key_point_model_paths("eager"), [checkpoint])
+            before = fingerprint()
+            with open(graph, "wb") as f:
+                f.write(b"graph-336-patch-decode")
+
+            self.assertNotEqual(fingerprint(), before)
+
+    def test_missing_file_has_placeholder_digest(self):
+        self.assertEqual(file_digest(os.path.join(self.tmp.name, "nope")), "missing")
+
+    def test_content_hash_depends_on_bytes_only(self):
+        self.assertEqual(content_hash(b"jpeg"), content_hash(b"jpeg"))
+        self.assertNotEqual(content_hash(b"jpeg"), content_hash(b"jpeg2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from common.tracing.InspectionTrace import InspectionTrace
+from db.dal.DataAccessLayer import DataAccessLayer
+from db.dal.exceptions.DataAccessLayerError import DataAccessLayerError
+from db.dal.WriteBehindQueue import WriteBehindQueue
+from db.mapping.input.InspectionTraceMapper import InspectionTraceDTO
+from db.mapping.input.RawImageMapper import RawImageDTO
+
+
+def _raw_dto(name="raw"):
+    image_data = b"\xff\xd8\xff\xdb"
+    return RawImageDTO(
+        bucket="raw-bucket",
+        name=name,
+        format="jpg",
+        image_data=image_data,
+        content_type="image/jpeg",
+        size=len(image_data),
+    )
+
+
+def _meta_repository():
+    meta = MagicMock()
+    meta.transaction.return_value.__enter__.return_value = MagicMock()
+    meta.transaction.return_value.__exit__.return_value = False
+    return meta
+
+
+@patch("db.dal.WriteBehindQueue.MediaRepository")
+class TestWriteBehindQueue(unittest.TestCase):
+
+    def test_future_resolves_to_row_id_and_uploads(self, MediaRepoMock):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.return_value = (7, "raw")
+
+        write_queue = WriteBehindQueue(meta_repository=meta)
+        future = write_queue.submit_raw_image(_raw_dto())
+        self.assertEqual(future.result(timeout=5), 7)
+        write_queue.close()
+
+        MediaRepoMock.assert_called_once_with(bucket_name="raw-bucket")
+        MediaRepoMock.return_value.put_media.assert_called_once_with(
+            object_name="raw.jpg",
+            image_data=b"\xff\xd8\xff\xdb",
+            content_type="image/jpeg",
+        )
+
+    def test_pending_jobs_are_written_in_one_transaction(self, MediaRepoMock):
+        meta = _meta_repository()
+        release = threading.Event()
+        ids = iter(range(1, 10))
+
+        def _insert(metadata, cursor):
+            release.wait(timeout=5)
+            return next(ids), metadata.name
+
+        meta.insert_raw_image_metadata.side_effect = _insert
+
+        write_queue = WriteBehindQueue(meta_repository=meta, batch_size=16)
+        first = write_queue.submit_raw_image(_raw_dto("a"))
+        # the writer is blocked inside the first batch, the rest queues up
+        futures = [write_queue.submit_raw_image(_raw_dto(str(i))) for i in range(3)]
+        release.set()
+        write_queue.close()
+
+        self.assertEqual(first.result(), 1)
+        self.assertEqual([f.result() for f in futures], [2, 3, 4])
+        self.assertLessEqual(meta.transaction.call_count, 2)
+
+    def test_metadata_error_is_set_on_future(self, MediaRepoMock):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.side_effect = RuntimeError("boom")
+
+        write_queue = WriteBehindQueue(meta_repository=meta)
+        future = write_queue.submit_raw_image(_raw_dto())
+
+        with self.assertRaises(DataAccessLayerError):
+            future.result(timeout=5)
+        write_queue.close()
+        MediaRepoMock.return_value.put_media.assert_not_called()
+
+    def test_upload_error_is_raised_on_flush(self, MediaRepoMock):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.return_value = (1, "raw")
+        MediaRepoMock.return_value.put_media.side_effect = RuntimeError("minio down")
+
+        write_queue = WriteBehindQueue(meta_repository=meta)
+        future = write_queue.submit_raw_image(_raw_dto())
+
+        self.assertEqual(future.result(timeout=5), 1)
+        with self.assertRaises(DataAccessLayerError):
+            write_queue.flush()
+        write_queue.close()
+
+    def test_trace_is_written_once_its_uploads_finished(self, MediaRepoMock):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.return_value = (1, "raw")
+        uploading = threading.Event()
+        release = threading.Event()
+
+        def _put_media(**kwargs):
+            uploading.set()
+            release.wait(timeout=5)
+
+        MediaRepoMock.return_value.put_media.side_effect = _put_media
+
+        write_queue = WriteBehindQueue(meta_repository=meta)
+        with InspectionTrace() as trace:
+            write_queue.submit_raw_image(_raw_dto()).result(timeout=5)
+            write_queue.submit_inspection_trace(
+                InspectionTraceDTO(raw_image_id=1, spans=trace.spans)
+            )
+        uploading.wait(timeout=5)
+        meta.insert_inspection_trace.assert_not_called()
+
+        release.set()
+        write_queue.flush()
+
+        # written without closing the queue, the minio_upload span included
+        meta.insert_inspection_trace.assert_called_once()
+        self.assertIn("minio_upload", [span.name for span in trace.spans])
+        write_queue.close()
+
+    def test_failed_upload_does_not_lose_other_traces(self, MediaRepoMock):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.return_value = (1, "raw")
+        MediaRepoMock.return_value.put_media.side_effect = [
+            RuntimeError("minio down"),
+            None,
+        ]
+
+        write_queue = WriteBehindQueue(meta_repository=meta, upload_workers=1)
+        for raw_image_id in (1, 2):
+            with InspectionTrace() as trace:
+                write_queue.submit_raw_image(_raw_dto()).result(timeout=5)
+                write_queue.submit_inspection_trace(
+                    InspectionTraceDTO(raw_image_id=raw_image_id, spans=trace.spans)
+                )
+
+        with self.assertRaises(DataAccessLayerError):
+            write_queue.close()
+
+        written = [
+            call.kwargs["metadata"].raw_image_id
+            for call in meta.insert_inspection_trace.call_args_list
+        ]
+        self.assertEqual(sorted(written), [1, 2])
+
+    def test_submit_after_close_raises(self, MediaRepoMock):
+        write_queue = WriteBehindQueue(meta_repository=_meta_repository())
+        write_queue.close()
+
+        with self.assertRaises(DataAccessLayerError):
+            write_queue.submit_raw_image(_raw_dto())
+
+
+class TestDataAccessLayerAsync(unittest.TestCase):
+
+    @patch("db.dal.DataAccessLayer.OPCUARepository")
+    @patch("db.dal.DataAccessLayer.MediaRepository")
+    @patch("db.dal.DataAccessLayer.MetaRepository")
+    def test_async_insert_without_write_behind_is_synchronous(
+        self, MetaRepoMock, MediaRepoMock, OPCUARepoMock
+    ):
+        MetaRepoMock.return_value.insert_raw_image_metadata.return_value = (3, "raw")
+
+        with DataAccessLayer() as dal:
+            future = dal.insert_raw_image_async(raw_image_with_metadata=_raw_dto())
+            self.assertTrue(future.done())
+
+        self.assertEqual(future.result(), 3)
+        MediaRepoMock.return_value.put_media.assert_called_once()
+
+    @patch("db.dal.WriteBehindQueue.MediaRepository")
+    @patch("db.dal.DataAccessLayer.OPCUARepository")
+    @patch("db.dal.DataAccessLayer.MetaRepository")
+    def test_exit_flushes_write_behind_queue(
+        self, MetaRepoMock, OPCUARepoMock, MediaRepoMock
+    ):
+        meta = _meta_repository()
+        meta.insert_raw_image_metadata.return_value = (5, "raw")
+        MetaRepoMock.return_value = meta
+
+        with DataAccessLayer(write_behind=True) as dal:
+            future = dal.insert_raw_image_async(raw_image_with_metadata=_raw_dto())
+
+        self.assertEqual(future.result(), 5)
+        self.assertIsNone(dal.write_queue)
+        MediaRepoMock.return_value.put_media.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
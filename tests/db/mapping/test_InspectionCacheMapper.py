@@ -0,0 +1,49 @@
+import unittest
+
+from db.mapping.input.InspectionCacheMapper import (
+    InspectionCacheDTO,
+    InspectionCacheMapper,
+)
+
+
+class TestInspectionCacheMapper(unittest.TestCase):
+
+    def test_map_result_round_trips_readings(self):
+        readings = [
+            {
+                "category": "pressure",
+                "value": 0.13,
+                "analyzed_image_id": 4,
+                "is_anomaly": False,
+            }
+        ]
+
+        dto = InspectionCacheMapper.map_result(
+            content_hash="abc",
+            fingerprint="def",
+            raw_image_id=3,
+            readings=readings,
+            aruco_id=42,
+        )
+
+        self.assertIsNone(dto.id)
+        self.assertEqual(dto.aruco_id, 42)
+        self.assertEqual(dto.to_readings(), readings)
+
+    def test_map_row_uses_reader_column_order(self):
+        dto = InspectionCacheMapper.map_row((9, "abc", "def", 3, None, "[]"))
+
+        self.assertEqual(dto.id, 9)
+        self.assertEqual(dto.raw_image_id, 3)
+        self.assertIsNone(dto.aruco_id)
+        self.assertEqual(dto.to_readings(), [])
+
+    def test_missing_raw_image_id_is_rejected(self):
+        with self.assertRaises(ValueError):
+            InspectionCacheDTO(
+                content_hash="abc", fingerprint="def", raw_image_id=None, readings="[]"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
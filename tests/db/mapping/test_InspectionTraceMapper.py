@@ -0,0 +1,41 @@
+import unittest
+
+from common.tracing.InspectionTrace import InspectionTrace, Span
+from db.mapping.input.InspectionTraceMapper import (
+    InspectionTraceDTO,
+    InspectionTraceMapper,
+)
+
+
+class TestInspectionTraceMapper(unittest.TestCase):
+
+    def test_map_trace_converts_spans_to_millisecond_rows(self):
+        trace = InspectionTrace(raw_image_id=7)
+        trace.spans.append(
+            Span(
+                name="gauge_yolo",
+                parent="inspection",
+                start_offset_s=0.5,
+                wall_s=0.25,
+                cpu_s=0.125,
+                thread="MainThread",
+            )
+        )
+
+        dto = InspectionTraceMapper.map_trace(trace)
+
+        self.assertEqual(
+            dto.to_rows(),
+            [(7, "gauge_yolo", "inspection", 500.0, 250.0, 125.0, "MainThread")],
+        )
+
+    def test_raw_image_id_is_required(self):
+        with self.assertRaises(ValueError):
+            InspectionTraceDTO(raw_image_id=None, spans=[])
+
+        with self.assertRaises(TypeError):
+            InspectionTraceDTO(raw_image_id="1", spans=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
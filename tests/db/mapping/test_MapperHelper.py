@@ -49,6 +49,12 @@ class TestMapperHelperGuessContentType(unittest.TestCase):
         result = MapperHelper.guess_content_type(b"fake-bytes")
         self.assertEqual(result, "image/tiff")
 
+    @patch("db.mapping.MapperHelper.imghdr.what")
+    def test_guess_content_type_webp(self, mock_what):
+        mock_what.return_value = "webp"
+        result = MapperHelper.guess_content_type(b"fake-bytes")
+        self.assertEqual(result, "image/webp")
+
     @patch("db.mapping.MapperHelper.imghdr.what")
     def test_guess_content_type_unknown_type(self, mock_what):
         mock_what.return_value = "gif"
@@ -93,6 +99,12 @@ class TestMapperHelperGuessFileExtension(unittest.TestCase):
         result = MapperHelper.guess_file_extension(b"fake-bytes")
         self.assertEqual(result, "tiff")
 
+    @patch("db.mapping.MapperHelper.imghdr.what")
+    def test_guess_file_extension_webp(self, mock_what):
+        mock_what.return_value = "webp"
+        result = MapperHelper.guess_file_extension(b"fake-bytes")
+        self.assertEqual(result, "webp")
+
     @patch("db.mapping.MapperHelper.imghdr.what")
     def test_guess_file_extension_unknown_type(self, mock_what):
         mock_what.return_value = "gif"
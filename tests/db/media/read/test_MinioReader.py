@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from db.media.exceptions.MinioReaderError import MinioReaderError
+from db.media.read.MinioReader import MinioReader
+
+
+class TestMinioReader(unittest.TestCase):
+
+    @patch("db.media.read.MinioReader.MinioConnector.__init__")
+    def setUp(self, mock_init):
+        mock_init.return_value = None
+        self.reader = MinioReader(bucket_name="test-bucket")
+        self.reader.client = MagicMock()
+
+    def test_list_object_names_skips_directories(self):
+        obj_file = MagicMock(object_name="a/img.jpg", is_dir=False)
+        obj_dir = MagicMock(object_name="a/sub/", is_dir=True)
+        self.reader.client.list_objects.return_value = [obj_file, obj_dir]
+
+        names = self.reader.list_object_names(prefix="a/")
+
+        self.assertEqual(names, ["a/img.jpg"])
+        self.reader.client.list_objects.assert_called_once_with(
+            bucket_name="test-bucket", prefix="a/", recursive=True
+        )
+
+    def test_list_object_names_wraps_errors(self):
+        self.reader.client.list_objects.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(MinioReaderError):
+            self.reader.list_object_names()
+
+    def test_get_media_reads_and_releases_response(self):
+        response = MagicMock()
+        response.read.return_value = b"data"
+        self.reader.client.get_object.return_value = response
+
+        data = self.reader.get_media("img.jpg")
+
+        self.assertEqual(data, b"data")
+        response.close.assert_called_once()
+        response.release_conn.assert_called_once()
+
+    def test_get_media_wraps_errors(self):
+        self.reader.client.get_object.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(MinioReaderError):
+            self.reader.get_media("img.jpg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,15 @@ from unittest.mock import patch, MagicMock
 from db.media.repository.MediaRepository import MediaRepository
 from db.media.exceptions.BucketInitializerError import BucketInitializerError
 from db.media.exceptions.MinioWriterError import MinioWriterError
+from db.media.exceptions.MinioReaderError import MinioReaderError
 from db.media.exceptions.MediaRepositoryError import MediaRepositoryError
 
 
 class TestMediaRepositoryInitializeBucket(unittest.TestCase):
 
+    def setUp(self):
+        MediaRepository._initialized_buckets.clear()
+
     @patch("db.media.repository.MediaRepository.MinioBucketInitializer")
     def test_initialize_bucket_success(self, mock_initializer_cls):
         mock_initializer = mock_initializer_cls.return_value
@@ -22,6 +26,17 @@ class TestMediaRepositoryInitializeBucket(unittest.TestCase):
         mock_initializer_cls.assert_called_once_with("bucket")
         mock_initializer.initalize_bucket.assert_called_once()
 
+    @patch("db.media.repository.MediaRepository.MinioBucketInitializer")
+    def test_initialize_bucket_is_cached_per_process(self, mock_initializer_cls):
+        mock_initializer = mock_initializer_cls.return_value
+        mock_initializer.initalize_bucket.return_value = "bucket"
+
+        MediaRepository("bucket")._MediaRepository__initialize_bucket()
+        result = MediaRepository("bucket")._MediaRepository__initialize_bucket()
+
+        self.assertEqual(result, "bucket")
+        mock_initializer.initalize_bucket.assert_called_once()
+
     @patch("db.media.repository.MediaRepository.MinioBucketInitializer")
     def test_initialize_bucket_wraps_bucketinitializererror(self, mock_initializer_cls):
         mock_initializer = mock_initializer_cls.return_value
@@ -47,6 +62,9 @@ class TestMediaRepositoryInitializeBucket(unittest.TestCase):
 
 class TestMediaRepositoryPutMedia(unittest.TestCase):
 
+    def setUp(self):
+        MediaRepository._initialized_buckets.clear()
+
     @patch("db.media.repository.MediaRepository.MinioBucketInitializer")
     @patch("db.media.repository.MediaRepository.MinioWriter")
     def test_put_media_success(self, mock_writer_cls, mock_initializer_cls):
@@ -120,5 +138,47 @@ class TestMediaRepositoryPutMedia(unittest.TestCase):
             )
 
 
+class TestMediaRepositoryReadMedia(unittest.TestCase):
+
+    @patch("db.media.repository.MediaRepository.MinioReader")
+    def test_get_media_success(self, mock_reader_cls):
+        mock_reader = MagicMock()
+        mock_reader_cls.return_value = mock_reader
+        mock_reader.__enter__.return_value = mock_reader
+        mock_reader.get_media.return_value = b"img"
+
+        repo = MediaRepository(bucket_name="bucket")
+
+        self.assertEqual(repo.get_media("obj.jpg"), b"img")
+        mock_reader_cls.assert_called_once_with("bucket")
+        mock_reader.get_media.assert_called_once_with(object_name="obj.jpg")
+
+    @patch("db.media.repository.MediaRepository.MinioReader")
+    def test_get_media_wraps_minioreadererror(self, mock_reader_cls):
+        mock_reader = MagicMock()
+        mock_reader_cls.return_value = mock_reader
+        mock_reader.__enter__.return_value = mock_reader
+        mock_reader.get_media.side_effect = MinioReaderError(
+            exception=ValueError("x"), error_code=1
+        )
+
+        repo = MediaRepository(bucket_name="bucket")
+
+        with self.assertRaises(MediaRepositoryError):
+            repo.get_media("obj.jpg")
+
+    @patch("db.media.repository.MediaRepository.MinioReader")
+    def test_list_media_success(self, mock_reader_cls):
+        mock_reader = MagicMock()
+        mock_reader_cls.return_value = mock_reader
+        mock_reader.__enter__.return_value = mock_reader
+        mock_reader.list_object_names.return_value = ["a.jpg", "b.jpg"]
+
+        repo = MediaRepository(bucket_name="bucket")
+
+        self.assertEqual(repo.list_media(prefix="2025/"), ["a.jpg", "b.jpg"])
+        mock_reader.list_object_names.assert_called_once_with(prefix="2025/")
+
+
 if __name__ == "__main__":
     unittest.main()